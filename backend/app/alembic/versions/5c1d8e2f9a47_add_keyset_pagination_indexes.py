@@ -0,0 +1,37 @@
+"""Add keyset pagination indexes.
+
+Revision ID: 5c1d8e2f9a47
+Revises: 7241e3b8feb0
+Create Date: 2026-10-16 09:12:31.482913
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d8e2f9a47"
+down_revision: Union[str, None] = "7241e3b8feb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("trips", "generated_lists", "special_lists")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(
+            f"ix_{table}_user_id_created_at_id",
+            table,
+            ["user_id", sa.text("created_at DESC"), "id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_index(f"ix_{table}_user_id_created_at_id", table_name=table)
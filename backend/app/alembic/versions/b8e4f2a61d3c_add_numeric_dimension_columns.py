@@ -0,0 +1,65 @@
+"""Add numeric dimension columns.
+
+Revision ID: b8e4f2a61d3c
+Revises: 5c1d8e2f9a47
+Create Date: 2026-10-16 14:03:52.118204
+
+Existing rows are filled in by ``python -m app.scripts.backfill_dimensions``.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e4f2a61d3c"
+down_revision: Union[str, None] = "5c1d8e2f9a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column prefix, constraint name prefix)
+TABLES = (
+    ("items", "", "check_item"),
+    ("generated_list_items", "item_", "check_gen_list_item"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, prefix, check in TABLES:
+        width, height, depth = (f"{prefix}{c}" for c in ("width", "height", "depth"))
+        for column in (width, height, depth):
+            op.add_column(table, sa.Column(column, sa.Numeric(6, 2), nullable=True))
+        op.add_column(
+            table,
+            sa.Column(
+                f"{prefix}volume",
+                sa.Numeric(16, 3),
+                sa.Computed(f"{width} * {height} * {depth}", persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_check_constraint(
+            f"{check}_dimensions_positive",
+            table,
+            f"{width} > 0 AND {height} > 0 AND {depth} > 0",
+        )
+        op.create_check_constraint(
+            f"{check}_dimensions_complete",
+            table,
+            f"({width} IS NULL) = ({height} IS NULL)"
+            f" AND ({height} IS NULL) = ({depth} IS NULL)",
+        )
+    op.create_index(op.f("ix_items_volume"), "items", ["volume"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_items_volume"), table_name="items")
+    for table, prefix, check in reversed(TABLES):
+        op.drop_constraint(f"{check}_dimensions_complete", table, type_="check")
+        op.drop_constraint(f"{check}_dimensions_positive", table, type_="check")
+        for column in ("volume", "depth", "height", "width"):
+            op.drop_column(table, f"{prefix}{column}")
@@ -0,0 +1,83 @@
+"""Add generation_jobs table.
+
+Revision ID: e31c7a9d0b52
+Revises: b8e4f2a61d3c
+Create Date: 2026-10-16 16:41:07.530128
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e31c7a9d0b52"
+down_revision: Union[str, None] = "b8e4f2a61d3c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "generation_jobs",
+        sa.Column(
+            "id", sa.UUID(), server_default=sa.text("gen_random_uuid()"), nullable=False
+        ),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("trip_id", sa.UUID(), nullable=False),
+        sa.Column("idempotency_key", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), server_default="pending", nullable=False),
+        sa.Column(
+            "params",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("generated_list_id", sa.UUID(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["trip_id"], ["trips.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["generated_list_id"], ["generated_lists.id"], ondelete="SET NULL"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "idempotency_key",
+            name="uq_generation_jobs_user_id_idempotency_key",
+        ),
+    )
+    op.create_index(
+        op.f("ix_generation_jobs_trip_id"), "generation_jobs", ["trip_id"], unique=False
+    )
+    op.create_index(
+        "ix_generation_jobs_status_created_at",
+        "generation_jobs",
+        ["status", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_generation_jobs_status_created_at", table_name="generation_jobs")
+    op.drop_index(op.f("ix_generation_jobs_trip_id"), table_name="generation_jobs")
+    op.drop_table("generation_jobs")
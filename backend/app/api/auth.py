@@ -6,9 +6,9 @@ from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from pydantic import BaseModel, EmailStr, Field
 
 from app.config import DEV_MODE
-from app.middleware.auth import get_current_user
+from app.middleware.auth import get_current_claims, get_current_user
 from app.models import User
-from app.services.auth_service import AuthService, Token
+from app.services.auth_service import AuthService, Token, TokenData
 from app.services.user_service import UserService
 
 router = APIRouter(tags=["auth"])
@@ -17,10 +17,10 @@ logger = logging.getLogger(__name__)
 
 
 async def get_current_user_id(
-    current_user: Annotated[User, Depends(get_current_user)],
+    claims: Annotated[TokenData, Depends(get_current_claims)],
 ) -> UUID:
-    """Get the ID of the currently authenticated user."""
-    return current_user.id
+    """Get the ID of the currently authenticated user from the token claims."""
+    return claims.user_id
 
 
 class UserCreate(BaseModel):
@@ -4,6 +4,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from app.dimensions import parse_dimensions
+
 
 class LuggageModel(BaseModel):
     max_weight: Optional[float] = Field(
@@ -32,8 +34,7 @@ class LuggageModel(BaseModel):
     def validate_dimensions_format(cls, v: Optional[str]) -> Optional[str]:
         if v is None:
             return v
-        parts = v.lower().replace(" ", "").split("x")
-        if len(parts) != 3 or not all(p.replace(".", "").isdigit() for p in parts):
+        if parse_dimensions(v) is None:
             raise ValueError(
                 "Dimensions, if provided, must be in format WxHxD (e.g. '45x35x20')"
             )
@@ -50,6 +51,12 @@ class GeneratedListItemDTO(BaseModel):
     item_category: Optional[str] = Field(None, alias="itemCategory")
     item_weight: Optional[float] = Field(None, alias="itemWeight")
     item_dimensions: Optional[str] = Field(None, alias="itemDimensions")
+    item_width: Optional[float] = Field(None, alias="itemWidth")
+    item_height: Optional[float] = Field(None, alias="itemHeight")
+    item_depth: Optional[float] = Field(None, alias="itemDepth")
+    item_volume: Optional[float] = Field(
+        None, alias="itemVolume", description="Volume in cm³"
+    )
     created_at: datetime = Field(..., alias="createdAt")
     updated_at: Optional[datetime] = Field(None, alias="updatedAt")
 
@@ -75,10 +82,11 @@ class GeneratedListSummaryDTO(BaseModel):
 
 class PaginatedGeneratedListResponse(BaseModel):
     items: List[GeneratedListSummaryDTO]
-    total: int
+    total: Optional[int]
     page: int
     page_size: int = Field(..., alias="pageSize")
-    total_pages: int = Field(..., alias="totalPages")
+    total_pages: Optional[int] = Field(..., alias="totalPages")
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -105,3 +113,38 @@ class GeneratePackingListResponseDTO(BaseModel):
         return v
 
     model_config = ConfigDict(populate_by_name=True, from_attributes=True)
+
+
+class BagAllocationDTO(BaseModel):
+    index: int
+    max_weight: Optional[float] = Field(None, alias="maxWeight")
+    volume: Optional[float] = Field(None, description="Bag volume in litres")
+    item_ids: List[UUID] = Field(..., alias="itemIds")
+    total_weight: float = Field(..., alias="totalWeight")
+    total_volume: float = Field(..., alias="totalVolume")
+
+    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
+
+
+class PackingPlanDTO(BaseModel):
+    list_id: UUID = Field(..., alias="listId")
+    bags: List[BagAllocationDTO]
+    overflow: List[UUID] = Field(
+        ..., description="Items that don't fit into any of the bags"
+    )
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class GenerationJobDTO(BaseModel):
+    id: UUID
+    status: str
+    trip_id: UUID = Field(..., alias="tripId")
+    generated_list_id: Optional[UUID] = Field(None, alias="generatedListId")
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime = Field(..., alias="createdAt")
+    updated_at: Optional[datetime] = Field(None, alias="updatedAt")
+    finished_at: Optional[datetime] = Field(None, alias="finishedAt")
+
+    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
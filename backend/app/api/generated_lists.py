@@ -1,21 +1,26 @@
 from math import ceil
-from typing import Optional
+from typing import Any, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
 from fastapi_sqlalchemy import async_db as db
 from pydantic import BaseModel, ConfigDict, Field
-from sqlalchemy import select, update
+from sqlalchemy import ColumnElement, Select, func, null, select, update
 from sqlalchemy.orm import selectinload
 
 from app.api.auth import get_current_user_id
 from app.api.dto import (
+    BagAllocationDTO,
     GeneratedListItemDTO,
     GeneratedListSummaryDTO,
     GeneratePackingListResponseDTO,
+    PackingPlanDTO,
     PaginatedGeneratedListResponse,
 )
-from app.models import GeneratedList, GeneratedListItem
+from app.database import read_only_session
+from app.models import GeneratedList, GeneratedListItem, Trip
+from app.pagination import after_cursor, encode_cursor
+from app.services.packing_engine import pack_items
 
 router = APIRouter(prefix="/api/generated-lists", tags=["generated-lists"])
 
@@ -26,9 +31,120 @@ class UpdateListItemDTO(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+SORT_COLUMNS = {"name", "trip_id", "created_at"}
+
+
+def _list_filters(
+    user_id: UUID, search: Optional[str] = None, trip_id: Optional[UUID] = None
+) -> List[ColumnElement[bool]]:
+    """Build the WHERE conditions for the user's lists and optional filters."""
+    conditions = [GeneratedList.user_id == user_id]
+    if search:
+        conditions.append(GeneratedList.name.icontains(search, autoescape=True))
+    if trip_id:
+        conditions.append(GeneratedList.trip_id == trip_id)
+    return conditions
+
+
+def list_page_query(
+    user_id: UUID,
+    limit: int,
+    offset: int = 0,
+    search: Optional[str] = None,
+    trip_id: Optional[UUID] = None,
+    sort_field: str = "created_at",
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+) -> Select:
+    """Build the query for one page of list summaries.
+
+    Filtering, sorting and pagination happen in SQL. The page is selected
+    first together with the total number of matching lists
+    (``COUNT(*) OVER()``), and item counts are then aggregated only for the
+    lists on that page, so no items are loaded.
+
+    With a cursor the page is selected by keyset on (created_at, id) instead
+    of OFFSET and the total is left NULL, because counting would scan every
+    matching list.
+
+    Args:
+        user_id: Owner of the lists
+        limit: Page size
+        offset: Number of lists to skip
+        search: Case-insensitive substring of the list name
+        trip_id: Only return lists for this trip
+        sort_field: One of SORT_COLUMNS; anything else sorts by created_at
+        sort_order: "desc" for descending, anything else for ascending
+        cursor: Cursor returned with the previous page (newest first order only)
+
+    Returns:
+        Select yielding id, name, trip_id, created_at, updated_at, total,
+        items_count and packed_items_count for each list on the page
+
+    Raises:
+        ValueError: If the cursor is malformed or used with another order
+    """
+    if sort_field not in SORT_COLUMNS:
+        sort_field = "created_at"
+    descending = sort_order.lower() == "desc"
+
+    def ordering(columns):
+        # id breaks ties so pages don't overlap when sort values repeat
+        key = columns[sort_field]
+        return [key.desc() if descending else key.asc(), columns["id"].asc()]
+
+    lists = GeneratedList.__table__.c
+    conditions = _list_filters(user_id, search, trip_id)
+    total: ColumnElement[Any]
+    if cursor:
+        if sort_field != "created_at" or not descending or offset:
+            raise ValueError("Cursor can't be combined with sort or page")
+        conditions.append(after_cursor(lists.created_at, lists.id, cursor))
+        total = null()
+    else:
+        total = func.count().over()
+    page = (
+        select(
+            lists.id,
+            lists.name,
+            lists.trip_id,
+            lists.created_at,
+            lists.updated_at,
+            total.label("total"),
+        )
+        .where(*conditions)
+        .order_by(*ordering(lists))
+        .limit(limit)
+        .offset(offset)
+        .cte("page")
+    )
+    counts = (
+        select(
+            GeneratedListItem.generated_list_id,
+            func.count().label("items_count"),
+            func.count()
+            .filter(GeneratedListItem.is_packed)
+            .label("packed_items_count"),
+        )
+        .where(GeneratedListItem.generated_list_id.in_(select(page.c.id)))
+        .group_by(GeneratedListItem.generated_list_id)
+        .subquery("counts")
+    )
+    return (
+        select(
+            page,
+            func.coalesce(counts.c.items_count, 0).label("items_count"),
+            func.coalesce(counts.c.packed_items_count, 0).label("packed_items_count"),
+        )
+        .outerjoin(counts, counts.c.generated_list_id == page.c.id)
+        .order_by(*ordering(page.c))
+    )
+
+
 @router.get(
     "/{list_id}",
     response_model=GeneratePackingListResponseDTO,
+    dependencies=[Depends(read_only_session)],
     summary="Get a generated packing list",
     responses={
         200: {"description": "Packing list retrieved successfully"},
@@ -69,6 +185,10 @@ async def get_generated_list(
                     itemCategory=item.item_category,
                     itemWeight=item.item_weight,
                     itemDimensions=item.item_dimensions,
+                    itemWidth=item.item_width,
+                    itemHeight=item.item_height,
+                    itemDepth=item.item_depth,
+                    itemVolume=item.item_volume,
                     createdAt=item.created_at,
                     updatedAt=item.updated_at,
                 )
@@ -85,9 +205,68 @@ async def get_generated_list(
         raise HTTPException(status_code=500, detail="Failed to get packing list") from e
 
 
+@router.get(
+    "/{list_id}/packing-plan",
+    response_model=PackingPlanDTO,
+    dependencies=[Depends(read_only_session)],
+    summary="Assign list items to the trip's luggage",
+    responses={
+        200: {"description": "Packing plan computed successfully"},
+        400: {"description": "Trip has no luggage"},
+        404: {"description": "List not found"},
+    },
+)
+async def get_packing_plan(
+    list_id: UUID = Path(..., description="The ID of the generated list"),
+    current_user_id: UUID = Depends(get_current_user_id),
+) -> PackingPlanDTO:
+    """Split the list's items between the trip's bags by weight and volume.
+
+    Items that don't fit into any bag are returned as overflow.
+    """
+    try:
+        query = (
+            select(Trip.available_luggage)
+            .join(GeneratedList, GeneratedList.trip_id == Trip.id)
+            .where(GeneratedList.id == list_id)
+            .where(GeneratedList.user_id == current_user_id)
+        )
+        found = (await db.session.execute(query)).first()
+        if found is None:
+            raise HTTPException(status_code=404, detail="List not found")
+
+        items = await GeneratedListItem.select(generated_list_id=list_id)
+        plan = pack_items(items, found.available_luggage)
+
+        return PackingPlanDTO(
+            listId=list_id,
+            bags=[
+                BagAllocationDTO(
+                    index=bag.index,
+                    maxWeight=bag.max_weight,
+                    volume=bag.volume,
+                    itemIds=bag.item_ids,
+                    totalWeight=bag.total_weight,
+                    totalVolume=bag.total_volume,
+                )
+                for bag in plan.bags
+            ],
+            overflow=plan.overflow,
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail="Failed to compute packing plan"
+        ) from e
+
+
 @router.get(
     "/",
     response_model=PaginatedGeneratedListResponse,
+    dependencies=[Depends(read_only_session)],
     summary="List user's packing lists",
     response_description="List of packing lists with pagination",
 )
@@ -98,77 +277,66 @@ async def list_generated_lists(
     trip_id: Optional[UUID] = None,
     sort_field: str = Query("created_at", description="Field to sort by"),
     sort_order: str = Query("desc", description="Sort order (asc or desc)"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor returned as nextCursor by the previous page"
+    ),
     current_user_id: UUID = Depends(get_current_user_id),
 ) -> PaginatedGeneratedListResponse:
-    """Get all packing lists for the current user with pagination, filtering, and sorting."""
+    """Get all packing lists for the current user with pagination, filtering, and sorting.
+
+    Pages can be requested by number or, for the default newest-first order,
+    by the nextCursor of the previous page. Cursor pages don't report totals.
+    """
     try:
-        print(
-            f"[DEBUG] Input parameters: page={page}, page_size={page_size}, search={search}, "
-            f"trip_id={trip_id}, sort_field={sort_field}, sort_order={sort_order}, "
-            f"current_user_id={current_user_id}"
+        query = list_page_query(
+            current_user_id,
+            # One extra row tells whether a cursor page is the last one
+            limit=page_size + 1 if cursor else page_size,
+            offset=(page - 1) * page_size,
+            search=search,
+            trip_id=trip_id,
+            sort_field=sort_field,
+            sort_order=sort_order,
+            cursor=cursor,
         )
+        rows = (await db.session.execute(query)).all()
 
-        # Get all lists for the user
-        query = (
-            select(GeneratedList)
-            .where(GeneratedList.user_id == current_user_id)
-            .options(selectinload(GeneratedList.items))
-        )
-        lists = (await db.session.execute(query)).scalars().all()
-
-        # Filter lists
-        filtered_lists = lists
-        if search:
-            filtered_lists = [
-                lst for lst in filtered_lists if search.lower() in lst.name.lower()
-            ]
-        if trip_id:
-            filtered_lists = [lst for lst in filtered_lists if lst.trip_id == trip_id]
-
-        # Sort lists
-        if sort_field == "name":
-            filtered_lists = sorted(
-                filtered_lists,
-                key=lambda x: x.name,
-                reverse=sort_order.lower() == "desc",
-            )
-        elif sort_field == "trip_id":
-            filtered_lists = sorted(
-                filtered_lists,
-                key=lambda x: x.trip_id,
-                reverse=sort_order.lower() == "desc",
-            )
-        else:  # default to created_at
-            filtered_lists = sorted(
-                filtered_lists,
-                key=lambda x: x.created_at,
-                reverse=sort_order.lower() == "desc",
+        total: Optional[int] = None
+        total_pages: Optional[int] = None
+        has_more = False
+        if cursor:
+            has_more = len(rows) > page_size
+            rows = rows[:page_size]
+        else:
+            if rows:
+                total = rows[0].total
+            elif page > 1:
+                # Past the last page the window total isn't available, count directly
+                count_query = select(func.count(GeneratedList.id)).where(
+                    *_list_filters(current_user_id, search, trip_id)
+                )
+                total = await db.session.scalar(count_query) or 0
+            else:
+                total = 0
+            total_pages = ceil(total / page_size) if total > 0 else 0
+            has_more = (
+                sort_field == "created_at"
+                and sort_order.lower() == "desc"
+                and (page - 1) * page_size + len(rows) < total
             )
 
-        # Calculate total and pages
-        total = len(filtered_lists)
-        total_pages = ceil(total / page_size) if total > 0 else 0
-
-        # Apply pagination
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_lists = filtered_lists[start:end]
-
-        # Prepare items with computed fields
-        items = []
-        for lst in paginated_lists:
-            packed_items = sum(1 for item in lst.items if item.is_packed)
-            items.append(
-                GeneratedListSummaryDTO(
-                    id=lst.id,
-                    name=lst.name,
-                    tripId=lst.trip_id,
-                    createdAt=lst.created_at,
-                    updatedAt=lst.updated_at,
-                    itemsCount=len(lst.items),
-                    packedItemsCount=packed_items,
-                )
+        items = [
+            GeneratedListSummaryDTO(
+                id=row.id,
+                name=row.name,
+                tripId=row.trip_id,
+                createdAt=row.created_at,
+                updatedAt=row.updated_at,
+                itemsCount=row.items_count,
+                packedItemsCount=row.packed_items_count,
             )
+            for row in rows
+        ]
 
         # Prepare the response
         return PaginatedGeneratedListResponse(
@@ -177,14 +345,19 @@ async def list_generated_lists(
             page=page,
             pageSize=page_size,
             totalPages=total_pages,
+            nextCursor=(
+                encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+            ),
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"Error: {e}")
         raise HTTPException(
             status_code=500,
             detail="Failed to get packing lists",
-        )
+        ) from e
 
 
 @router.patch(
@@ -0,0 +1,35 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Path
+
+from app.api.auth import get_current_user_id
+from app.api.dto import GenerationJobDTO
+from app.services.generation_jobs import GenerationJobService
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get(
+    "/{job_id}",
+    response_model=GenerationJobDTO,
+    summary="Get the status of a background job",
+    responses={
+        200: {"description": "Job status retrieved successfully"},
+        404: {"description": "Job not found"},
+    },
+)
+async def get_job(
+    job_id: UUID = Path(..., description="The ID of the job"),
+    current_user_id: UUID = Depends(get_current_user_id),
+) -> GenerationJobDTO:
+    """Report the status of a packing list generation job.
+
+    Once the job has succeeded, generatedListId points to the new list.
+    """
+    try:
+        job = await GenerationJobService.get_job(job_id, user_id=current_user_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to get job") from e
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return GenerationJobDTO.model_validate(job)
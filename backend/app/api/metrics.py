@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app import metrics
+from app.database import get_engine, get_read_pool
+from app.services.circuit_breaker import get_openrouter_breaker
+from app.services.generation_cache import get_generation_cache
+from app.services.hedging import get_openrouter_hedge
+from app.services.password_executor import get_password_executor
+from app.services.principal_cache import principal_cache
+from app.services.rate_limiter import get_openrouter_limiter
+from app.services.trip_service import generation_flight
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["metrics"])
+
+metrics.register_stats("db_pool", lambda: get_engine().pool)
+metrics.register_stats("db_read_pool", get_read_pool)
+metrics.register_stats("password_executor", get_password_executor)
+metrics.register_stats("principal_cache", lambda: principal_cache)
+metrics.register_stats("openrouter_limiter", get_openrouter_limiter)
+metrics.register_stats("openrouter_circuit", get_openrouter_breaker)
+metrics.register_stats("openrouter_hedge", get_openrouter_hedge)
+metrics.register_stats("generation_cache", get_generation_cache)
+metrics.register_stats("generation_single_flight", lambda: generation_flight)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """Expose request, database, OpenRouter and parsing metrics to Prometheus."""
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -2,8 +2,10 @@ import math
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from app.database import read_only_session
+from app.pagination import encode_cursor
 from app.schemas.special_lists import (
     AddSpecialListItemCommand,
     AddTagCommand,
@@ -54,7 +56,11 @@ async def create_special_list(data: CreateSpecialListCommand) -> SpecialListDTO:
         ) from e
 
 
-@router.get("/", response_model=PaginatedSpecialListResponse)
+@router.get(
+    "/",
+    response_model=PaginatedSpecialListResponse,
+    dependencies=[Depends(read_only_session)],
+)
 async def get_special_lists(
     page: int = Query(1, gt=0),
     page_size: int = Query(10, gt=0, le=100),
@@ -62,15 +68,41 @@ async def get_special_lists(
     search: Optional[str] = None,
     sort_field: SortField = Query(SortField.CREATED_AT, description="Field to sort by"),
     sort_order: SortOrder = Query(SortOrder.DESC, description="Sort order"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor returned as next_cursor by the previous page"
+    ),
 ) -> PaginatedSpecialListResponse:
-    """Get all special lists for the current user with pagination, filtering, and sorting."""
+    """Get all special lists for the current user with pagination, filtering, and sorting.
+
+    Pages can be requested by number or, for the default newest-first order,
+    by the next_cursor of the previous page. Cursor pages don't report totals.
+    """
     mock_user_id = UUID("12345678-1234-5678-1234-567812345678")
+    default_order = sort_field == SortField.CREATED_AT and sort_order == SortOrder.DESC
     try:
         filters = (
             SpecialListFilter(category=category, search=search)
             if (category or search)
             else None
         )
+        if cursor:
+            if not default_order or page != 1:
+                raise ValueError("Cursor can't be combined with sort or page")
+            lists, next_cursor = await SpecialListService.get_user_lists_page(
+                user_id=mock_user_id,
+                page_size=page_size,
+                cursor=cursor,
+                filters=filters,
+            )
+            return PaginatedSpecialListResponse(
+                items=[SpecialListDTO.from_orm(lst) for lst in lists],
+                total=None,
+                page=page,
+                page_size=page_size,
+                total_pages=None,
+                next_cursor=next_cursor,
+            )
+
         sort = SpecialListSort(field=sort_field, order=sort_order)
         lists, total = await SpecialListService.get_user_lists(
             user_id=mock_user_id,
@@ -80,13 +112,19 @@ async def get_special_lists(
             sort=sort,
         )
         total_pages = math.ceil(total / page_size)
+        next_cursor = None
+        if default_order and lists and page * page_size < total:
+            next_cursor = encode_cursor(lists[-1].created_at, lists[-1].id)
         return PaginatedSpecialListResponse(
             items=[SpecialListDTO.from_orm(lst) for lst in lists],
             total=total,
             page=page,
             page_size=page_size,
             total_pages=total_pages,
+            next_cursor=next_cursor,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         print(f"Error: {e}")
         raise HTTPException(
@@ -95,7 +133,11 @@ async def get_special_lists(
         )
 
 
-@router.get("/{list_id}", response_model=SpecialListDetailDTO)
+@router.get(
+    "/{list_id}",
+    response_model=SpecialListDetailDTO,
+    dependencies=[Depends(read_only_session)],
+)
 async def get_special_list(list_id: UUID) -> SpecialListDetailDTO:
     """Get a special list with all its items and tags."""
     mock_user_id = UUID("12345678-1234-5678-1234-567812345678")
@@ -1,8 +1,21 @@
+import json
+import logging
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi_sqlalchemy import async_db as db
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
@@ -10,8 +23,10 @@ from sqlalchemy.orm import selectinload
 from app.api.auth import get_current_user_id
 from app.api.dto import (
     GeneratePackingListResponseDTO,
+    GenerationJobDTO,
     LuggageModel,
 )
+from app.database import read_only_session
 from app.models import GeneratedList, GeneratedListItem
 from app.services.constants import (
     CATERING_OPTIONS,
@@ -19,8 +34,11 @@ from app.services.constants import (
     SeasonType,
     TransportType,
 )
+from app.services.generation_jobs import GenerationJobService, generation_workers
 from app.services.trip_service import TripService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/trips", tags=["trips"])
 
 
@@ -97,7 +115,8 @@ class TripDTO(BaseModel):
 
 class ListTripsResponseDTO(BaseModel):
     trips: List[TripDTO]
-    total: int
+    total: Optional[int]
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -268,6 +287,7 @@ async def create_trip(
 @router.get(
     "/",
     response_model=ListTripsResponseDTO,
+    dependencies=[Depends(read_only_session)],
     summary="List user's trips",
     response_description="List of trips with pagination",
     responses={
@@ -286,6 +306,7 @@ async def create_trip(
                             }
                         ],
                         "total": 1,
+                        "next_cursor": None,
                     }
                 }
             },
@@ -314,6 +335,9 @@ async def list_trips(
         description="Sort field (created_at, destination, start_date, duration_days)",
         example="created_at",
     ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor returned as next_cursor by the previous page"
+    ),
     current_user_id: UUID = Depends(get_current_user_id),
 ) -> ListTripsResponseDTO:
     """
@@ -321,6 +345,7 @@ async def list_trips(
 
     The endpoint supports:
     - Pagination with limit and offset
+    - Cursor pagination with next_cursor (default order only; total is null)
     - Sorting by various fields
     - Default sorting by creation date (descending)
 
@@ -332,12 +357,18 @@ async def list_trips(
     """
 
     try:
-        trips, total = await TripService.list_trips(
-            user_id=current_user_id, limit=limit, offset=offset, sort=sort
+        trips, total, next_cursor = await TripService.list_trips(
+            user_id=current_user_id,
+            limit=limit,
+            offset=offset,
+            sort=sort,
+            cursor=cursor,
         )
         # Convert Trip objects to TripDTO objects
         trip_dtos = [TripDTO.model_validate(trip) for trip in trips]
-        return ListTripsResponseDTO(trips=trip_dtos, total=total)
+        return ListTripsResponseDTO(
+            trips=trip_dtos, total=total, next_cursor=next_cursor
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -348,6 +379,7 @@ async def list_trips(
 @router.get(
     "/{trip_id}",
     response_model=TripDTO,
+    dependencies=[Depends(read_only_session)],
     summary="Get trip details",
     response_description="Detailed trip information",
     responses={
@@ -453,6 +485,10 @@ async def get_trip(
                 }
             },
         },
+        202: {
+            "description": "Generation queued (async=true); poll the job for its status",
+            "model": GenerationJobDTO,
+        },
         404: {
             "description": "Trip not found",
             "content": {"application/json": {"example": {"detail": "Trip not found"}}},
@@ -469,7 +505,18 @@ async def generate_packing_list(
     ),
     current_user_id: UUID = Depends(get_current_user_id),
     command: Optional[GeneratePackingListCommand] = None,
-) -> GeneratePackingListResponseDTO:
+    run_async: bool = Query(
+        False,
+        alias="async",
+        description="Queue the generation and return 202 with a job to poll",
+    ),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Repeating an async request with the same key returns the same job",
+    ),
+) -> Union[GeneratePackingListResponseDTO, JSONResponse]:
     """
     Generate a packing list for a specific trip using AI.
 
@@ -485,6 +532,9 @@ async def generate_packing_list(
     - Planned activities and accommodation type
     - Available luggage specifications
     - Season and transport mode
+
+    With async=true the list is generated by a background worker instead: the
+    response is 202 with a job whose status is available at /api/jobs/{id}.
     """
 
     try:
@@ -493,6 +543,30 @@ async def generate_packing_list(
         if not trip:
             raise HTTPException(status_code=404, detail="Trip not found")
 
+        if run_async:
+            job, created = await GenerationJobService.submit(
+                trip_id=trip.id,
+                user_id=current_user_id,
+                include_special_lists=(
+                    command.include_special_lists if command else None
+                ),
+                exclude_categories=command.exclude_categories if command else None,
+                idempotency_key=idempotency_key,
+            )
+            content = GenerationJobDTO.model_validate(job).model_dump(
+                mode="json", by_alias=True
+            )
+            # Workers use their own sessions, so the job must be committed first.
+            # Committing expires the job, so only the serialized copy is used after.
+            await db.session.commit()
+            if created:
+                generation_workers.wake()
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=content,
+                headers={"Location": f"/api/jobs/{content['id']}"},
+            )
+
         # Generate packing list using AI service
         return await TripService.generate_packing_list(
             trip=trip,
@@ -509,9 +583,86 @@ async def generate_packing_list(
         ) from e
 
 
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format a single Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post(
+    "/{trip_id}/generate-list/stream",
+    summary="Generate a packing list for a trip as a stream",
+    response_description="Server-Sent Events with generated items",
+    responses={
+        200: {
+            "description": "Stream of generation events",
+            "content": {
+                "text/event-stream": {
+                    "example": (
+                        'event: list\ndata: {"id": "123e4567-e89b-12d3-a456-426614174000", '
+                        '"name": "Lista rzeczy do Paris", "tripId": "123e4567-e89b-12d3-a456-426614174002"}\n\n'
+                        'event: item\ndata: {"id": "123e4567-e89b-12d3-a456-426614174001", '
+                        '"itemName": "Toothbrush", "quantity": 1, "isPacked": false, ...}\n\n'
+                        'event: done\ndata: {"id": "123e4567-e89b-12d3-a456-426614174000", "itemsCount": 1}\n\n'
+                    )
+                }
+            },
+        },
+        404: {
+            "description": "Trip not found",
+            "content": {"application/json": {"example": {"detail": "Trip not found"}}},
+        },
+    },
+)
+async def stream_packing_list(
+    trip_id: UUID = Path(
+        ..., description="The ID of the trip to generate a packing list for"
+    ),
+    current_user_id: UUID = Depends(get_current_user_id),
+    command: Optional[GeneratePackingListCommand] = None,
+) -> StreamingResponse:
+    """
+    Generate a packing list for a specific trip, streaming items as they are created.
+
+    Works like the generate-list endpoint, but the model output is parsed
+    incrementally and every completed item is saved and sent right away as a
+    Server-Sent Event:
+    - `list` - the generated list has been created
+    - `item` - one generated item (same shape as items in the list response)
+    - `done` - generation finished, with the final item count
+    - `error` - generation failed; items created so far are discarded
+    """
+    trip = await TripService.get_trip(trip_id, user_id=current_user_id)
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event, data in TripService.stream_packing_list(
+                trip_id=trip_id,
+                user_id=current_user_id,
+                include_special_lists=(
+                    command.include_special_lists if command else None
+                ),
+                exclude_categories=command.exclude_categories if command else None,
+            ):
+                yield format_sse(event, data)
+        except Exception as e:
+            logger.exception("Streaming packing list generation failed")
+            yield format_sse(
+                "error", {"detail": f"Failed to generate packing list: {str(e)}"}
+            )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/{trip_id}/lists/{list_id}",
     response_model=GeneratePackingListResponseDTO,
+    dependencies=[Depends(read_only_session)],
     summary="Get a generated packing list",
     response_description="Generated packing list details",
     responses={
@@ -1,4 +1,18 @@
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union, cast
+import functools
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from fastapi import HTTPException
 from fastapi_sqlalchemy import async_db as db
@@ -7,11 +21,56 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.sql import Select
 from starlette.status import HTTP_404_NOT_FOUND
 
+from app import tracing
+from app.metrics import DB_STATEMENT_SECONDS
+from app.pagination import after_cursor, encode_cursor
+
 T = TypeVar("T", bound="CrudMixin")
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def _span_attributes(model: str, method: str, filters: Dict[str, Any]) -> Dict:
+    attributes: Dict[str, Any] = {
+        "db.operation.name": method,
+        "db.collection.name": model,
+    }
+    for key, value in filters.items():
+        if key != "id" and key not in tracing.ID_ATTRIBUTES:
+            continue
+        value = tracing.id_attribute(value)
+        if value is not None:
+            attributes[tracing.ID_ATTRIBUTES.get(key, "db.row.id")] = value
+    return attributes
+
+
+def instrumented(method: F) -> F:
+    """Time a CrudMixin method by method and model, and trace it.
+
+    The span is named ``Model.method``; id filters (``id``, ``trip_id``, ...)
+    passed as keyword arguments become attributes.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    async def wrapper(cls: Type[Any], *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            if not tracing.tracing_enabled():
+                return await method(cls, *args, **kwargs)
+            attributes = _span_attributes(cls.__name__, name, kwargs)
+            with tracing.span(f"{cls.__name__}.{name}", attributes):
+                return await method(cls, *args, **kwargs)
+        finally:
+            DB_STATEMENT_SECONDS.observe(
+                time.perf_counter() - start, name, cls.__name__
+            )
+
+    return cast(F, wrapper)
 
 
 class CrudMixin:
     @classmethod
+    @instrumented
     async def exists(cls: Type[T], **kwargs: Any) -> bool:
         stmt = exists(select(cls).filter_by(**kwargs)).select()
         obj_exists = await db.session.scalar(stmt)
@@ -23,12 +82,35 @@ class CrudMixin:
         return obj_exists
 
     @classmethod
+    @instrumented
     async def create(cls: Type[T], **kwargs: Any) -> T:
         stmt = insert(cls).values(kwargs).returning("*")
         result = await db.session.execute(stmt)
         return cast(T, result.one()[0])
 
     @classmethod
+    @instrumented
+    async def create_many(cls: Type[T], rows: List[Dict[str, Any]]) -> List[T]:
+        """Insert several rows in one batch and return the created objects.
+
+        The rows are sent as multi-row ``INSERT ... VALUES ... RETURNING``
+        statements (split into pages by SQLAlchemy when needed), and the
+        returned objects are in the same order as ``rows``.
+
+        Args:
+            rows: Column values for each row to insert
+
+        Returns:
+            Created objects, with server defaults populated
+        """
+        if not rows:
+            return []
+        stmt = insert(cls).returning(cls, sort_by_parameter_order=True)
+        result = await db.session.scalars(stmt, rows)
+        return cast(List[T], result.all())
+
+    @classmethod
+    @instrumented
     async def merge(
         cls: Type[T],
         key: List[str],
@@ -41,6 +123,7 @@ class CrudMixin:
         return [cast(T, row[0]) for row in result.all()]
 
     @classmethod
+    @instrumented
     async def get(cls: Type[T], **kwargs: Any) -> T:
         statement = select(cls).filter_by(**kwargs)
         obj = (await db.session.execute(statement)).unique().scalars().one_or_none()
@@ -53,12 +136,52 @@ class CrudMixin:
         return obj
 
     @classmethod
+    @instrumented
     async def select(cls: Type[T], **kwargs: Any) -> List[T]:
         statement = select(cls).filter_by(**kwargs)
         objs = (await db.session.execute(statement)).scalars().all()
         return cast(List[T], objs)
 
     @classmethod
+    @instrumented
+    async def select_page(
+        cls: Type[T],
+        *conditions: Any,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[T], Optional[str]]:
+        """Return one page of rows newest first, using keyset pagination.
+
+        Args:
+            conditions: Filters applied to the query
+            limit: Maximum number of rows to return
+            cursor: Cursor returned with the previous page, or None for the first page
+
+        Returns:
+            Tuple of (rows, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        created_at, id = getattr(cls, "created_at"), getattr(cls, "id")
+        statement = select(cls).where(*conditions)
+        if cursor:
+            statement = statement.where(after_cursor(created_at, id, cursor))
+        # Fetch one extra row to know whether there is a next page
+        statement = statement.order_by(created_at.desc(), id).limit(limit + 1)
+        objs = list((await db.session.execute(statement)).scalars().all())
+
+        next_cursor = None
+        if len(objs) > limit:
+            objs = objs[:limit]
+            last = objs[-1]
+            next_cursor = encode_cursor(
+                getattr(last, "created_at"), getattr(last, "id")
+            )
+        return objs, next_cursor
+
+    @classmethod
+    @instrumented
     async def select_one(cls: Type[T], statement: Select) -> Optional[T]:
         """Execute a custom select query and return a single result.
 
@@ -72,6 +195,7 @@ class CrudMixin:
         return cast(Optional[T], result.unique().scalar_one_or_none())
 
     @classmethod
+    @instrumented
     async def delete(cls: Type[T], **kwargs: Any) -> List[T]:
         stmt = delete(cls).filter_by(**kwargs).returning("*")
         result = await db.session.execute(stmt)
@@ -0,0 +1,146 @@
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi_sqlalchemy import async_db as db
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from app import settings
+from app.metrics import DB_POOL_CHECKOUT_SECONDS
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waited.
+
+    The time covers waiting for a free connection and, when the pool is
+    below its limit, opening a new one. Checkouts run in the event loop
+    thread, so the histogram and counters are updated without a lock.
+    """
+
+    waiting = 0
+    timeouts = 0
+    wait_seconds_total = 0.0
+    wait_seconds_max = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            wait = time.perf_counter() - start
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            DB_POOL_CHECKOUT_SECONDS.observe(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection counts and checkout waits.
+
+        ``overflow`` counts connections opened beyond ``size``; ``waiting``
+        counts checkouts blocked on a full pool or on a new connection.
+        """
+        return {
+            "size": self.size(),
+            "max_connections": self.size() + self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": self.waiting,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+def engine_args() -> Dict[str, Any]:
+    """Return the keyword arguments for the application's asyncpg engines.
+
+    Pool limits, recycling and pre-ping come from the DB_POOL_* settings;
+    the prepared statement cache, statement timeout and JIT are set per
+    connection when it is opened.
+    """
+    server_settings = {}
+    if settings.DB_STATEMENT_TIMEOUT:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT)
+    if not settings.DB_JIT:
+        server_settings["jit"] = "off"
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {
+            # SQLAlchemy's cache of prepared statements and asyncpg's own
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        },
+    }
+
+
+_engine: Optional[AsyncEngine] = None
+_read_engine: Optional[AsyncEngine] = None
+
+
+def get_engine() -> AsyncEngine:
+    """Return the process-wide engine for POSTGRES_URL (the read-write lane)."""
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(settings.POSTGRES_URL, **engine_args())
+    return _engine
+
+
+def get_read_engine() -> AsyncEngine:
+    """Return the engine for the read-only lane.
+
+    It has its own pool on POSTGRES_READ_URL when that is set, and shares the
+    main engine's pool otherwise. On PostgreSQL its transactions are started
+    read-only (``BEGIN READ ONLY``), so a stray write fails instead of
+    landing on a replica or slipping into a GET.
+    """
+    global _read_engine
+    if _read_engine is None:
+        engine = get_engine()
+        if settings.POSTGRES_READ_URL:
+            engine = create_async_engine(settings.POSTGRES_READ_URL, **engine_args())
+        if engine.dialect.name == "postgresql":
+            engine = engine.execution_options(postgresql_readonly=True)
+        _read_engine = engine
+    return _read_engine
+
+
+def get_read_pool() -> Optional[TimedQueuePool]:
+    """Return the read lane's pool, or None when it shares the main pool."""
+    pool = get_read_engine().pool
+    return None if pool is get_engine().pool else pool  # type: ignore[return-value]
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of both lanes; they reconnect on next use."""
+    disposed = set()
+    for engine in (_engine, _read_engine):
+        if engine is not None and id(engine.pool) not in disposed:
+            disposed.add(id(engine.pool))
+            await engine.dispose()
+
+
+async def read_only_session() -> AsyncIterator[None]:
+    """Route dependency running the request's database work read-only.
+
+    Replaces the request's session with one bound to the read-only lane for
+    the duration of the route, including dependencies declared after it
+    (e.g. the current user lookup). The session is closed without a commit;
+    the read-write session opened by the middleware is left unused, so it
+    never checks out a connection or sends a COMMIT.
+
+    Use as ``@router.get(..., dependencies=[Depends(read_only_session)])``.
+    """
+    async with db(session_args={"bind": get_read_engine()}, commit_on_exit=False):
+        yield
@@ -0,0 +1,58 @@
+import math
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Optional, Tuple
+
+# Upper bound (exclusive) of the NUMERIC(6, 2) width/height/depth columns, in cm
+MAX_DIMENSION = 10000
+# Scale of those columns; values are rounded the way Postgres rounds them
+_CENTIMETRE_STEP = Decimal("0.01")
+
+Dimensions = Tuple[float, float, float]
+
+
+def parse_dimensions(value: Any) -> Optional[Dimensions]:
+    """Parse a ``WxHxD`` string in centimetres.
+
+    Spaces, upper-case ``X`` and a ``cm`` suffix are accepted. Values are
+    rounded to the columns' two decimals before the range check, so anything
+    accepted here is stored as given and stays positive.
+
+    Returns:
+        The width, height and depth, or None if the value is missing, malformed
+        or out of range.
+    """
+    if not value:
+        return None
+    parts = str(value).lower().replace(" ", "").replace("cm", "").split("x")
+    if len(parts) != 3:
+        return None
+    try:
+        width, height, depth = (_round(float(part)) for part in parts)
+    except ValueError:
+        return None
+    if not all(
+        math.isfinite(d) and 0 < d < MAX_DIMENSION for d in (width, height, depth)
+    ):
+        return None
+    return width, height, depth
+
+
+def _round(value: float) -> float:
+    if not math.isfinite(value):
+        return value
+    return float(Decimal(str(value)).quantize(_CENTIMETRE_STEP, ROUND_HALF_UP))
+
+
+def dimension_columns(value: Any, prefix: str = "") -> Dict[str, Optional[float]]:
+    """Return the numeric width/height/depth column values for a ``WxHxD`` string.
+
+    Args:
+        value: The dimensions string.
+        prefix: Column name prefix, e.g. ``"item_"`` for generated list items.
+    """
+    width, height, depth = parse_dimensions(value) or (None, None, None)
+    return {
+        f"{prefix}width": width,
+        f"{prefix}height": height,
+        f"{prefix}depth": depth,
+    }
@@ -0,0 +1,158 @@
+import atexit
+import itertools
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, TextIO
+
+from app import settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed in ``extra``
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+}
+_SAMPLED = {"sampled": True}
+_sample_counter = itertools.count()
+
+
+class Preview:
+    """Truncated preview of a value, formatted only if the record is written.
+
+    Use as a logging argument: ``logger.debug("Payload: %s", Preview(payload))``.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = 200) -> None:
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[: self.limit]}... ({len(text)} characters)"
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue records for the writer thread without formatting them first.
+
+    QueueHandler.prepare() merges the arguments into the message in the
+    logging thread so the record can be pickled. Records here stay in the
+    process, so that is left to the writer, and a lazy argument like Preview
+    costs nothing on the event loop. Arguments must not be mutated after
+    they are logged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def debug_sampled(logger: logging.Logger, msg: str, *args: Any) -> None:
+    """Log a high-volume debug record (e.g. one per item), sampled.
+
+    Only one in LOG_SAMPLE_EVERY calls is logged, marked with
+    ``"sampled": true``. The decision is taken before the record is built,
+    so a dropped call costs a counter increment.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if next(_sample_counter) % max(settings.LOG_SAMPLE_EVERY, 1) == 0:
+        logger.debug(msg, *args, extra=_SAMPLED, stacklevel=2)
+
+
+_listener: Optional[QueueListener] = None
+_installed: Optional[logging.Handler] = None
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """Parse ``"logger=LEVEL,..."`` into a mapping of logger names to levels."""
+    levels = {}
+    for entry in spec.split(","):
+        name, _, level = entry.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(stream: Optional[TextIO] = None) -> None:
+    """Set up the root logger from the LOG_* settings.
+
+    With LOG_QUEUE on, loggers only put records on a queue and a
+    QueueListener thread formats and writes them to ``stream`` (stderr by
+    default). Calling it again replaces the previous configuration.
+
+    Raises:
+        ValueError: If a configured level isn't a known level name
+    """
+    global _listener, _installed
+    stop_logging()
+
+    handler = logging.StreamHandler(stream)
+    if settings.LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    installed: logging.Handler = handler
+    if settings.LOG_QUEUE:
+        installed = DeferredQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(installed.queue, handler)
+        _listener.start()
+
+    root = logging.getLogger()
+    if _installed is not None:
+        root.removeHandler(_installed)
+    root.addHandler(installed)
+    _installed = installed
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+
+def stop_logging() -> None:
+    """Write out the queued records and stop the writer thread.
+
+    Records logged afterwards are written directly by the calling thread.
+    """
+    global _listener, _installed
+    if _listener is None:
+        return
+    _listener.stop()
+    direct = _listener.handlers[0]
+    _listener = None
+    if _installed is not None:
+        root = logging.getLogger()
+        root.removeHandler(_installed)
+        root.addHandler(direct)
+        _installed = direct
+
+
+atexit.register(stop_logging)
@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 
@@ -12,23 +13,34 @@ dotenv_path = "../.env"
 # Pass override=True if you want .env to take precedence over existing system env vars
 load_dotenv(dotenv_path=dotenv_path, override=True)
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi_sqlalchemy import AsyncDBSessionMiddleware
 
-from app import settings  # an object to provide global access to a database session
 from app.api import auth
 from app.api.generated_lists import router as generated_lists_router
+from app.api.jobs import router as jobs_router
+from app.api.metrics import router as metrics_router
 from app.api.special_lists import router as special_lists_router
 from app.api.trips import router as trips_router
 from app.config import CORS_ORIGINS
-
-# Configure root logger
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
+from app.database import dispose_engines, get_engine
+from app.logging_config import configure_logging, stop_logging
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.services.generation_jobs import generation_workers
+from app.services.http_client import close_http_client, start_http_client
+from app.services.password_executor import (
+    ExecutorBusyError,
+    shutdown_password_executor,
 )
+from app.tracing import configure_tracing, shutdown_tracing
+
+# Configure root logger (levels, format and background writer from LOG_* settings)
+configure_logging()
+# Spans are exported as configured by the TRACE_* settings (off by default)
+configure_tracing()
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
@@ -36,10 +48,28 @@ logger = logging.getLogger(__name__)
 # Development settings
 DEV_MODE = True  # TODO: Move to environment variable
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients on startup and release them on shutdown."""
+    await start_http_client()
+    generation_workers.start()
+    try:
+        yield
+    finally:
+        await generation_workers.stop()
+        await close_http_client()
+        shutdown_password_executor()
+        await dispose_engines()
+        shutdown_tracing()
+        stop_logging()
+
+
 app = FastAPI(
     title="PackMeUp API",
     description="API for managing packing lists and trips",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add middleware first
@@ -53,14 +83,33 @@ app.add_middleware(
 )
 
 app.add_middleware(
-    AsyncDBSessionMiddleware, commit_on_exit=True, db_url=settings.POSTGRES_URL
+    AsyncDBSessionMiddleware,
+    commit_on_exit=True,
+    custom_engine=get_engine(),
 )
 
+# Added last so they are the outermost middleware and cover the whole request
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request: Request, exc: ExecutorBusyError):
+    """Ask the client to retry when CPU-bound work is saturated."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Then add routers
 app.include_router(trips_router)
 app.include_router(special_lists_router)
 app.include_router(generated_lists_router)
+app.include_router(jobs_router)
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+app.include_router(metrics_router)
 
 
 @app.get("")
@@ -0,0 +1,249 @@
+import math
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+# Upper bounds (seconds) shared by the latency histograms, from a fast primary
+# key lookup up to a slow model answer
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+# Upper bounds for item counts per generated list
+COUNT_BUCKETS = (0, 1, 5, 10, 20, 30, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+class Counter:
+    """Monotonic counter, one value per combination of label values.
+
+    Like the other process-wide counters in the app it takes no lock: it is
+    only updated from the event loop thread. Work done in worker threads is
+    measured there and recorded once the awaiting coroutine resumes.
+    """
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Add ``amount`` to the series of the given label values."""
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def lines(self) -> Iterator[str]:
+        for labels, value in list(self._values.items()):
+            selector = _selector(self.labels, labels)
+            yield f"{self.name}{selector} {_format_value(value)}"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets, per label values.
+
+    Each series is a flat list of per-bucket counts followed by the sum, so
+    an observation is a bisect and two additions. Counts are made cumulative
+    only when the metrics are rendered. Updated from the event loop thread
+    only, like Counter.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one value in the series of the given label values."""
+        series = self._series.get(labels)
+        if series is None:
+            # One slot per bucket, one for +Inf, then the sum
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def sum(self, *labels: str) -> float:
+        series = self._series.get(labels)
+        return series[-1] if series else 0.0
+
+    def lines(self) -> Iterator[str]:
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, series in list(self._series.items()):
+            selector = _selector(self.labels, labels)
+            # The label pairs are rendered once per series, not per bucket
+            opening = selector[:-1] + "," if selector else "{"
+            bucket = f"{self.name}_bucket{opening}le="
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += int(count)
+                yield f'{bucket}"{bound}"}} {cumulative}'
+            yield f"{self.name}_sum{selector} {_format_value(series[-1])}"
+            yield f"{self.name}_count{selector} {cumulative}"
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+Metric = Union[Counter, Histogram]
+
+_metrics: List[Metric] = []
+_stats_sources: Dict[str, Callable[[], Any]] = {}
+
+
+def counter(name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+    """Create a counter that is included in render()."""
+    metric = Counter(name, documentation, labels)
+    _metrics.append(metric)
+    return metric
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labels: Sequence[str] = (),
+    buckets: Sequence[float] = LATENCY_BUCKETS,
+) -> Histogram:
+    """Create a histogram that is included in render()."""
+    metric = Histogram(name, documentation, labels, buckets)
+    _metrics.append(metric)
+    return metric
+
+
+def register_stats(prefix: str, get_component: Callable[[], Any]) -> None:
+    """Expose the numeric values of a component's stats() as gauges.
+
+    ``get_component`` is called on every render, e.g. the component's
+    ``get_*`` function; it may return None when the component is disabled.
+    Each numeric entry ``key`` of its stats() becomes a gauge named
+    ``<prefix>_<key>``; other values are left out.
+    """
+    _stats_sources[prefix] = get_component
+
+
+def reset() -> None:
+    """Drop all recorded values (used by tests)."""
+    for metric in _metrics:
+        metric.clear()
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value)) if isinstance(value, int) else f"{value:.1f}"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _selector(names: Labels, values: Labels) -> str:
+    """Return ``{name="value",...}``, or an empty string without labels."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def render() -> str:
+    """Render all metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.lines())
+
+    for prefix, get_component in _stats_sources.items():
+        component = get_component()
+        if component is None:
+            continue
+        for key, value in component.stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{prefix}_{key}"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUEST_SECONDS = histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request, by route template",
+    ("method", "route", "status"),
+)
+DB_STATEMENT_SECONDS = histogram(
+    "db_statement_duration_seconds",
+    "Time to execute a CrudMixin statement, by method and model",
+    ("method", "model"),
+)
+DB_POOL_CHECKOUT_SECONDS = histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a database connection from the pool",
+)
+OPENROUTER_REQUEST_SECONDS = histogram(
+    "openrouter_request_duration_seconds",
+    "Time of a single OpenRouter attempt, by model and HTTP status",
+    ("model", "status"),
+)
+OPENROUTER_RETRIES = counter(
+    "openrouter_retries_total", "OpenRouter attempts that were retried", ("model",)
+)
+AI_PARSE_SECONDS = histogram(
+    "ai_response_parse_seconds",
+    "Time to turn a model answer into items, by path (schema or repair)",
+    ("path",),
+)
+AI_ITEMS_RECOVERED = histogram(
+    "ai_items_recovered",
+    "Items recovered from a model answer, by path (schema or repair)",
+    ("path",),
+    buckets=COUNT_BUCKETS,
+)
+EXECUTOR_WAIT_SECONDS = histogram(
+    "executor_wait_seconds",
+    "Time a task waited for a worker thread, by executor",
+    ("executor",),
+)
+EXECUTOR_TASK_SECONDS = histogram(
+    "executor_task_duration_seconds",
+    "Time a worker thread spent running a task (e.g. bcrypt), by executor and task",
+    ("executor", "task"),
+)
@@ -5,15 +5,37 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError  # type: ignore
 
 from app.models import User
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, TokenData
+from app.services.principal_cache import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
+async def get_current_claims(
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> TokenData:
+    """Validate the access token and return its claims without touching the DB.
+
+    For routes that only need the user id. A deleted user's token keeps
+    passing this check until it expires.
+    """
+    try:
+        return AuthService.verify_token(token)
+    except (JWTError, HTTPException):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> User:
     try:
         token_data = AuthService.verify_token(token)
-        user = await User.get(id=token_data.user_id)
+        user = principal_cache.get(token_data.user_id)
+        if user is None:
+            user = await User.get(id=token_data.user_id)
+            principal_cache.set(user)
         return user
     except (JWTError, HTTPException):
         raise HTTPException(
@@ -0,0 +1,47 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import HTTP_REQUEST_SECONDS
+
+# Route label for requests that matched no route (e.g. 404s), so arbitrary
+# paths don't create new series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Record the latency of every HTTP request by method, route and status.
+
+    The route label is the matched route's path template (``/api/trips/{id}``),
+    read from the scope once the router has handled the request. A plain ASGI
+    middleware rather than BaseHTTPMiddleware, so it adds no task or stream
+    wrapping to the request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                str(status),
+            )
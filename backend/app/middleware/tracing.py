@@ -0,0 +1,50 @@
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import tracing
+from app.tracing import ID_ATTRIBUTES, id_attribute
+
+
+class TracingMiddleware:
+    """Run every HTTP request in a server span named ``METHOD /route/{template}``.
+
+    The span starts as ``METHOD`` and is renamed once the router has matched
+    the route; trip and list ids from the path become attributes. Spans for
+    the services, statements and OpenRouter calls made by the request are
+    its children. Does nothing while tracing is off.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing.tracing_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        attributes = {"http.request.method": method, "url.path": scope["path"]}
+        with tracing.span(method, attributes, kind=SpanKind.SERVER) as span:
+            if span is None:
+                # Tracing was shut down since the check above
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
+                for name, value in scope.get("path_params", {}).items():
+                    if name in ID_ATTRIBUTES:
+                        span.set_attribute(ID_ATTRIBUTES[name], id_attribute(value))
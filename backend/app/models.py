@@ -6,14 +6,18 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
+    Computed,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Table,
+    UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.dialects.postgresql import UUID as SQLAlchemyUUID
@@ -150,6 +154,14 @@ class Item(Base):
     # Note: CHECK constraint 'weight >= 0' should be added in migration
     __table_args__ = (
         CheckConstraint("weight >= 0", name="check_item_weight_non_negative"),
+        CheckConstraint(
+            "width > 0 AND height > 0 AND depth > 0",
+            name="check_item_dimensions_positive",
+        ),
+        CheckConstraint(
+            "(width IS NULL) = (height IS NULL) AND (height IS NULL) = (depth IS NULL)",
+            name="check_item_dimensions_complete",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -160,6 +172,13 @@ class Item(Base):
     name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     weight: Mapped[Optional[float]] = mapped_column(Numeric(5, 3), nullable=True)
     dimensions: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # "WxHxD"
+    # Parsed from dimensions, in cm; volume is in cm³
+    width: Mapped[Optional[float]] = mapped_column(Numeric(6, 2), nullable=True)
+    height: Mapped[Optional[float]] = mapped_column(Numeric(6, 2), nullable=True)
+    depth: Mapped[Optional[float]] = mapped_column(Numeric(6, 2), nullable=True)
+    volume: Mapped[Optional[float]] = mapped_column(
+        Numeric(16, 3), Computed("width * height * depth", persisted=True), index=True
+    )
     category: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
@@ -222,6 +241,13 @@ class Trip(Base):
     __table_args__ = (
         CheckConstraint("duration_days > 0", name="check_trip_duration_positive"),
         CheckConstraint("num_adults >= 0", name="check_trip_num_adults_non_negative"),
+        # Supports keyset pagination on (created_at, id)
+        Index(
+            "ix_trips_user_id_created_at_id",
+            "user_id",
+            text("created_at DESC"),
+            "id",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -291,6 +317,15 @@ class Trip(Base):
 
 class SpecialList(Base):
     __tablename__ = "special_lists"
+    # Supports keyset pagination on (created_at, id)
+    __table_args__ = (
+        Index(
+            "ix_special_lists_user_id_created_at_id",
+            "user_id",
+            text("created_at DESC"),
+            "id",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         SQLAlchemyUUID(as_uuid=True),
@@ -383,6 +418,15 @@ class SpecialListItem(Base):
 
 class GeneratedList(Base):
     __tablename__ = "generated_lists"
+    # Supports keyset pagination on (created_at, id)
+    __table_args__ = (
+        Index(
+            "ix_generated_lists_user_id_created_at_id",
+            "user_id",
+            text("created_at DESC"),
+            "id",
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         SQLAlchemyUUID(as_uuid=True),
@@ -457,6 +501,15 @@ class GeneratedListItem(Base):
         CheckConstraint(
             "item_weight >= 0", name="check_gen_list_item_weight_non_negative"
         ),
+        CheckConstraint(
+            "item_width > 0 AND item_height > 0 AND item_depth > 0",
+            name="check_gen_list_item_dimensions_positive",
+        ),
+        CheckConstraint(
+            "(item_width IS NULL) = (item_height IS NULL)"
+            " AND (item_height IS NULL) = (item_depth IS NULL)",
+            name="check_gen_list_item_dimensions_complete",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -485,6 +538,14 @@ class GeneratedListItem(Base):
     item_name: Mapped[str] = mapped_column(String, nullable=False)
     item_weight: Mapped[Optional[float]] = mapped_column(Numeric(5, 3), nullable=True)
     item_dimensions: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Parsed from item_dimensions, in cm; item_volume is in cm³
+    item_width: Mapped[Optional[float]] = mapped_column(Numeric(6, 2), nullable=True)
+    item_height: Mapped[Optional[float]] = mapped_column(Numeric(6, 2), nullable=True)
+    item_depth: Mapped[Optional[float]] = mapped_column(Numeric(6, 2), nullable=True)
+    item_volume: Mapped[Optional[float]] = mapped_column(
+        Numeric(16, 3),
+        Computed("item_width * item_height * item_depth", persisted=True),
+    )
     item_category: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
@@ -521,6 +582,22 @@ class GeneratedListItem(Base):
     def itemDimensions(self) -> Optional[str]:
         return self.item_dimensions
 
+    @property
+    def itemWidth(self) -> Optional[float]:
+        return self.item_width
+
+    @property
+    def itemHeight(self) -> Optional[float]:
+        return self.item_height
+
+    @property
+    def itemDepth(self) -> Optional[float]:
+        return self.item_depth
+
+    @property
+    def itemVolume(self) -> Optional[float]:
+        return self.item_volume
+
     @property
     def itemCategory(self) -> Optional[str]:
         return self.item_category
@@ -547,6 +624,74 @@ class GeneratedListItem(Base):
         return f"<GeneratedListItem(id={self.id}, name='{self.item_name}', qty={self.quantity}, status='{status}', list_id={self.generated_list_id})>"
 
 
+class GenerationJob(Base):
+    """A packing list generation request processed in the background."""
+
+    __tablename__ = "generation_jobs"
+    __table_args__ = (
+        # Resubmitting with the same key returns the existing job
+        UniqueConstraint(
+            "user_id",
+            "idempotency_key",
+            name="uq_generation_jobs_user_id_idempotency_key",
+        ),
+        # Supports workers picking the oldest runnable job
+        Index("ix_generation_jobs_status_created_at", "status", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        SQLAlchemyUUID(as_uuid=True),
+        primary_key=True,
+        server_default=func.gen_random_uuid(),
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        SQLAlchemyUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    trip_id: Mapped[uuid.UUID] = mapped_column(
+        SQLAlchemyUUID(as_uuid=True),
+        ForeignKey("trips.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    status: Mapped[str] = mapped_column(
+        String, nullable=False, server_default="pending"
+    )  # Enum managed by app
+    # Generation options (special list ids, excluded categories)
+    params: Mapped[Dict[str, Any]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # A pending job isn't picked up before this time; for a running job it's the
+    # end of the worker's lease, after which the job is considered abandoned
+    locked_until: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    generated_list_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        SQLAlchemyUUID(as_uuid=True),
+        ForeignKey("generated_lists.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self):
+        return f"<GenerationJob(id={self.id}, trip_id={self.trip_id}, status='{self.status}')>"
+
+
 # Example usage (optional, for testing or setup)
 # if __name__ == "__main__":
 #     # Replace with your actual database URL
@@ -0,0 +1,54 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Tuple
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, and_, or_
+
+Cursor = Tuple[datetime, UUID]
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encode the position of the last row on a page as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def after_cursor(created_at: Any, id: Any, cursor: str) -> ColumnElement[bool]:
+    """Build the condition selecting rows after ``cursor``.
+
+    Pages are ordered by ``created_at DESC, id ASC``, which matches the
+    ``(user_id, created_at DESC, id)`` indexes, so every page is a short index
+    range scan no matter how deep it is.
+
+    Args:
+        created_at: created_at column to compare
+        id: id column to compare
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Condition to add to the WHERE clause
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    last_created_at, last_id = decode_cursor(cursor)
+    return or_(
+        created_at < last_created_at,
+        and_(created_at == last_created_at, id > last_id),
+    )
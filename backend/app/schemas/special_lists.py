@@ -19,6 +19,10 @@ class ItemDTO(BaseModel):
     name: str
     weight: Optional[float] = None
     dimensions: Optional[str] = None
+    width: Optional[float] = None
+    height: Optional[float] = None
+    depth: Optional[float] = None
+    volume: Optional[float] = Field(None, description="Volume in cm³")
     category: Optional[str] = None
 
     class Config:
@@ -84,10 +88,11 @@ class SpecialListFilter(BaseModel):
 
 class PaginatedSpecialListResponse(BaseModel):
     items: List[SpecialListDTO]
-    total: int
+    total: Optional[int]
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None
 
 
 class AddTagCommand(BaseModel):
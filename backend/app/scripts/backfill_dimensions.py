@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+from typing import Any, Tuple, Type
+
+from fastapi_sqlalchemy import AsyncDBSessionMiddleware
+from fastapi_sqlalchemy import async_db as db
+from sqlalchemy import select, update
+
+from app import settings
+from app.dimensions import dimension_columns
+from app.main import app
+from app.models import GeneratedListItem, Item
+
+# Configures the engine used by db()
+AsyncDBSessionMiddleware(app, db_url=settings.POSTGRES_URL)
+
+# (model, dimensions string column, numeric column prefix)
+TARGETS = (
+    (Item, "dimensions", ""),
+    (GeneratedListItem, "item_dimensions", "item_"),
+)
+
+
+async def backfill_model(
+    model: Type[Any], source: str, prefix: str, batch_size: int
+) -> Tuple[int, int]:
+    """Parse the dimensions strings of one model into its numeric columns.
+
+    Rows whose numeric columns are still empty are walked in primary key order
+    and each batch is updated and committed in its own transaction, so the
+    script can be interrupted and run again. Strings that can't be parsed are
+    left as they are.
+
+    Args:
+        model: The model to backfill
+        source: Name of the ``WxHxD`` string column
+        prefix: Prefix of the width/height/depth columns
+        batch_size: Number of rows read and updated per transaction
+
+    Returns:
+        The number of updated and skipped rows
+    """
+    source_column = getattr(model, source)
+    width_column = getattr(model, f"{prefix}width")
+    updated = skipped = 0
+    last_id = None
+    while True:
+        async with db():
+            query = (
+                select(model.id, source_column)
+                .where(source_column.is_not(None), width_column.is_(None))
+                .order_by(model.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(model.id > last_id)
+            rows = (await db.session.execute(query)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            values = []
+            for row_id, dimensions in rows:
+                columns = dimension_columns(dimensions, prefix=prefix)
+                if columns[f"{prefix}width"] is None:
+                    skipped += 1
+                    continue
+                values.append({"id": row_id, **columns})
+            if values:
+                # Bulk UPDATE by primary key, executed as a single executemany
+                await db.session.execute(update(model), values)
+                await db.session.commit()
+            updated += len(values)
+        print(f"{model.__tablename__}: {updated} updated, {skipped} skipped")
+    return updated, skipped
+
+
+async def backfill(batch_size: int) -> None:
+    """Backfill the numeric dimension columns of all models."""
+    for model, source, prefix in TARGETS:
+        await backfill_model(model, source, prefix, batch_size)
+
+
+def main():
+    """Handle command line arguments and run the backfill."""
+    parser = argparse.ArgumentParser(
+        description="Fill numeric width/height/depth columns from WxHxD strings"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Rows updated per transaction"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ from jose import JWTError, jwt  # type: ignore
 from pydantic import BaseModel
 
 from app.models import User
+from app.services.password_executor import ExecutorBusyError
+from app.services.principal_cache import principal_cache
 from app.services.user_service import UserService
 
 # Configure logger
@@ -119,6 +121,8 @@ class AuthService:
             )
             return user, token
 
+        except ExecutorBusyError:
+            raise
         except Exception as e:
             logger.error("Authentication failed with error: %s", str(e), exc_info=True)
             raise HTTPException(
@@ -191,3 +195,4 @@ class AuthService:
     @staticmethod
     async def logout(user_id: UUID) -> None:
         await UserService.delete_session(user_id)
+        principal_cache.invalidate(user_id)
@@ -0,0 +1,186 @@
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Tuple, Type
+
+from app import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency for a while, then probe it.
+
+    Outcomes of the calls made in the last ``window`` seconds are kept. Once
+    there are at least ``min_calls`` of them and the share of failed or slow
+    calls (slower than ``slow_call_seconds``) reaches ``failure_rate``, the
+    circuit opens and calls fail at once with CircuitOpenError. After
+    ``cooldown`` seconds it becomes half-open and lets one call through: if it
+    succeeds the circuit closes again, otherwise it reopens for another
+    cooldown. State is only changed from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float,
+        slow_call_seconds: float,
+        min_calls: int,
+        window: float,
+        cooldown: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.window = window
+        self.cooldown = cooldown
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        # (finished at, counts as failure)
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.cooldown
+        ):
+            self._state = CircuitState.HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open, probing")
+        return self._state
+
+    def before_call(self) -> None:
+        """Let a call through or reject it.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe
+                already running
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+        if state == CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(f"{self.name} is unavailable, circuit is {state.value}")
+
+    def record(self, duration: float, failed: bool) -> None:
+        """Record the outcome of a call let through by before_call()."""
+        now = self._clock()
+        failed = failed or duration >= self.slow_call_seconds
+        if self._state == CircuitState.HALF_OPEN:
+            self._probing = False
+            if failed:
+                self._open(now)
+            else:
+                self._state = CircuitState.CLOSED
+                self._outcomes.clear()
+                logger.info(f"Circuit {self.name} closed")
+            return
+
+        self._outcomes.append((now, failed))
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+        failures = sum(1 for _, f in self._outcomes if f)
+        if (
+            self._state == CircuitState.CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_rate
+        ):
+            self._open(now)
+
+    def cancel(self) -> None:
+        """Forget a call let through by before_call() without an outcome."""
+        self._probing = False
+
+    @asynccontextmanager
+    async def guard(
+        self, ignore: Tuple[Type[BaseException], ...] = ()
+    ) -> AsyncIterator[None]:
+        """Run the enclosed call through the breaker and record its outcome.
+
+        Args:
+            ignore: Errors that don't say anything about the dependency's
+                health, e.g. local rate limiting; they aren't recorded
+
+        Raises:
+            CircuitOpenError: If the call isn't allowed
+        """
+        self.before_call()
+        start = self._clock()
+        try:
+            yield
+        except ignore:
+            self.cancel()
+            raise
+        except Exception:
+            self.record(self._clock() - start, failed=True)
+            raise
+        except BaseException:
+            self.cancel()
+            raise
+        else:
+            self.record(self._clock() - start, failed=False)
+
+    def _open(self, now: float) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.opened += 1
+        logger.warning(
+            f"Circuit {self.name} opened, failing fast for {self.cooldown:.0f}s"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the state and the outcomes in the current window."""
+        failures = sum(1 for _, failed in self._outcomes if failed)
+        return {
+            "state": self.state.value,
+            "calls": len(self._outcomes),
+            "failures": failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+_openrouter_breaker: Optional[CircuitBreaker] = None
+
+
+def get_openrouter_breaker() -> CircuitBreaker:
+    """Return the process-wide circuit breaker for OpenRouter calls."""
+    global _openrouter_breaker
+    if _openrouter_breaker is None:
+        _openrouter_breaker = CircuitBreaker(
+            "openrouter",
+            failure_rate=settings.OPENROUTER_CIRCUIT_FAILURE_RATE,
+            slow_call_seconds=settings.OPENROUTER_CIRCUIT_SLOW_CALL_SECONDS,
+            min_calls=settings.OPENROUTER_CIRCUIT_MIN_CALLS,
+            window=settings.OPENROUTER_CIRCUIT_WINDOW,
+            cooldown=settings.OPENROUTER_CIRCUIT_COOLDOWN,
+        )
+    return _openrouter_breaker
+
+
+def reset() -> None:
+    """Drop the process-wide breaker so it's rebuilt from settings (used by tests)."""
+    global _openrouter_breaker
+    _openrouter_breaker = None
@@ -40,3 +40,10 @@ CATERING_OPTIONS: List[Tuple[int, str]] = [
     (CateringType.FULL_OWN.value, "Własne wyżywienie"),
     (CateringType.DINNER_OUTSIDE.value, "Kolacja na mieście"),
 ]
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -0,0 +1,333 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app import settings
+from app.services.prompts import PROMPT_HASH
+
+logger = logging.getLogger(__name__)
+
+# Bump when item post-processing changes so old entries stop matching; prompt
+# changes are picked up through PROMPT_HASH
+FINGERPRINT_VERSION = 1
+
+
+def _normalize_text(value: Any) -> Optional[str]:
+    """Lowercase, strip accents and collapse whitespace so equivalent inputs match."""
+    if value is None:
+        return None
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = " ".join(text.casefold().split())
+    return text or None
+
+
+def _normalize_luggage(luggage: Any) -> List[Dict[str, Any]]:
+    if not luggage:
+        return []
+    entries = luggage if isinstance(luggage, list) else [luggage]
+    normalized = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            entry = {
+                "max_weight": getattr(entry, "max_weight", None),
+                "dimensions": getattr(entry, "dimensions", None),
+            }
+        max_weight = entry.get("max_weight", entry.get("maxWeight"))
+        dimensions = entry.get("dimensions")
+        normalized.append(
+            {
+                "max_weight": float(max_weight) if max_weight is not None else None,
+                "dimensions": (
+                    str(dimensions).lower().replace(" ", "") if dimensions else None
+                ),
+            }
+        )
+    return sorted(normalized, key=lambda e: json.dumps(e, sort_keys=True))
+
+
+def _sorted_texts(values: Optional[Iterable[Any]]) -> List[str]:
+    return sorted({t for t in (_normalize_text(v) for v in values or []) if t})
+
+
+def trip_fingerprint(
+    trip: Any,
+    exclude_categories: Optional[List[str]] = None,
+    special_list_ids: Optional[Iterable[Any]] = None,
+) -> str:
+    """Build a canonical cache key from the prompt-relevant trip fields.
+
+    Args:
+        trip: Trip (or any object with the same attributes)
+        exclude_categories: Categories removed from the generated list
+        special_list_ids: IDs of special lists merged into the list
+
+    Returns:
+        Hex SHA-256 digest of the canonical trip profile
+    """
+    profile = {
+        "v": FINGERPRINT_VERSION,
+        "prompt": PROMPT_HASH,
+        "destination": _normalize_text(trip.destination),
+        "duration_days": trip.duration_days,
+        "num_adults": trip.num_adults,
+        "children_ages": sorted(trip.children_ages or []),
+        "accommodation": _normalize_text(trip.accommodation),
+        "transport": _normalize_text(trip.transport),
+        "activities": _sorted_texts(trip.activities),
+        "season": _normalize_text(trip.season),
+        "luggage": _normalize_luggage(trip.available_luggage),
+        "exclude_categories": _sorted_texts(exclude_categories),
+        "special_lists": sorted(str(i) for i in special_list_ids or []),
+    }
+    canonical = json.dumps(profile, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(ABC):
+    """Storage interface for cached generation results (serialized JSON strings)."""
+
+    evictions: int = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if it's missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str) -> None:
+        """Store a value, evicting older entries if a limit is exceeded."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry."""
+
+    def size(self) -> Tuple[int, int]:
+        """Return (number of entries, approximate bytes) if known."""
+        return 0, 0
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache bounded by entry count and total bytes, with a TTL."""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(key: str, value: str) -> int:
+        return len(key) + len(value.encode("utf-8"))
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= self._entry_size(key, value)
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        size = self._entry_size(key, value)
+        if size > self._max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._bytes += size
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def size(self) -> Tuple[int, int]:
+        return len(self._entries), self._bytes
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Local SQLite file shared by all workers on the host.
+
+    Queries run in a worker thread so the event loop isn't blocked. Recency is
+    tracked per entry, and the least recently used rows are evicted once the
+    entry limit is exceeded.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int) -> None:
+        self._path = path
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self.evictions = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS generation_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_generation_cache_accessed_at "
+                "ON generation_cache (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, run one transaction and close it."""
+        conn = sqlite3.connect(self._path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM generation_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                conn.execute("DELETE FROM generation_cache WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE generation_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return row[0]
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO generation_cache VALUES (?, ?, ?, ?)",
+                (key, value, now + self._ttl, now),
+            )
+            conn.execute("DELETE FROM generation_cache WHERE expires_at <= ?", (now,))
+            evicted = conn.execute(
+                "DELETE FROM generation_cache WHERE key IN ("
+                "SELECT key FROM generation_cache ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            ).rowcount
+            self.evictions += max(evicted, 0)
+
+    def _clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM generation_cache")
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+
+class GenerationCache:
+    """Cache of generated packing lists keyed by trip fingerprint."""
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[List[Dict]]:
+        """Return a fresh copy of the cached items, or None on a miss."""
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Generation cache lookup failed: {str(e)}")
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def set(self, key: str, items: List[Dict]) -> None:
+        """Store the items under the given key."""
+        try:
+            await self.backend.set(key, json.dumps(items, ensure_ascii=False))
+        except Exception as e:
+            logger.error(f"Generation cache store failed: {str(e)}")
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current backend size."""
+        entries, size_bytes = self.backend.size()
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "evictions": self.backend.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size_bytes,
+        }
+
+
+_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> Optional[GenerationCache]:
+    """Return the process-wide generation cache configured in settings.
+
+    Returns None when caching is disabled (GENERATION_CACHE_BACKEND=none).
+    """
+    global _cache
+    if _cache is None:
+        backend_name = settings.GENERATION_CACHE_BACKEND.lower()
+        backend: CacheBackend
+        if backend_name == "none":
+            return None
+        if backend_name == "sqlite":
+            backend = SQLiteCacheBackend(
+                settings.GENERATION_CACHE_PATH,
+                ttl=settings.GENERATION_CACHE_TTL,
+                max_entries=settings.GENERATION_CACHE_MAX_ENTRIES,
+            )
+        elif backend_name == "memory":
+            backend = MemoryCacheBackend(
+                ttl=settings.GENERATION_CACHE_TTL,
+                max_entries=settings.GENERATION_CACHE_MAX_ENTRIES,
+                max_bytes=settings.GENERATION_CACHE_MAX_BYTES,
+            )
+        else:
+            raise ValueError(
+                f"Unknown GENERATION_CACHE_BACKEND '{settings.GENERATION_CACHE_BACKEND}'"
+            )
+        _cache = GenerationCache(backend)
+    return _cache
+
+
+def reset() -> None:
+    """Drop the process-wide cache so it's rebuilt from settings (used by tests)."""
+    global _cache
+    _cache = None
@@ -0,0 +1,401 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi_sqlalchemy import async_db as db
+from sqlalchemy import ColumnElement, Update, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app import settings
+from app.models import GenerationJob
+from app.services.constants import JobStatus
+from app.services.trip_service import TripService
+
+logger = logging.getLogger(__name__)
+
+
+class JobLeaseLostError(Exception):
+    """Raised when a job's lease expired and another worker claimed it."""
+
+
+class GenerationJobService:
+    @staticmethod
+    async def submit(
+        trip_id: UUID,
+        user_id: UUID,
+        include_special_lists: Optional[List[UUID]] = None,
+        exclude_categories: Optional[List[str]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Tuple[GenerationJob, bool]:
+        """Queue a packing list generation job.
+
+        A job submitted again with the same idempotency key isn't queued twice;
+        the existing job is returned instead.
+
+        Args:
+            trip_id: ID of the trip to generate the list for
+            user_id: ID of the user requesting generation
+            include_special_lists: Optional list of special list IDs to include
+            exclude_categories: Optional list of categories to exclude
+            idempotency_key: Optional client-chosen key identifying the request
+
+        Returns:
+            Tuple of (job, whether it was created by this call)
+
+        Raises:
+            ValueError: If the idempotency key was used for another trip
+            RuntimeError: If the job holding the key kept disappearing before
+                it could be read
+        """
+        params = {
+            "include_special_lists": [str(i) for i in include_special_lists or []],
+            "exclude_categories": exclude_categories or [],
+        }
+        stmt = (
+            insert(GenerationJob)
+            .values(
+                user_id=user_id,
+                trip_id=trip_id,
+                idempotency_key=idempotency_key,
+                params=params,
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "idempotency_key"])
+            .returning(GenerationJob)
+        )
+        # The job holding the key can be deleted (with its trip) between the
+        # conflicting insert and the select; the insert is then tried again
+        for _ in range(2):
+            job = (await db.session.execute(stmt)).scalar_one_or_none()
+            if job is not None:
+                logger.debug(f"Queued generation job {job.id} for trip {trip_id}")
+                return job, True
+
+            existing = await GenerationJob.select_one(
+                select(GenerationJob).where(
+                    GenerationJob.user_id == user_id,
+                    GenerationJob.idempotency_key == idempotency_key,
+                )
+            )
+            if existing is not None:
+                if existing.trip_id != trip_id:
+                    raise ValueError(
+                        "Idempotency key was already used for another trip"
+                    )
+                return existing, False
+        raise RuntimeError(f"Could not queue generation job for trip {trip_id}")
+
+    @staticmethod
+    async def get_job(job_id: UUID, user_id: UUID) -> Optional[GenerationJob]:
+        """Get a job if it belongs to the user."""
+        return await GenerationJob.select_one(
+            select(GenerationJob).where(
+                GenerationJob.id == job_id, GenerationJob.user_id == user_id
+            )
+        )
+
+    @staticmethod
+    def claim_statement(now: datetime, lease: float, max_attempts: int) -> Update:
+        """Build the UPDATE that locks the oldest runnable job to a worker.
+
+        A job is runnable when it is pending, or running but its lease has
+        expired because the worker that claimed it stopped. SKIP LOCKED lets
+        concurrent workers, also in other processes, claim different jobs.
+        """
+        runnable = (
+            select(GenerationJob.id)
+            .where(
+                GenerationJob.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+                or_(
+                    GenerationJob.locked_until.is_(None),
+                    GenerationJob.locked_until <= now,
+                ),
+                GenerationJob.attempts < max_attempts,
+            )
+            .order_by(GenerationJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        return (
+            update(GenerationJob)
+            .where(GenerationJob.id == runnable)
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=GenerationJob.attempts + 1,
+                locked_until=now + timedelta(seconds=lease),
+            )
+            .returning(GenerationJob)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def claim_next(lease: float, max_attempts: int) -> Optional[GenerationJob]:
+        """Claim the oldest runnable job, failing abandoned jobs out of attempts."""
+        now = datetime.now(timezone.utc)
+        await db.session.execute(
+            update(GenerationJob)
+            .where(
+                GenerationJob.status == JobStatus.RUNNING,
+                GenerationJob.locked_until <= now,
+                GenerationJob.attempts >= max_attempts,
+            )
+            .values(
+                status=JobStatus.FAILED,
+                error="Worker stopped while processing the job",
+                locked_until=None,
+                finished_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        stmt = GenerationJobService.claim_statement(now, lease, max_attempts)
+        return (await db.session.execute(stmt)).scalar_one_or_none()
+
+    @staticmethod
+    def _owned(job: GenerationJob) -> Tuple[ColumnElement[bool], ...]:
+        """Match the job only while this run of it still holds the lease.
+
+        Once the lease expires another worker can claim the job, which bumps
+        ``attempts``; the stale worker's updates then match no row.
+        """
+        return (
+            GenerationJob.id == job.id,
+            GenerationJob.status == JobStatus.RUNNING,
+            GenerationJob.attempts == job.attempts,
+        )
+
+    @staticmethod
+    async def renew(job: GenerationJob, lease: float) -> bool:
+        """Extend the lease of a running job.
+
+        Returns:
+            False if the job is no longer held by this run
+        """
+        result = await db.session.execute(
+            update(GenerationJob)
+            .where(*GenerationJobService._owned(job))
+            .values(locked_until=datetime.now(timezone.utc) + timedelta(seconds=lease))
+            .returning(GenerationJob.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
+
+    @staticmethod
+    async def finish(
+        job: GenerationJob,
+        status: JobStatus,
+        generated_list_id: Optional[UUID] = None,
+        error: Optional[str] = None,
+        retry_at: Optional[datetime] = None,
+    ) -> bool:
+        """Record the outcome of a job run.
+
+        A job put back to pending with ``retry_at`` isn't claimed before then.
+
+        Returns:
+            False if nothing was recorded because the job is no longer held by
+            this run
+        """
+        finished = status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+        result = await db.session.execute(
+            update(GenerationJob)
+            .where(*GenerationJobService._owned(job))
+            .values(
+                status=status,
+                generated_list_id=generated_list_id,
+                error=error,
+                locked_until=retry_at,
+                finished_at=datetime.now(timezone.utc) if finished else None,
+            )
+            .returning(GenerationJob.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
+
+
+class GenerationWorkerPool:
+    """Process queued generation jobs with a fixed number of asyncio tasks.
+
+    The number of workers bounds how many AI calls run at once. A worker only
+    holds a database session for the short steps around the AI call: claiming
+    the job and loading its inputs, then storing the list together with the
+    job's result. Jobs are persisted, so jobs left behind by a stopped process
+    are claimed again once their lease expires. While the AI call runs the
+    lease is renewed every third of its length, and the result is only
+    stored if the job is still held by this run.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        poll_interval: float,
+        lease: float,
+        max_attempts: int,
+        retry_delay: float,
+    ) -> None:
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._wakeup = asyncio.Event()
+        self.processed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"generation-worker-{n}")
+            for n in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} generation workers")
+
+    async def stop(self) -> None:
+        """Cancel the workers; interrupted jobs are released for a later run."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def wake(self) -> None:
+        """Let idle workers look for a new job without waiting for the poll."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                ran = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Generation worker error: {str(e)}")
+                ran = False
+            if not ran:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def run_once(self) -> bool:
+        """Claim and process one job; return False if none was runnable."""
+        async with db(commit_on_exit=True):
+            job = await GenerationJobService.claim_next(self.lease, self.max_attempts)
+            if job is None:
+                return False
+            # Keep the loaded attributes usable after the session is closed
+            db.session.expunge(job)
+        try:
+            await self._process(job)
+        except asyncio.CancelledError:
+            await asyncio.shield(self._release(job))
+            raise
+        return True
+
+    async def _process(self, job: GenerationJob) -> None:
+        logger.debug(f"Processing generation job {job.id}, attempt {job.attempts}")
+        params = job.params or {}
+        try:
+            async with db():
+                trip = await TripService.get_trip(job.trip_id, user_id=job.user_id)
+                if not trip:
+                    raise ValueError("Trip not found")
+                special_lists = await TripService.get_special_lists(
+                    [UUID(i) for i in params.get("include_special_lists", [])],
+                    job.user_id,
+                )
+            exclude_categories = params.get("exclude_categories") or None
+
+            # No session (and so no pooled connection) is held during the AI call
+            async with self._lease_renewed(job):
+                items = await TripService.generate_items(
+                    trip, special_lists, exclude_categories
+                )
+
+            async with db(commit_on_exit=True):
+                packing_list = await TripService.save_packing_list(
+                    trip, job.user_id, items
+                )
+                if not await GenerationJobService.finish(
+                    job, JobStatus.SUCCEEDED, generated_list_id=packing_list.id
+                ):
+                    # Rolls back the list saved above
+                    raise JobLeaseLostError(f"Generation job {job.id} lost its lease")
+            self.processed += 1
+        except JobLeaseLostError as e:
+            logger.warning(f"{str(e)}; its result was discarded")
+        except Exception as e:
+            await self._fail(job, e)
+
+    async def _fail(self, job: GenerationJob, error: Exception) -> None:
+        # Invalid input won't get better with another attempt
+        retry = not isinstance(error, ValueError) and job.attempts < self.max_attempts
+        logger.error(
+            f"Generation job {job.id} failed (attempt {job.attempts}): {str(error)}"
+        )
+        async with db(commit_on_exit=True):
+            if retry:
+                await GenerationJobService.finish(
+                    job,
+                    JobStatus.PENDING,
+                    error=str(error),
+                    retry_at=datetime.now(timezone.utc)
+                    + timedelta(seconds=self.retry_delay * job.attempts),
+                )
+            elif await GenerationJobService.finish(
+                job, JobStatus.FAILED, error=str(error)
+            ):
+                self.failed += 1
+
+    @asynccontextmanager
+    async def _lease_renewed(self, job: GenerationJob) -> AsyncIterator[None]:
+        """Keep the job's lease from expiring while the block runs."""
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _heartbeat(self, job: GenerationJob) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with db(commit_on_exit=True):
+                    renewed = await GenerationJobService.renew(job, self.lease)
+            except Exception as e:
+                logger.error(f"Failed to renew lease of job {job.id}: {str(e)}")
+                continue
+            if not renewed:
+                logger.warning(f"Generation job {job.id} was claimed by another worker")
+                return
+
+    async def _release(self, job: GenerationJob) -> None:
+        try:
+            async with db(commit_on_exit=True):
+                await db.session.execute(
+                    update(GenerationJob)
+                    .where(*GenerationJobService._owned(job))
+                    .values(
+                        status=JobStatus.PENDING,
+                        attempts=GenerationJob.attempts - 1,
+                        locked_until=None,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+        except Exception as e:
+            logger.error(f"Failed to release generation job {job.id}: {str(e)}")
+
+
+generation_workers = GenerationWorkerPool(
+    workers=settings.GENERATION_JOB_WORKERS,
+    poll_interval=settings.GENERATION_JOB_POLL_INTERVAL,
+    lease=settings.GENERATION_JOB_LEASE,
+    max_attempts=settings.GENERATION_JOB_MAX_ATTEMPTS,
+    retry_delay=settings.GENERATION_JOB_RETRY_DELAY,
+)
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, deque
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+from app import settings
+from app.services.item_schema import validate_items
+from app.services.json_stream import parse_items
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def has_items(content: Any) -> bool:
+    """Check that a model answer yields a packing list.
+
+    Uses the same parsers as ``AIService._parse_response``: an answer that
+    matches the item schema, or one ``parse_items`` can recover items from
+    (prose around the array, trailing commas, a cut-off array), is valid.
+    """
+    if not isinstance(content, str):
+        return False
+    return validate_items(content) is not None or bool(parse_items(content))
+
+
+class HedgePolicy:
+    """Send a backup request to another model when the primary one is slow.
+
+    The primary request is sent first. If it hasn't produced a valid answer
+    by the ``percentile`` of recent primary latencies (``initial_delay`` until
+    ``min_samples`` are known), or it fails, the same request is sent to
+    ``fallback_model``. Whichever valid answer arrives first is used and the
+    other request is cancelled.
+    """
+
+    def __init__(
+        self,
+        fallback_model: str,
+        percentile: float,
+        initial_delay: float,
+        min_samples: int,
+        window: int = 200,
+    ) -> None:
+        self.fallback_model = fallback_model
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.hedged = 0
+        self.failed = 0
+        self.wins: Counter = Counter()
+
+    def delay(self) -> float:
+        """Seconds to wait for the primary model before hedging."""
+        if len(self._latencies) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+    async def run(
+        self,
+        call: Callable[[str], Coroutine[Any, Any, T]],
+        primary_model: str,
+        valid: Callable[[T], bool] = has_items,
+    ) -> T:
+        """Call the primary model, hedging with the fallback model if needed.
+
+        Args:
+            call: Sends the request to the given model and returns the answer
+            primary_model: Model asked first
+            valid: Check that an answer can be used
+
+        Returns:
+            The first valid answer
+
+        Raises:
+            Exception: The last error if no model gave a valid answer
+        """
+        self.requests += 1
+        start = time.monotonic()
+        hedge_at = start + self.delay()
+        primary: "asyncio.Task[T]" = asyncio.create_task(call(primary_model))
+        models = {primary: primary_model}
+        pending: Set["asyncio.Task[T]"] = {primary}
+        errors: List[BaseException] = []
+        try:
+            while True:
+                hedging = len(models) > 1
+                timeout = None if hedging else max(hedge_at - time.monotonic(), 0.0)
+                if pending:
+                    done, pending = await asyncio.wait(
+                        pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+                else:
+                    done = set()
+                for task in done:
+                    model = models[task]
+                    error = task.exception()
+                    if error is not None:
+                        errors.append(error)
+                        continue
+                    result = task.result()
+                    if valid(result):
+                        if task is primary:
+                            # Failures are often fast; they'd drag the delay down
+                            self._latencies.append(time.monotonic() - start)
+                        self.wins[model] += 1
+                        return result
+                    errors.append(ValueError(f"Invalid response from {model}"))
+
+                if not hedging and (not pending or time.monotonic() >= hedge_at):
+                    logger.info(
+                        f"Hedging {primary_model} with {self.fallback_model} "
+                        f"after {time.monotonic() - start:.2f}s"
+                    )
+                    self.hedged += 1
+                    backup: "asyncio.Task[T]" = asyncio.create_task(
+                        call(self.fallback_model)
+                    )
+                    models[backup] = self.fallback_model
+                    pending.add(backup)
+                elif not pending:
+                    self.failed += 1
+                    raise errors[-1]
+        finally:
+            losers = [task for task in models if not task.done()]
+            if primary in losers:
+                # Count the cut-off primary as at least this slow
+                self._latencies.append(time.monotonic() - start)
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hedge rate and how often each model answered first."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "failed": self.failed,
+            "wins": dict(self.wins),
+            "delay_seconds": self.delay(),
+        }
+
+
+_openrouter_hedge: Optional[HedgePolicy] = None
+
+
+def get_openrouter_hedge() -> Optional[HedgePolicy]:
+    """Return the process-wide hedging policy for OpenRouter calls.
+
+    Returns None when hedging is disabled (OPENROUTER_HEDGE_MODEL unset).
+    """
+    global _openrouter_hedge
+    if _openrouter_hedge is None and settings.OPENROUTER_HEDGE_MODEL:
+        _openrouter_hedge = HedgePolicy(
+            settings.OPENROUTER_HEDGE_MODEL,
+            percentile=settings.OPENROUTER_HEDGE_PERCENTILE,
+            initial_delay=settings.OPENROUTER_HEDGE_INITIAL_DELAY,
+            min_samples=settings.OPENROUTER_HEDGE_MIN_SAMPLES,
+        )
+    return _openrouter_hedge
+
+
+def reset() -> None:
+    """Drop the hedging policy so it's rebuilt from settings (used by tests)."""
+    global _openrouter_hedge
+    _openrouter_hedge = None
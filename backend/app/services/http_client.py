@@ -0,0 +1,58 @@
+import logging
+from typing import Any, Optional
+
+import aiohttp
+
+from app import settings
+
+logger = logging.getLogger(__name__)
+
+# Application-scoped session shared by all outbound HTTP calls (OpenRouter).
+# Created in the FastAPI lifespan so TCP/TLS connections are reused between requests.
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def create_connector(**overrides: Any) -> aiohttp.TCPConnector:
+    """Build a pooled connector configured from settings.
+
+    Args:
+        **overrides: Extra ``TCPConnector`` arguments (e.g. ``ssl``)
+    """
+    options = {
+        "limit": settings.HTTP_POOL_LIMIT,
+        "limit_per_host": settings.HTTP_POOL_LIMIT_PER_HOST,
+        "keepalive_timeout": settings.HTTP_KEEPALIVE_TIMEOUT,
+        "use_dns_cache": True,
+        "ttl_dns_cache": settings.HTTP_DNS_CACHE_TTL,
+        **overrides,
+    }
+    return aiohttp.TCPConnector(**options)
+
+
+async def start_http_client() -> aiohttp.ClientSession:
+    """Create the shared client session if it isn't running yet."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(connector=create_connector())
+        logger.info(
+            "HTTP client started (limit=%s, limit_per_host=%s)",
+            settings.HTTP_POOL_LIMIT,
+            settings.HTTP_POOL_LIMIT_PER_HOST,
+        )
+    return _session
+
+
+async def close_http_client() -> None:
+    """Close the shared client session and release pooled connections."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("HTTP client closed")
+    _session = None
+
+
+def get_http_client() -> Optional[aiohttp.ClientSession]:
+    """Return the shared client session, or None outside the application lifespan."""
+    if _session is None or _session.closed:
+        return None
+    return _session
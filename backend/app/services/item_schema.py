@@ -0,0 +1,98 @@
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import ConfigDict, TypeAdapter, ValidationError, with_config
+from typing_extensions import Literal, NotRequired, TypedDict
+
+logger = logging.getLogger(__name__)
+
+# Categories the model is asked to use (Polish names, as shown to users)
+ITEM_CATEGORIES = (
+    "Odzież",
+    "Elektronika",
+    "Kosmetyki",
+    "Dokumenty",
+    "Akcesoria",
+    "Zdrowie",
+    "Rozrywka",
+)
+
+
+@with_config(ConfigDict(extra="allow"))
+class GeneratedItem(TypedDict):
+    name: str
+    quantity: int
+    category: Literal[ITEM_CATEGORIES]  # type: ignore[valid-type]
+    weight: NotRequired[Optional[float]]
+
+
+class GeneratedItemList(TypedDict):
+    items: List[GeneratedItem]
+
+
+# Built once; validation of a whole response is then one pass in pydantic-core.
+# Accepts the schema's {"items": [...]} as well as the bare array the prompt
+# asks for.
+_ITEMS_ADAPTER: TypeAdapter = TypeAdapter(Union[GeneratedItemList, List[GeneratedItem]])
+
+# OpenAI-style structured output format. Strict mode requires every property
+# to be listed as required, so the optional weight is nullable instead.
+ITEM_LIST_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "packing_list",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "quantity": {"type": "integer", "minimum": 1},
+                            "category": {
+                                "type": "string",
+                                "enum": list(ITEM_CATEGORIES),
+                            },
+                            "weight": {
+                                "type": ["number", "null"],
+                                "description": "Approximate weight in kg",
+                            },
+                        },
+                        "required": ["name", "quantity", "category", "weight"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["items"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def validate_items(content: str) -> Optional[List[Dict[str, Any]]]:
+    """Validate a model response against the item list schema.
+
+    Args:
+        content: Message content returned by the model
+
+    Returns:
+        The items with their fields coerced to the schema's types, or None if
+        the response doesn't match the schema and has to be repaired
+    """
+    try:
+        value = _ITEMS_ADAPTER.validate_json(content)
+    except ValidationError as e:
+        logger.debug(
+            f"Response doesn't match the item schema ({e.error_count()} errors)"
+        )
+        return None
+    items = value["items"] if isinstance(value, dict) else value
+    for item in items:
+        # Same shape as repaired items, which have no weight key when unknown
+        if "weight" in item and item["weight"] is None:
+            del item["weight"]
+    return items
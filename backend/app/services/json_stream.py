@@ -0,0 +1,224 @@
+import json
+import logging
+import re
+from json.decoder import scanstring  # type: ignore[attr-defined]  # not in typeshed
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+
+# One ``"key": value`` member of an object, with an optional leading comma. The
+# value is matched up to its opening quote or bracket only; an unterminated
+# string or any other garbage doesn't match.
+_MEMBER = re.compile(
+    r"""[\s,]*"(?P<key>(?:[^"\\]|\\.)*)"\s*:\s*(?:
+        "(?P<string>)
+        |(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+        |(?P<literal>true|false|null)
+        |(?P<open>[\[{])
+    )""",
+    re.VERBOSE,
+)
+_OBJECT_END = re.compile(r"[\s,]*\}")
+_LITERALS = {"true": True, "false": False, "null": None}
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+# Edits tried on one object before reading it member by member
+MAX_REPAIRS = 8
+
+
+class JsonItemStream:
+    """Incremental parser that extracts JSON objects from a streamed array.
+
+    Text is fed chunk by chunk as tokens arrive from the model. Every time a
+    top-level object (``{...}``) closes it is decoded and returned, so only the
+    object currently being built is kept in memory. Anything outside objects
+    (markdown fences, the surrounding ``[``/``]``, commas, prose) is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume the next piece of text and return objects completed by it."""
+        items: List[Dict] = []
+        for char in chunk:
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._decode("".join(self._buffer))
+                    self._buffer = []
+                    if item is not None:
+                        items.append(item)
+        return items
+
+    @staticmethod
+    def _decode(text: str) -> Optional[Dict]:
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed streamed item: {str(e)}")
+            return None
+        return value if isinstance(value, dict) else None
+
+
+def _read_members(text: str, start: int) -> Tuple[Dict[str, Any], int]:
+    """Read the members of an object at ``text[start] == "{"`` one by one.
+
+    Used for objects the decoder can't finish, typically the last one of a
+    response cut off by the token limit. Reading stops at the first member
+    that can't be read, so the members before it are kept.
+
+    Returns:
+        The members read and the position where reading stopped
+    """
+    item: Dict[str, Any] = {}
+    pos = start + 1
+    while True:
+        match = _MEMBER.match(text, pos)
+        if match is None:
+            end = _OBJECT_END.match(text, pos)
+            return item, end.end() if end else pos
+        key = match.group("key")
+        if "\\" in key:
+            key = scanstring(text, match.start("key"))[0]
+        kind = match.lastgroup
+        try:
+            if kind == "string":
+                value, pos = scanstring(text, match.end())
+            elif kind == "number":
+                number = match.group("number")
+                value = int(number) if number.lstrip("-").isdigit() else float(number)
+                pos = match.end()
+            elif kind == "literal":
+                value, pos = _LITERALS[match.group("literal")], match.end()
+            else:
+                value, pos = _DECODER.raw_decode(text, match.start("open"))
+        except json.JSONDecodeError:
+            return item, pos
+        item[key] = value
+
+
+def _is_trailing_comma(text: str, pos: int) -> int:
+    """Return the position of the comma before the bracket at ``pos``, or 0."""
+    if text[pos : pos + 1] not in ("}", "]"):
+        return 0
+    comma = pos - 1
+    while comma > 0 and text[comma].isspace():
+        comma -= 1
+    return comma if text[comma] == "," else 0
+
+
+def _repair_object(text: str, error: json.JSONDecodeError) -> Tuple[Any, int, str]:
+    """Decode the object at the start of ``text`` by fixing it where it failed.
+
+    A comma before a closing bracket is dropped and a missing comma between
+    two members is added, then decoding is retried. If the error is anything
+    else, the members are read one by one instead.
+
+    Returns:
+        The decoded object, the position after it and the text with the fixes
+    """
+    for _ in range(MAX_REPAIRS):
+        pos = error.pos
+        comma = _is_trailing_comma(text, pos)
+        if comma:
+            text = text[:comma] + text[comma + 1 :]
+        elif error.msg == "Expecting ',' delimiter" and pos < len(text):
+            text = text[:pos] + "," + text[pos:]
+        else:
+            break
+        try:
+            item, end = _DECODER.raw_decode(text)
+            return item, end, text
+        except json.JSONDecodeError as e:
+            error = e
+    item, end = _read_members(text, 0)
+    return item, end, text
+
+
+def parse_items(text: str) -> List[Dict[str, Any]]:
+    """Parse the item objects from a model response in one forward scan.
+
+    Tolerates text around the JSON (markdown fences, prose), an object
+    wrapping the array (``{"items": [...]}``), a single object instead of an
+    array, trailing or missing commas and a response cut off in the middle of
+    an item. Each object is decoded by the C JSON decoder; an object it
+    rejects is fixed where decoding failed or, if it was cut off, read member
+    by member, keeping the fields that could be read.
+
+    Args:
+        text: Message content returned by the model
+
+    Returns:
+        The objects found, in order; objects without any readable field are
+        dropped
+    """
+    array_start = text.find("[")
+    object_start = text.find("{")
+    if object_start == -1:
+        return []
+    value_start = object_start
+    if array_start != -1 and array_start < object_start:
+        value_start = array_start
+
+    # Fast path: the response is (or contains) one well-formed JSON value
+    try:
+        value, _ = _DECODER.raw_decode(text, value_start)
+    except json.JSONDecodeError as e:
+        value = None
+        if _is_trailing_comma(text, e.pos):
+            # Models that leave one trailing comma usually leave them all; one
+            # regex pass is cheaper than fixing object by object. It would also
+            # drop a ", }" inside a string, which item fields don't contain.
+            text = _TRAILING_COMMA.sub(r"\1", text)
+            try:
+                value, _ = _DECODER.raw_decode(text, value_start)
+            except json.JSONDecodeError:
+                pass
+    if value is not None:
+        if isinstance(value, dict):
+            nested = [v for v in value.values() if isinstance(v, list)]
+            value = nested[0] if nested else [value]
+        return [item for item in value if isinstance(item, dict)]
+
+    items: List[Dict[str, Any]] = []
+    repaired = 0
+    pos = array_start + 1 if array_start != -1 else object_start
+    while True:
+        pos = text.find("{", pos)
+        if pos == -1:
+            logger.debug(f"Parsed {len(items)} items, {repaired} of them repaired")
+            return items
+        # Decode from the object on, so that a decoding error, which counts
+        # the lines before it, costs as much as the object and not the text
+        text = text[pos:]
+        try:
+            item, pos = _DECODER.raw_decode(text)
+        except json.JSONDecodeError as e:
+            item, pos, text = _repair_object(text, e)
+            repaired += 1
+            pos = max(pos, 1)
+        if isinstance(item, dict) and item:
+            items.append(item)
@@ -1,27 +1,48 @@
 import asyncio
+import json
 import logging
 import os
-from typing import Any, Dict
+import time
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Dict, Optional
 
 import aiohttp
 from dotenv import load_dotenv
+from opentelemetry.trace import SpanKind
+
+from app import settings, tracing
+from app.logging_config import Preview
+from app.metrics import OPENROUTER_REQUEST_SECONDS, OPENROUTER_RETRIES
+from app.services.circuit_breaker import CircuitBreaker, get_openrouter_breaker
+from app.services.hedging import HedgePolicy, get_openrouter_hedge
+from app.services.rate_limiter import (
+    RateLimitTimeoutError,
+    UpstreamLimiter,
+    get_openrouter_limiter,
+    parse_retry_after,
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
 
-# Create console handler if it doesn't exist
-if not logger.handlers:
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+# Upstream statuses whose Retry-After header applies to all our requests
+THROTTLE_STATUSES = (429, 503)
+
+
+def supports_json_schema(model: str) -> bool:
+    """Check whether the model is configured for JSON-Schema structured output."""
+    return model.startswith(tuple(settings.OPENROUTER_JSON_SCHEMA_MODELS))
+
+
+class OpenRouterHTTPError(Exception):
+    """Non-200 response from OpenRouter."""
+
+    def __init__(self, status: int, text: str, retry_after: Optional[float] = None):
+        super().__init__(f"API call failed with status code {status}: {text}")
+        self.status = status
+        self.retry_after = retry_after
 
 
 class OpenRouterService:
@@ -30,17 +51,43 @@ class OpenRouterService:
     This class handles building and sending requests, as well as parsing responses and error handling.
     """
 
-    def __init__(self, api_key: str, api_endpoint: str) -> None:
-        """Initialize the service with API key and endpoint."""
+    def __init__(
+        self,
+        api_key: str,
+        api_endpoint: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        limiter: Optional[UpstreamLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: Optional[HedgePolicy] = None,
+    ) -> None:
+        """Initialize the service with API key and endpoint.
+
+        Args:
+            api_key: OpenRouter API key
+            api_endpoint: OpenRouter chat completions endpoint
+            session: Optional shared client session. When omitted, a short-lived
+                session is opened for every attempt.
+            limiter: Optional limiter for the requests. Defaults to the
+                process-wide OpenRouter limiter.
+            breaker: Optional circuit breaker for the requests. Defaults to the
+                process-wide OpenRouter breaker.
+            hedge: Optional hedging policy for ask(). Defaults to the
+                process-wide policy, if hedging is configured.
+        """
         if not isinstance(api_key, str) or not api_key.strip():
             raise ValueError("API key must be a non-empty string")
         if not isinstance(api_endpoint, str) or not api_endpoint.strip():
             raise ValueError("API endpoint must be a non-empty string")
         self._api_key: str = api_key
         self._api_endpoint: str = api_endpoint
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._limiter: UpstreamLimiter = limiter or get_openrouter_limiter()
+        self._breaker: CircuitBreaker = breaker or get_openrouter_breaker()
+        self._hedge: Optional[HedgePolicy] = hedge or get_openrouter_hedge()
         self._system_message: str = ""
         self._user_message: str = ""
         self._response_format: Dict[str, Any] = {}
+        self._schema_format: Dict[str, Any] = {}
         self._model_name: str = ""
         self._model_parameters: Dict[str, Any] = {}
 
@@ -49,7 +96,9 @@ class OpenRouterService:
         self._backoff_factor: float = 1.0
 
     @classmethod
-    def from_env(cls) -> "OpenRouterService":
+    def from_env(
+        cls, session: Optional[aiohttp.ClientSession] = None
+    ) -> "OpenRouterService":
         """Create an instance of OpenRouterService using environment variables.
 
         It expects OPENROUTER_API_KEY and OPENROUTER_API_ENDPOINT to be set.
@@ -60,7 +109,7 @@ class OpenRouterService:
             raise ValueError(
                 "Environment variables OPENROUTER_API_KEY and OPENROUTER_API_ENDPOINT must be set"
             )
-        return cls(api_key, api_endpoint)
+        return cls(api_key, api_endpoint, session=session)
 
     # Public Methods
     def set_system_message(self, message: str) -> None:
@@ -81,6 +130,16 @@ class OpenRouterService:
             raise ValueError("Response format must be a dictionary")
         self._response_format = fmt
 
+    def set_schema_format(self, fmt: Dict[str, Any]) -> None:
+        """Set a JSON-Schema response format for models that support it.
+
+        It replaces the response format in non-streaming requests to models
+        listed in OPENROUTER_JSON_SCHEMA_MODELS.
+        """
+        if not isinstance(fmt, dict):
+            raise ValueError("Schema format must be a dictionary")
+        self._schema_format = fmt
+
     def set_model_name(self, name: str) -> None:
         """Set the model name after validating it's a string."""
         if not isinstance(name, str):
@@ -93,14 +152,28 @@ class OpenRouterService:
             raise ValueError("Model parameters must be a dictionary")
         self._model_parameters = params
 
-    async def send_request(self) -> Any:
-        """Send the request to the OpenRouter API asynchronously."""
+    @tracing.traced
+    async def send_request(self, model: Optional[str] = None) -> Any:
+        """Send the request to the OpenRouter API asynchronously.
+
+        Every attempt waits for a slot from the limiter first. Throttled
+        attempts (429) are retried no sooner than upstream's Retry-After.
+        The whole call, retries included, goes through the circuit breaker, so
+        while OpenRouter is failing callers get an error at once.
+
+        Args:
+            model: Model to ask instead of the configured one
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            RateLimitTimeoutError: If no slot was free within the allowed wait
+        """
         headers = {
             "Authorization": f"Bearer {self._api_key}",
             "Content-Type": "application/json",
         }
-        payload = self._build_request_payload()
-        logger.debug(f"Sending request to OpenRouter with payload: {payload}")
+        payload = self._build_request_payload(model)
+        logger.debug("Sending request to OpenRouter with payload: %s", Preview(payload))
 
         timeout = aiohttp.ClientTimeout(
             total=90,  # Total timeout
@@ -108,41 +181,181 @@ class OpenRouterService:
             sock_read=60,  # Socket read timeout
         )
 
-        for attempt in range(self._max_retries):
-            try:
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.post(
-                        self._api_endpoint, headers=headers, json=payload
-                    ) as response:
+        async with self._breaker.guard(ignore=(RateLimitTimeoutError,)):
+            return await self._send_with_retries(headers, payload, timeout)
+
+    async def ask(self) -> str:
+        """
+        Send a request to the OpenRouter API and extract only the message content.
+
+        This is a convenience method that calls send_request and processes the response
+        to extract just the content of the assistant's message.
+
+        With hedging configured, a slow or failed answer from the model is
+        raced against the hedge model and the first answer with usable items wins.
+
+        Returns:
+            The content of the assistant's message as a string
+        """
+        try:
+            hedge = self._hedge
+            if hedge is not None and hedge.fallback_model != self._model_name:
+                logger.debug("Calling send_request with hedging from ask()")
+                return await hedge.run(self._ask_model, self._model_name)
+            logger.debug("Calling send_request from ask()")
+            return await self._ask_model(self._model_name)
+        except Exception as e:
+            logger.error(f"Error in ask(): {str(e)}")
+            raise ValueError(f"Failed to get response from OpenRouter: {str(e)}")
+
+    async def _ask_model(self, model: str) -> str:
+        """Send the request to one model and extract the message content."""
+        response = await self.send_request(model)
+
+        logger.debug(f"Processing response in ask(), type: {type(response).__name__}")
+
+        # Check if response is valid
+        if not response or not isinstance(response, dict):
+            logger.error(f"Invalid response format: {response}")
+            raise ValueError("Invalid response format from OpenRouter")
+
+        # Get choices from response
+        choices = response.get("choices", [])
+        if not choices:
+            logger.error("No choices in OpenRouter response")
+            raise ValueError("No choices in OpenRouter response")
+
+        # Get message content from first choice
+        message = choices[0].get("message", {})
+        content = message.get("content", "")
+
+        if not content:
+            logger.warning(f"Empty content in OpenRouter response from {model}")
+            return ""
+
+        logger.debug(f"Extracted content length: {len(content)} characters")
+        return content
+
+    async def stream(self) -> AsyncIterator[str]:
+        """
+        Send a streaming request and yield message content deltas as they arrive.
+
+        OpenRouter answers with Server-Sent Events; each ``data:`` line carries a
+        chunk with ``choices[0].delta.content``. Connection failures before the
+        stream starts are retried like send_request; once content has been
+        yielded, errors are raised to the caller.
+
+        The request holds one limiter slot until the stream is closed. Opening
+        the stream goes through the circuit breaker.
+
+        Yields:
+            Pieces of the assistant's message content
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            RateLimitTimeoutError: If no slot was free within the allowed wait
+        """
+        headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+        }
+        # Items are parsed as they stream in, so no wrapping schema object
+        payload = {
+            **self._build_request_payload(structured=False),
+            "stream": True,
+        }
+        timeout = aiohttp.ClientTimeout(total=None, connect=10, sock_read=60)
+
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(
+                self._limiter.slot(self._estimate_tokens(payload))
+            )
+            session = self._session
+            if session is None:
+                session = await stack.enter_async_context(aiohttp.ClientSession())
+
+            response = None
+            async with self._breaker.guard():
+                for attempt in range(self._max_retries):
+                    try:
+                        response = await session.post(
+                            self._api_endpoint,
+                            headers=headers,
+                            json=payload,
+                            timeout=timeout,
+                        )
                         if response.status != 200:
-                            text = await response.text()
+                            async with response:
+                                text = await response.text()
                             logger.error(
-                                f"API call failed with status {response.status}: {text}"
-                            )
-                            raise Exception(
-                                f"API call failed with status code {response.status}: {text}"
+                                f"Streaming API call failed with status {response.status}: {text}"
                             )
+                            raise self._http_error(response, text)
+                        await stack.enter_async_context(response)
+                        break
+                    except Exception as e:
+                        logger.error(f"Stream attempt {attempt + 1} failed: {str(e)}")
+                        retryable = isinstance(
+                            e, asyncio.TimeoutError
+                        ) or self._should_retry(e)
+                        if not retryable or attempt == self._max_retries - 1:
+                            raise Exception(f"OpenRouter API error: {str(e)}")
+                        wait = self._retry_wait(attempt, e)
+                        OPENROUTER_RETRIES.inc(payload["model"])
+                        logger.info(f"Retrying stream in {wait} seconds...")
+                        await asyncio.sleep(wait)
+
+            if response is None:
+                # Only reachable when max_retries is 0
+                raise Exception("OpenRouter API error: no stream response received")
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").strip()
+                # Blank lines separate events; lines starting with ":" are keep-alives
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed stream chunk: {data[:100]}")
+                    continue
+                if "error" in chunk:
+                    raise Exception(f"OpenRouter stream error: {chunk['error']}")
+                choices = chunk.get("choices") or []
+                if not choices:
+                    continue
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
 
-                        try:
-                            data = await response.json()
-                            logger.debug(f"Received response from OpenRouter: {data}")
-                            return data
-                        except asyncio.TimeoutError as e:
-                            logger.error(f"Timeout while reading response: {e}")
-                            raise Exception(
-                                "OpenRouter API timeout while reading response"
-                            )
-                        except Exception as e:
-                            logger.error(f"Error parsing response: {e}")
-                            raise Exception(
-                                f"Error parsing OpenRouter response: {str(e)}"
-                            )
+    # Private Methods
+    async def _send_with_retries(
+        self,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout,
+    ) -> Any:
+        """Send the request, retrying timeouts and retryable errors."""
+        tokens = self._estimate_tokens(payload)
+        for attempt in range(self._max_retries):
+            try:
+                async with self._limiter.slot(tokens):
+                    data = await self._timed_post(headers, payload, timeout, attempt)
+                self._record_usage(tokens, data)
+                return data
+
+            except RateLimitTimeoutError:
+                raise
 
             except asyncio.TimeoutError as e:
                 logger.error(f"Timeout during attempt {attempt + 1}: {e}")
                 if attempt == self._max_retries - 1:
                     raise Exception("OpenRouter API timeout after all retries")
                 wait = self._backoff_factor * (2**attempt)
+                OPENROUTER_RETRIES.inc(payload["model"])
                 logger.info(f"Retrying in {wait} seconds...")
                 await asyncio.sleep(wait)  # Use asyncio.sleep instead of time.sleep
 
@@ -151,73 +364,146 @@ class OpenRouterService:
                 if not self._should_retry(e) or attempt == self._max_retries - 1:
                     raise Exception(f"OpenRouter API error: {str(e)}")
 
-                wait = self._backoff_factor * (2**attempt)
+                wait = self._retry_wait(attempt, e)
+                OPENROUTER_RETRIES.inc(payload["model"])
                 logger.info(f"Retrying in {wait} seconds...")
                 await asyncio.sleep(wait)  # Use asyncio.sleep instead of time.sleep
 
-    async def ask(self) -> str:
-        """
-        Send a request to the OpenRouter API and extract only the message content.
-
-        This is a convenience method that calls send_request and processes the response
-        to extract just the content of the assistant's message.
-
-        Returns:
-            The content of the assistant's message as a string
+    async def _timed_post(
+        self,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout,
+        attempt: int = 0,
+    ) -> Any:
+        """Send a single attempt, timed by model and status and traced.
+
+        Uses the shared session, or a short-lived one when there is none.
+        Attempts that fail without a response are recorded as "timeout",
+        "cancelled" (e.g. a hedge that lost the race) or "error".
         """
-        try:
-            logger.debug("Calling send_request from ask()")
-            response = await self.send_request()
-
-            logger.debug(
-                f"Processing response in ask(), type: {type(response).__name__}"
-            )
-
-            # Check if response is valid
-            if not response or not isinstance(response, dict):
-                logger.error(f"Invalid response format: {response}")
-                raise ValueError("Invalid response format from OpenRouter")
-
-            # Get choices from response
-            choices = response.get("choices", [])
-            if not choices:
-                logger.error("No choices in OpenRouter response")
-                raise ValueError("No choices in OpenRouter response")
-
-            # Get message content from first choice
-            message = choices[0].get("message", {})
-            content = message.get("content", "")
-
-            if not content:
-                logger.warning("Empty content in OpenRouter response")
-                return ""
+        model = payload["model"]
+        attributes = {"gen_ai.request.model": model, "openrouter.attempt": attempt + 1}
+        start = time.perf_counter()
+        status = "error"
+        with tracing.span("OpenRouter attempt", attributes, SpanKind.CLIENT) as span:
+            try:
+                if self._session is not None:
+                    data = await self._post(self._session, headers, payload, timeout)
+                else:
+                    async with aiohttp.ClientSession(timeout=timeout) as session:
+                        data = await self._post(session, headers, payload, timeout)
+                status = "200"
+                return data
+            except OpenRouterHTTPError as e:
+                status = str(e.status)
+                raise
+            except asyncio.TimeoutError:
+                status = "timeout"
+                raise
+            except asyncio.CancelledError:
+                status = "cancelled"
+                raise
+            finally:
+                OPENROUTER_REQUEST_SECONDS.observe(
+                    time.perf_counter() - start, model, status
+                )
+                if span is not None:
+                    span.set_attribute("openrouter.status", status)
+
+    async def _post(
+        self,
+        session: aiohttp.ClientSession,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout,
+    ) -> Any:
+        """Send a single attempt through the given session and decode the JSON body."""
+        async with session.post(
+            self._api_endpoint, headers=headers, json=payload, timeout=timeout
+        ) as response:
+            if response.status != 200:
+                text = await response.text()
+                logger.error(f"API call failed with status {response.status}: {text}")
+                raise self._http_error(response, text)
 
-            logger.debug(f"Extracted content length: {len(content)} characters")
-            return content
+            try:
+                data = await response.json()
+                logger.debug("Received response from OpenRouter: %s", Preview(data))
+                return data
+            except asyncio.TimeoutError as e:
+                logger.error(f"Timeout while reading response: {e}")
+                raise Exception("OpenRouter API timeout while reading response")
+            except Exception as e:
+                logger.error(f"Error parsing response: {e}")
+                raise Exception(f"Error parsing OpenRouter response: {str(e)}")
 
-        except Exception as e:
-            logger.error(f"Error in ask(): {str(e)}")
-            raise ValueError(f"Failed to get response from OpenRouter: {str(e)}")
+    def _build_request_payload(
+        self, model: Optional[str] = None, structured: bool = True
+    ) -> Dict[str, Any]:
+        """Build the payload for the API request, optionally for another model.
 
-    # Private Methods
-    def _build_request_payload(self) -> Dict[str, Any]:
-        """Build the payload for the API request."""
+        Args:
+            model: Model to ask instead of the configured one
+            structured: Use the schema format if the model supports it
+        """
         messages = []
         if self._system_message:
             messages.append({"role": "system", "content": self._system_message})
         messages.append({"role": "user", "content": self._user_message})
 
+        model = model or self._model_name
+        response_format = self._response_format
+        if structured and self._schema_format and supports_json_schema(model):
+            response_format = self._schema_format
+
         return {
-            "model": self._model_name,
+            "model": model,
             "messages": messages,
-            "response_format": self._response_format,
+            "response_format": response_format,
             **self._model_parameters,
         }
 
+    def _http_error(
+        self, response: aiohttp.ClientResponse, text: str
+    ) -> OpenRouterHTTPError:
+        """Build the error for a failed response, pausing the limiter if throttled."""
+        retry_after = None
+        if response.status in THROTTLE_STATUSES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                self._limiter.defer(retry_after)
+        return OpenRouterHTTPError(response.status, text, retry_after)
+
+    def _retry_wait(self, attempt: int, error: Exception) -> float:
+        """Exponential backoff, but no shorter than upstream's Retry-After."""
+        wait = self._backoff_factor * (2**attempt)
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            wait = max(wait, retry_after)
+        return wait
+
+    @staticmethod
+    def _estimate_tokens(payload: Dict[str, Any]) -> int:
+        """Roughly estimate the tokens a request uses, for the tokens/min limit.
+
+        Counts about four characters per prompt token plus the completion limit.
+        """
+        prompt_chars = sum(len(m.get("content") or "") for m in payload["messages"])
+        return prompt_chars // 4 + int(payload.get("max_tokens") or 0)
+
+    def _record_usage(self, estimated: int, data: Any) -> None:
+        """Correct the limiter's token budget with the usage reported upstream."""
+        usage = data.get("usage") if isinstance(data, dict) else None
+        if isinstance(usage, dict) and isinstance(usage.get("total_tokens"), int):
+            self._limiter.record_usage(estimated, usage["total_tokens"])
+
     def _should_retry(self, error: Exception) -> bool:
         """Determine if the request should be retried based on the error."""
         if isinstance(error, (aiohttp.ClientError, aiohttp.ServerTimeoutError)):
             return True
+        if isinstance(error, OpenRouterHTTPError):
+            return error.status == 429 or error.status >= 500
         message = str(error)
         if "API call failed with status code" in message:
             try:
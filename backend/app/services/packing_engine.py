@@ -0,0 +1,266 @@
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.dimensions import Dimensions, parse_dimensions
+
+logger = logging.getLogger(__name__)
+
+# Each local-search round applies at most one move per overflow item
+MAX_IMPROVEMENT_ROUNDS = 50
+# Slack for floating point sums when comparing against capacities
+EPSILON = 1e-9
+
+
+@dataclass
+class BagAllocation:
+    index: int
+    max_weight: Optional[float]
+    volume: Optional[float]
+    item_ids: List[Any] = field(default_factory=list)
+    total_weight: float = 0.0
+    total_volume: float = 0.0
+
+
+@dataclass
+class PackingPlan:
+    bags: List[BagAllocation]
+    overflow: List[Any]
+
+
+def _item_dimensions(item: Any) -> Optional[Dimensions]:
+    """Return the item's numeric dimensions, parsing the string if not backfilled."""
+    width = getattr(item, "item_width", None)
+    if width is not None:
+        return float(width), float(item.item_height), float(item.item_depth)
+    return parse_dimensions(item.item_dimensions)
+
+
+def _luggage_entries(luggage: Any) -> List[Tuple[Optional[float], Any]]:
+    if not luggage:
+        return []
+    entries = luggage if isinstance(luggage, list) else [luggage]
+    parsed = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            max_weight = entry.get("max_weight", entry.get("maxWeight"))
+            dimensions = entry.get("dimensions")
+        else:
+            max_weight = getattr(entry, "max_weight", None)
+            dimensions = getattr(entry, "dimensions", None)
+        parsed.append(
+            (float(max_weight) if max_weight is not None else None, dimensions)
+        )
+    return parsed
+
+
+class PackingProblem:
+    """Weights, volumes and dimensions of a trip's items and bags as arrays.
+
+    Item rows are packed as a whole: weight and volume are multiplied by the
+    quantity, while the per-unit dimensions decide whether the item fits a bag
+    at all (in any orientation). Items without a weight or dimensions are
+    treated as weightless or as taking no space. Bags without a weight limit
+    or dimensions are unbounded in that respect. Weights are in kilograms and
+    volumes in litres.
+    """
+
+    def __init__(self, items: Sequence[Any], luggage: Any) -> None:
+        bags = _luggage_entries(luggage)
+        if not bags:
+            raise ValueError("Trip has no luggage to pack into")
+
+        self.item_ids = [item.id for item in items]
+        self.bag_limits: List[Tuple[Optional[float], Optional[float]]] = []
+        n, m = len(items), len(bags)
+
+        self.capacity_weight = np.full(m, np.inf)
+        self.capacity_volume = np.full(m, np.inf)
+        bag_dims = np.full((m, 3), np.inf)
+        for b, (max_weight, dimensions) in enumerate(bags):
+            dims = parse_dimensions(dimensions)
+            if max_weight is not None:
+                self.capacity_weight[b] = max_weight
+            if dims is not None:
+                bag_dims[b] = sorted(dims)
+                self.capacity_volume[b] = math.prod(dims) / 1000
+            self.bag_limits.append(
+                (max_weight, math.prod(dims) / 1000 if dims else None)
+            )
+
+        quantity = np.ones(n)
+        unit_weight = np.zeros(n)
+        unit_dims = np.zeros((n, 3))
+        for i, item in enumerate(items):
+            quantity[i] = max(item.quantity or 1, 1)
+            if item.item_weight is not None:
+                unit_weight[i] = float(item.item_weight)
+            dims = _item_dimensions(item)
+            if dims is not None:
+                unit_dims[i] = sorted(dims)
+
+        self.weight = unit_weight * quantity
+        self.volume = unit_dims.prod(axis=1) / 1000 * quantity
+        # Sorting both sides' dimensions compares the best orientation
+        self.fits = (
+            (unit_dims[:, None, :] <= bag_dims[None, :, :]).all(axis=2)
+            & (self.weight[:, None] <= self.capacity_weight[None, :] + EPSILON)
+            & (self.volume[:, None] <= self.capacity_volume[None, :] + EPSILON)
+        )
+
+        # Relative size against the largest bounded bag, used for ordering
+        size = np.zeros(n)
+        for values, capacity in (
+            (self.weight, self.capacity_weight),
+            (self.volume, self.capacity_volume),
+        ):
+            bounded = capacity[np.isfinite(capacity)]
+            if bounded.size:
+                size = np.maximum(size, values / bounded.max())
+        self.size = size
+
+
+class _Packing:
+    """Mutable assignment of items to bags with remaining capacities."""
+
+    def __init__(self, problem: PackingProblem) -> None:
+        self.problem = problem
+        self.assignment = np.full(len(problem.item_ids), -1)
+        self.free_weight = problem.capacity_weight + EPSILON
+        self.free_volume = problem.capacity_volume + EPSILON
+
+    def place(self, item: int, bag: int) -> None:
+        self.assignment[item] = bag
+        self.free_weight[bag] -= self.problem.weight[item]
+        self.free_volume[bag] -= self.problem.volume[item]
+
+    def remove(self, item: int) -> None:
+        bag = self.assignment[item]
+        self.assignment[item] = -1
+        self.free_weight[bag] += self.problem.weight[item]
+        self.free_volume[bag] += self.problem.volume[item]
+
+    def open_bags(self, item: int) -> np.ndarray:
+        """Return a mask of bags the item fits into right now."""
+        p = self.problem
+        return (
+            p.fits[item]
+            & (self.free_weight >= p.weight[item])
+            & (self.free_volume >= p.volume[item])
+        )
+
+
+def _first_fit_decreasing(packing: _Packing) -> None:
+    for item in np.argsort(-packing.problem.size, kind="stable"):
+        open_bags = packing.open_bags(item)
+        if open_bags.any():
+            packing.place(item, int(open_bags.argmax()))
+
+
+def _improve_once(packing: _Packing, item: int) -> bool:
+    """Try to pack one overflow item with a single insert, move or swap."""
+    p = packing.problem
+    open_bags = packing.open_bags(item)
+    if open_bags.any():
+        packing.place(item, int(open_bags.argmax()))
+        return True
+
+    packed = np.flatnonzero(packing.assignment >= 0)
+    if not packed.size:
+        return False
+    bags = packing.assignment[packed]
+    # Taking the packed item out of its bag would make room for this one
+    frees_room = (
+        p.fits[item, bags]
+        & (packing.free_weight[bags] + p.weight[packed] >= p.weight[item])
+        & (packing.free_volume[bags] + p.volume[packed] >= p.volume[item])
+    )
+    if not frees_room.any():
+        return False
+
+    # Move: the packed item goes to another bag that still has room for it
+    targets = (
+        p.fits[packed]
+        & (packing.free_weight[None, :] >= p.weight[packed, None])
+        & (packing.free_volume[None, :] >= p.volume[packed, None])
+    )
+    targets[np.arange(packed.size), bags] = False
+    movable = frees_room & targets.any(axis=1)
+    if movable.any():
+        k = int(movable.argmax())
+        other, bag = int(packed[k]), int(bags[k])
+        packing.remove(other)
+        packing.place(other, int(targets[k].argmax()))
+        packing.place(item, bag)
+        return True
+
+    # Swap: a smaller packed item makes way and becomes overflow instead
+    swappable = frees_room & (p.size[packed] < p.size[item])
+    if swappable.any():
+        candidates = np.flatnonzero(swappable)
+        k = int(candidates[p.size[packed[candidates]].argmin()])
+        other, bag = int(packed[k]), int(bags[k])
+        packing.remove(other)
+        packing.place(item, bag)
+        return True
+    return False
+
+
+def _local_search(packing: _Packing) -> int:
+    """Improve the packing until no overflow item can be packed; return moves."""
+    moves = 0
+    for _ in range(MAX_IMPROVEMENT_ROUNDS):
+        overflow = np.flatnonzero(packing.assignment < 0)
+        improved = False
+        for item in overflow[np.argsort(-packing.problem.size[overflow])]:
+            if packing.assignment[item] < 0 and _improve_once(packing, int(item)):
+                improved = True
+                moves += 1
+        if not improved:
+            break
+    return moves
+
+
+def pack_items(items: Sequence[Any], luggage: Any) -> PackingPlan:
+    """Assign list items to the trip's bags by weight and volume.
+
+    Items are placed first-fit-decreasing by relative size, then a local
+    search packs overflow items by moving a packed item to another bag or
+    swapping it for a smaller one. Every move increases the packed size, so
+    the search always terminates.
+
+    Args:
+        items: Rows with ``id``, ``quantity``, ``item_weight`` and
+            ``item_dimensions`` (e.g. GeneratedListItem).
+        luggage: The trip's ``available_luggage`` value.
+
+    Returns:
+        The allocation per bag and the ids of items that don't fit.
+
+    Raises:
+        ValueError: If no luggage is given.
+    """
+    problem = PackingProblem(items, luggage)
+    packing = _Packing(problem)
+    _first_fit_decreasing(packing)
+    moves = _local_search(packing)
+    logger.debug(f"Packed {len(items)} items, local search made {moves} moves")
+
+    bags = []
+    for b, (max_weight, volume) in enumerate(problem.bag_limits):
+        members = np.flatnonzero(packing.assignment == b)
+        bags.append(
+            BagAllocation(
+                index=b,
+                max_weight=max_weight,
+                volume=volume,
+                item_ids=[problem.item_ids[i] for i in members],
+                total_weight=round(float(problem.weight[members].sum()), 3),
+                total_volume=round(float(problem.volume[members].sum()), 3),
+            )
+        )
+    overflow = np.flatnonzero(packing.assignment < 0)
+    return PackingPlan(bags=bags, overflow=[problem.item_ids[i] for i in overflow])
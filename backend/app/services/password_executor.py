@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app import settings
+from app.metrics import EXECUTOR_TASK_SECONDS, EXECUTOR_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorBusyError(Exception):
+    """Raised when the executor's queue is full and a task is rejected."""
+
+
+class BoundedExecutor:
+    """Thread pool with a limit on how many tasks may wait for a worker.
+
+    Used for CPU-heavy work such as bcrypt, which would otherwise block the
+    event loop. Tasks beyond ``max_workers + max_queue`` are rejected with
+    ExecutorBusyError instead of queueing without bound. Counters are only
+    updated from the event loop thread: the worker notes when a task started
+    and finished, and the times are recorded once the caller resumes.
+    """
+
+    def __init__(
+        self, max_workers: int, max_queue: int, name: str = "executor"
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.name = name
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted tasks still waiting for a worker."""
+        return max(self._pending - self.max_workers, 0)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the pool and wait for the result.
+
+        Raises:
+            ExecutorBusyError: If the queue is full
+        """
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            logger.warning(
+                f"Executor queue full ({self.queue_depth} waiting), rejecting task"
+            )
+            raise ExecutorBusyError("Server is busy, try again later")
+
+        submitted_at = time.perf_counter()
+        started_at = finished_at = submitted_at
+
+        def call() -> T:
+            nonlocal started_at, finished_at
+            started_at = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished_at = time.perf_counter()
+
+        self._pending += 1
+        self.submitted += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, call)
+        finally:
+            self._pending -= 1
+            self.completed += 1
+            wait = started_at - submitted_at
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            EXECUTOR_WAIT_SECONDS.observe(wait, self.name)
+            if finished_at > started_at:
+                task = getattr(fn, "__name__", "task")
+                EXECUTOR_TASK_SECONDS.observe(finished_at - started_at, self.name, task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, queue depth and rejection counters."""
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.max_queue,
+            "in_flight": self._pending,
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once queued tasks have finished."""
+        self._executor.shutdown(wait=True)
+
+
+_password_executor: Optional[BoundedExecutor] = None
+
+
+def get_password_executor() -> BoundedExecutor:
+    """Return the process-wide executor for password hashing and verification."""
+    global _password_executor
+    if _password_executor is None:
+        workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+        _password_executor = BoundedExecutor(
+            max_workers=workers,
+            max_queue=settings.PASSWORD_HASH_QUEUE_LIMIT,
+            name="password-hash",
+        )
+        logger.info(
+            f"Password executor started (workers={workers}, "
+            f"queue_limit={settings.PASSWORD_HASH_QUEUE_LIMIT})"
+        )
+    return _password_executor
+
+
+def shutdown_password_executor() -> None:
+    """Shut down the password executor if it was started."""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown()
+        _password_executor = None
+
+
+async def run_password_task(fn: Callable[..., T], *args: Any) -> T:
+    """Run a password hashing/verification function off the event loop.
+
+    Raises:
+        ExecutorBusyError: If too many password operations are already queued
+    """
+    return await get_password_executor().run(fn, *args)
@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from app import settings
+from app.models import User
+
+# Columns kept in the cache; the password hash is deliberately left out
+CACHED_COLUMNS = ("id", "email", "first_name", "last_name", "is_admin", "created_at")
+
+
+class PrincipalCache:
+    """Short-lived in-process cache of authenticated users, keyed by user id.
+
+    Entries are column snapshots rather than ORM instances, so a hit doesn't
+    depend on the session that loaded the user. Each hit returns a new
+    transient User that isn't attached to any session. The cache is bounded
+    by entry count (least recently used first out) and a TTL.
+
+    Entries are dropped on logout and otherwise only expire with the TTL: the
+    app writes users through CrudMixin's Core statements, which ORM mapper
+    events never see. Code that changes or deletes a user must call
+    ``invalidate`` itself, or the old snapshot is served for up to the TTL.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[UUID, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: UUID) -> Optional[User]:
+        """Return a transient copy of the cached user, or None on a miss."""
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[user_id]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return User(**entry[1])
+
+    def set(self, user: User) -> None:
+        """Store a snapshot of the user's columns."""
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        values = {column: getattr(user, column) for column in CACHED_COLUMNS}
+        self._entries[user.id] = (time.monotonic() + self.ttl, values)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop the user's entry, if any."""
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of entries."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+
+def reset() -> None:
+    """Empty the process-wide cache and zero its counters (used by tests)."""
+    principal_cache.clear()
+    principal_cache.hits = principal_cache.misses = 0
+    principal_cache.evictions = principal_cache.invalidations = 0
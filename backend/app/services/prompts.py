@@ -0,0 +1,136 @@
+import hashlib
+from dataclasses import dataclass
+from string import Formatter
+from typing import Any, List, Mapping, Optional, Tuple
+
+
+class PromptTemplate:
+    """A ``str.format``-style template parsed once into text and field names.
+
+    Rendering joins the pre-split literal parts with the field values in one
+    pass; values are inserted verbatim, so braces in them need no escaping.
+    Only plain ``{name}`` fields are supported.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Unsupported field format in prompt: {field}")
+            self._parts.append((literal, field))
+
+    def render(self, values: Mapping[str, str]) -> str:
+        out = []
+        for literal, field in self._parts:
+            out.append(literal)
+            if field is not None:
+                out.append(values[field])
+        return "".join(out)
+
+
+SYSTEM_PROMPT = """
+Jesteś ekspertem ds. podróży, specjalizującym się w tworzeniu spersonalizowanych list rzeczy do spakowania.
+Twoim zadaniem jest wygenerowanie szczegółowej listy rzeczy do spakowania na podstawie dostarczonych szczegółów podróży.
+
+Przygotowując listę, weź pod uwagę następujące kluczowe aspekty, aby dostosować ją jak najlepiej:
+- Czas trwania pobytu: Dłuższe wyjazdy wymagają więcej ubrań (zwłaszcza bielizny i skarpetek) oraz potencjalnie większych opakowań kosmetyków lub zapasów leków.
+- Liczba podróżujących (dorośli i dzieci): Dostosuj liczbę przedmiotów wspólnych (np. apteczka, ładowarki) oraz indywidualnych (ubrania, szczoteczki do zębów). Zwróć szczególną uwagę na potrzeby dzieci w określonym wieku.
+- Cel podróży i pora roku: Klimat i pogoda w miejscu docelowym determinują rodzaj odzieży (np. ciepłe kurtki zimą, stroje kąpielowe latem, odzież przeciwdeszczowa). Weź pod uwagę specyfikę kulturową miejsca docelowego (np. odpowiedni strój do miejsc kultu).
+- Planowane aktywności: Specjalistyczny sprzęt może być potrzebny do konkretnych działań (np. buty trekkingowe, sprzęt do snorkelingu, elegancki strój na formalne okazje).
+- Dostępna pojemność bagażu: Jeśli podano ograniczenia, lista musi być zoptymalizowana pod kątem wagi i objętości. Priorytetyzuj niezbędne rzeczy.
+- Rodzaj zakwaterowania i opcje wyżywienia (wynikające z `{{accommodation}}`): Np. w hotelu z zapewnionymi ręcznikami i kosmetykami, można ich nie zabierać. Apartament z kuchnią może sugerować zabranie podstawowych przypraw lub kawy/herbaty, jeśli użytkownik chce samodzielnie przygotowywać posiłki.
+- Środek transportu (wynikający z `{{transport}}`): Podróż samochodem daje większą elastyczność bagażową niż samolotem z restrykcyjnymi limitami. Weź to pod uwagę przy sugerowaniu ilości i rodzaju przedmiotów.
+"""
+
+USER_TEMPLATE = PromptTemplate("""
+Wygeneruj listę rzeczy do spakowania na podróż o następujących szczegółach:
+- Cel podróży: {destination}
+- Czas trwania: {duration_days} dni
+- Liczba dorosłych: {num_adults}
+- Wiek dzieci: {children_ages} (lista wieków dzieci, np. [], [2, 5], jeśli brak dzieci, lista będzie pusta)
+- Zakwaterowanie: {accommodation} (np. hotel, apartament z kuchnią, kemping)
+- Transport: {transport}(np. samolot, samochód, pociąg)
+- Aktywności: {activities} (np. plażowanie, zwiedzanie miasta, trekking, spotkania biznesowe)
+- Pora roku: {season} (np. lato, zima, wiosna, jesień)
+
+Dla każdego przedmiotu na liście, zwróć obiekt JSON z następującymi **kluczami w języku angielskim**:
+- `name`: (string) Jasna i konkretna **nazwa przedmiotu w języku polskim**.
+- `quantity`: (integer) Wymagana liczba sztuk, obliczona na podstawie czasu trwania podróży i liczby podróżujących. Dla przedmiotów, których dokładna ilość jest trudna do ustalenia z góry (np. krem z filtrem, pasta do zębów, płyn pod prysznic) lub których ilość jest "jedna sztuka zbiorcza" (np. apteczka, kosmetyczka), użyj wartości 1. Dostosuj ilość ubrań (np. skarpetki, bielizna) do długości wyjazdu oraz dostępności prania.
+- `category`: (string) Jedna z predefiniowanych **polskich nazw kategorii**: "Odzież", "Elektronika", "Kosmetyki", "Dokumenty", "Akcesoria", "Zdrowie", "Rozrywka".
+- `weight`: (number, opcjonalnie) Przybliżona waga w kg. Staraj się podać dla jak największej liczby przedmiotów, zwłaszcza jeśli są ograniczenia bagażowe. Użyj kropki jako separatora dziesiętnego.
+
+Przykład pojedynczego obiektu JSON:
+`{{"name": "Pasta do zębów", "quantity": 1, "category": "Kosmetyki", "weight": 0.1}}`
+
+Sformatuj odpowiedź jako tablicę JSON tych obiektów.
+Upewnij się, że wszystkie wartości dla klucza `quantity` są liczbami całkowitymi, a dla klucza `weight` liczbami (mogą być dziesiętne).
+Upewnij się, że całkowita waga nie przekracza limitów bagażu, jeśli zostały określone.
+Nie umieszczaj tablicy JSON w żadnym dodatkowym obiekcie nadrzędnym.
+Klucze w obiektach JSON muszą być w języku angielskim, a **wartości tekstowe (takie jak wartości dla kluczy `name` i `category`) muszą być w języku polskim.**
+{luggage}""")
+
+# Identifies the prompt version: changes whenever either prompt's text does
+PROMPT_HASH = hashlib.sha256(
+    "\0".join((SYSTEM_PROMPT, USER_TEMPLATE.source)).encode("utf-8")
+).hexdigest()
+
+
+def _text(value: Any, default: str = "Not specified") -> str:
+    return str(value) if value else default
+
+
+def _luggage_section(luggage: Any) -> str:
+    if not luggage:
+        return ""
+    lines = ["\nOgraniczenia bagażowe:\n"]
+    for entry in luggage if isinstance(luggage, list) else [luggage]:
+        if isinstance(entry, dict):
+            max_weight = entry.get("max_weight") or entry.get("maxWeight")
+            dimensions = entry.get("dimensions")
+        else:
+            max_weight = getattr(entry, "max_weight", None) or getattr(
+                entry, "maxWeight", None
+            )
+            dimensions = getattr(entry, "dimensions", None)
+        if max_weight:
+            lines.append(f"- Maksymalna waga: {max_weight} kg\n")
+        if dimensions:
+            lines.append(f"- Wymiary: {dimensions}\n")
+    return "".join(lines)
+
+
+@dataclass
+class TripPromptView:
+    """Trip fields as they appear in the user prompt."""
+
+    destination: str
+    duration_days: str
+    num_adults: str
+    children_ages: str
+    accommodation: str
+    transport: str
+    activities: str
+    season: str
+    luggage: str
+
+    @classmethod
+    def from_trip(cls, trip: Any) -> "TripPromptView":
+        """Build the view from a Trip (or any object with the same attributes)."""
+        activities = trip.activities if isinstance(trip.activities, list) else None
+        return cls(
+            destination=_text(trip.destination),
+            duration_days=_text(trip.duration_days, "0"),
+            num_adults=_text(trip.num_adults, "0"),
+            children_ages=_text(trip.children_ages, "None"),
+            accommodation=_text(trip.accommodation),
+            transport=_text(trip.transport),
+            activities=_text(", ".join(str(a) for a in activities or [])),
+            season=_text(trip.season),
+            luggage=_luggage_section(trip.available_luggage),
+        )
+
+
+def render_user_prompt(trip: Any) -> str:
+    """Render the user prompt describing the trip."""
+    return USER_TEMPLATE.render(vars(TripPromptView.from_trip(trip)))
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from app import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitTimeoutError(Exception):
+    """Raised when a caller can't get an upstream slot within the allowed wait."""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second.
+
+    Callers reserve tokens up front and the balance may go negative; the
+    deficit is how long the next caller has to wait. Reservations are thus
+    served in arrival order without a lock, as long as they are only made
+    from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Return the seconds until ``amount`` tokens are available."""
+        self._refill()
+        return max(amount - self._tokens, 0.0) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Take tokens from the bucket; a negative amount gives them back."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class UpstreamLimiter:
+    """Process-wide limits on the calls made to an upstream API.
+
+    A semaphore caps the number of requests in flight and token buckets cap
+    the request rate and the estimated model tokens per minute. Callers over
+    the limits queue for at most ``max_wait`` seconds and are then rejected
+    with RateLimitTimeoutError, so a burst doesn't turn into a burst of
+    upstream 429s. A ``Retry-After`` reported by upstream holds back every
+    caller until it has passed. A limit of 0 disables it.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_second: float,
+        tokens_per_minute: int,
+        max_wait: float,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        )
+        self._requests = (
+            TokenBucket(requests_per_second, capacity=max(requests_per_second, 1.0))
+            if requests_per_second > 0
+            else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute / 60, capacity=tokens_per_minute)
+            if tokens_per_minute > 0
+            else None
+        )
+        self._paused_until = 0.0
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until a request may be sent; pair every call with release().
+
+        Args:
+            tokens: Estimated model tokens used by the request
+
+        Raises:
+            RateLimitTimeoutError: If the request can't start within ``max_wait``
+        """
+        start = time.monotonic()
+        self.queue_depth += 1
+        try:
+            if self._semaphore is not None:
+                try:
+                    await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+                except asyncio.TimeoutError:
+                    raise self._reject("all upstream request slots are busy")
+            try:
+                await self._wait_for_rate(tokens, start + self.max_wait)
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+
+        wait = time.monotonic() - start
+        self.acquired += 1
+        self.in_flight += 1
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def release(self) -> None:
+        """Free the slot taken by acquire()."""
+        self.in_flight -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Hold a slot for the duration of one upstream request."""
+        await self.acquire(tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def defer(self, seconds: float) -> None:
+        """Hold back all callers for ``seconds``, e.g. after a 429 response."""
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"Upstream asked to retry after {seconds:.1f}s, pausing calls")
+
+    def record_usage(self, estimated: int, actual: int) -> None:
+        """Correct the token budget once the real usage of a request is known."""
+        if self._tokens is not None:
+            self._tokens.take(actual - estimated)
+
+    async def _wait_for_rate(self, tokens: int, deadline: float) -> None:
+        now = time.monotonic()
+        delay = max(self._paused_until - now, 0.0)
+        if self._requests is not None:
+            delay = max(delay, self._requests.delay(1))
+        if self._tokens is not None and tokens:
+            delay = max(delay, self._tokens.delay(tokens))
+        if delay > 0 and now + delay > deadline:
+            raise self._reject(f"upstream rate limit reached for {delay:.1f}s")
+
+        if self._requests is not None:
+            self._requests.take(1)
+        if self._tokens is not None and tokens:
+            self._tokens.take(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _reject(self, reason: str) -> RateLimitTimeoutError:
+        self.rejected += 1
+        logger.warning(f"Rejecting upstream request: {reason}")
+        return RateLimitTimeoutError(f"Too many AI requests, {reason}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait times and rejection counters."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "paused_seconds": max(self._paused_until - time.monotonic(), 0.0),
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+_openrouter_limiter: Optional[UpstreamLimiter] = None
+
+
+def get_openrouter_limiter() -> UpstreamLimiter:
+    """Return the process-wide limiter for OpenRouter calls."""
+    global _openrouter_limiter
+    if _openrouter_limiter is None:
+        _openrouter_limiter = UpstreamLimiter(
+            max_concurrency=settings.OPENROUTER_MAX_CONCURRENCY,
+            requests_per_second=settings.OPENROUTER_REQUESTS_PER_SECOND,
+            tokens_per_minute=settings.OPENROUTER_TOKENS_PER_MINUTE,
+            max_wait=settings.OPENROUTER_MAX_QUEUE_WAIT,
+        )
+    return _openrouter_limiter
+
+
+def reset() -> None:
+    """Drop the process-wide limiter so it's rebuilt from settings (used by tests)."""
+    global _openrouter_limiter
+    _openrouter_limiter = None
@@ -0,0 +1,52 @@
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the work in its own task; callers that
+    arrive while it is still running await the same task and receive the same
+    result (or exception). The work is shielded, so a caller that disconnects
+    doesn't cancel it for the others. Once it finishes the key is released and
+    the next call starts fresh.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, "asyncio.Task[T]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key`` unless an identical call is already in flight."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self.executions += 1
+            task.add_done_callback(functools.partial(self._release, key))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight call for {key[:12]}")
+        return await asyncio.shield(task)
+
+    def _release(self, key: str, task: "asyncio.Task[T]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception so it isn't reported as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return execution/coalescing counters and the number of calls in flight."""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
@@ -1,12 +1,12 @@
-from datetime import datetime
 from typing import List, Optional, Tuple
 from uuid import UUID
 
 from fastapi_sqlalchemy import async_db as db
-from sqlalchemy import Column, ForeignKey, Table, insert, select
+from sqlalchemy import Column, ColumnElement, ForeignKey, Table, func, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
+from app.dimensions import dimension_columns
 from app.models import Item, SpecialList, SpecialListItem, Tag
 from app.schemas.special_lists import (
     AddSpecialListItemCommand,
@@ -18,6 +18,7 @@ from app.schemas.special_lists import (
     UpdateSpecialListCommand,
     UpdateSpecialListItemCommand,
 )
+from app.tracing import traced
 
 
 class SpecialListError(Exception):
@@ -30,51 +31,53 @@ class SpecialListService:
     """Service for managing special lists."""
 
     @staticmethod
+    @traced
     async def get_lists(list_ids: List[UUID], user_id: UUID) -> List[SpecialList]:
         """
         Get multiple special lists by their IDs, verifying user ownership.
 
+        All lists are fetched with one query, with ownership checked in SQL.
+        Items and tags are loaded eagerly with one extra query per relationship,
+        so the number of statements doesn't grow with the number of lists.
+
         Args:
             list_ids: List of special list IDs to retrieve
             user_id: ID of the user who should own the lists
 
         Returns:
-            List of found special lists with their items
+            List of found special lists with their items and tags, in the
+            order they were requested
 
         Note:
             Only returns lists that exist AND belong to the user.
             If a list doesn't exist or belongs to another user, it's silently skipped.
         """
+        if not list_ids:
+            return []
         try:
-            # Build query to get lists with their items
             query = (
                 select(SpecialList)
                 .where(SpecialList.id.in_(list_ids), SpecialList.user_id == user_id)
                 .options(
                     selectinload(SpecialList.item_associations).selectinload(
                         SpecialListItem.item
-                    )
+                    ),
+                    selectinload(SpecialList.tags),
                 )
             )
-
-            # Execute query using standard select
-            results = await SpecialList.select(id=list_ids[0])  # Get first list
-            if not results:
-                return []
-
-            special_lists = []
-            for list_id in list_ids:
-                list_result = await SpecialList.select(id=list_id)
-                if list_result and list_result[0].user_id == user_id:
-                    special_lists.append(list_result[0])
-
-            return special_lists
+            found = {
+                special_list.id: special_list
+                for special_list in (await db.session.execute(query)).scalars()
+            }
+            # dict.fromkeys keeps the requested order and drops duplicates
+            return [found[i] for i in dict.fromkeys(list_ids) if i in found]
 
         except Exception as e:
             print(f"Error fetching special lists: {e}")
             return []
 
     @staticmethod
+    @traced
     async def get_list(list_id: UUID, user_id: UUID) -> Optional[SpecialList]:
         """
         Get a single special list by ID, verifying user ownership.
@@ -95,6 +98,7 @@ class SpecialListService:
         return special_list
 
     @staticmethod
+    @traced
     async def create_special_list(
         user_id: UUID, data: CreateSpecialListCommand
     ) -> SpecialList:
@@ -146,6 +150,21 @@ class SpecialListService:
             ) from e
 
     @staticmethod
+    def _list_conditions(
+        user_id: UUID, filters: Optional[SpecialListFilter]
+    ) -> List[ColumnElement[bool]]:
+        """Build the WHERE conditions selecting a user's lists."""
+        conditions = [SpecialList.user_id == user_id]
+        if filters and filters.category:
+            conditions.append(SpecialList.category == filters.category)
+        if filters and filters.search:
+            conditions.append(
+                SpecialList.name.icontains(filters.search, autoescape=True)
+            )
+        return conditions
+
+    @staticmethod
+    @traced
     async def get_user_lists(
         user_id: UUID,
         page: int = 1,
@@ -165,56 +184,61 @@ class SpecialListService:
         Returns:
             Tuple of (list of special lists, total count)
         """
-        # Build equality filters using CrudMixin capabilities
-        filter_kwargs = {"user_id": user_id}
-        if filters and filters.category:
-            filter_kwargs["category"] = filters.category  # type: ignore
-
-        # Retrieve all matching records based on equality filters
-        lists_all = await SpecialList.select(**filter_kwargs)
-
-        # If a search filter is provided, filter in Python
-        if filters and filters.search:
-            search_term = filters.search.lower()
-            lists_all = [lst for lst in lists_all if search_term in lst.name.lower()]
+        conditions = SpecialListService._list_conditions(user_id, filters)
+        query = select(SpecialList).where(*conditions)
 
-        # Apply sorting
+        # Ties are broken by id, the same key cursor pages use, so a cursor
+        # taken from an offset page resumes without skipping or repeating rows
         if sort:
-
-            def safe_sort_key(obj):
-                value = getattr(obj, sort.field)
-                # If this is a user_id field and it's a string but should be UUID
-                if sort.field == "user_id" and isinstance(value, str):
-                    return UUID(value)
-                return value
-
-            lists_all = sorted(
-                lists_all,
-                key=safe_sort_key,
-                reverse=(sort.order == SortOrder.DESC),
-            )
+            column = getattr(SpecialList, sort.field)
+            if sort.order == SortOrder.DESC:
+                column = column.desc()
+            query = query.order_by(column, SpecialList.id)
         else:
-            # Ensure we're getting the created_at attribute safely
-            lists_all = sorted(
-                lists_all,
-                key=lambda x: (
-                    getattr(x, "created_at")
-                    if hasattr(x, "created_at")
-                    else datetime.min
-                ),
-                reverse=True,
+            query = query.order_by(SpecialList.created_at.desc(), SpecialList.id)
+        query = query.offset((page - 1) * page_size).limit(page_size)
+
+        lists = list((await db.session.execute(query)).scalars().all())
+        total = (
+            await db.session.scalar(
+                select(func.count(SpecialList.id)).where(*conditions)
             )
+            or 0
+        )
+        return lists, total
 
-        total = len(lists_all)
+    @staticmethod
+    @traced
+    async def get_user_lists_page(
+        user_id: UUID,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        filters: Optional[SpecialListFilter] = None,
+    ) -> Tuple[List[SpecialList], Optional[str]]:
+        """Get a page of a user's special lists, newest first, by cursor.
 
-        # Apply pagination slicing
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated = lists_all[start:end]
+        Filtering and pagination are done in SQL with keyset pagination on
+        (created_at, id), so any page costs the same as the first one.
 
-        return paginated, total
+        Args:
+            user_id: The ID of the user
+            page_size: The number of items per page
+            cursor: Cursor returned with the previous page, or None for the first page
+            filters: Optional filters to apply
+
+        Returns:
+            Tuple of (list of special lists, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        conditions = SpecialListService._list_conditions(user_id, filters)
+        return await SpecialList.select_page(
+            *conditions, limit=page_size, cursor=cursor
+        )
 
     @staticmethod
+    @traced
     async def get_list_with_details(list_id: UUID, user_id: UUID) -> SpecialList:
         try:
             records = await SpecialList.select(id=list_id)
@@ -230,6 +254,7 @@ class SpecialListService:
             ) from e
 
     @staticmethod
+    @traced
     async def update_special_list(
         list_id: UUID, user_id: UUID, data: UpdateSpecialListCommand
     ) -> SpecialList:
@@ -262,6 +287,7 @@ class SpecialListService:
             ) from e
 
     @staticmethod
+    @traced
     async def delete_special_list(list_id: UUID, user_id: UUID) -> None:
         try:
             records = await SpecialList.select(id=list_id)
@@ -279,6 +305,7 @@ class SpecialListService:
             ) from e
 
     @staticmethod
+    @traced
     async def add_item_to_list(
         list_id: UUID, user_id: UUID, data: AddSpecialListItemCommand
     ) -> SpecialListItem:
@@ -302,6 +329,7 @@ class SpecialListService:
                         name=data.name,
                         weight=data.weight,
                         dimensions=data.dimensions,
+                        **dimension_columns(data.dimensions),
                         category=data.category,
                     )
                 else:
@@ -329,6 +357,7 @@ class SpecialListService:
             ) from e
 
     @staticmethod
+    @traced
     async def remove_item_from_list(
         list_id: UUID, item_id: UUID, user_id: UUID
     ) -> None:
@@ -356,6 +385,7 @@ class SpecialListService:
             ) from e
 
     @staticmethod
+    @traced
     async def update_list_item_quantity(
         list_id: UUID, item_id: UUID, user_id: UUID, data: UpdateSpecialListItemCommand
     ) -> SpecialListItem:
@@ -401,6 +431,7 @@ class SpecialListService:
             ) from e
 
     @staticmethod
+    @traced
     async def add_tag_to_list(list_id: UUID, user_id: UUID, data: AddTagCommand) -> Tag:
         if not data.has_valid_input:
             raise SpecialListError(
@@ -460,6 +491,7 @@ class SpecialListService:
             ) from e
 
     @staticmethod
+    @traced
     async def remove_tag_from_list(list_id: UUID, tag_id: UUID, user_id: UUID) -> None:
         try:
             list_records = await SpecialList.select(id=list_id)
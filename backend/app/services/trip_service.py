@@ -1,20 +1,114 @@
+import logging
 from datetime import date
-from typing import List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from fastapi_sqlalchemy import async_db as db
+from sqlalchemy import func, insert, select
 
-from app.api.dto import GeneratePackingListResponseDTO
+from app.api.dto import GeneratedListItemDTO, GeneratePackingListResponseDTO
+from app.dimensions import dimension_columns
 from app.models import GeneratedList, GeneratedListItem, Trip
+from app.pagination import encode_cursor
 from app.services.ai_service import AIService
+from app.services.generation_cache import trip_fingerprint
+from app.services.single_flight import SingleFlight
 from app.services.special_list_service import SpecialListService
+from app.tracing import traced
+
+logger = logging.getLogger("trip_service")
+
+# Shares one in-flight AI call between concurrent requests for equivalent trips
+generation_flight: SingleFlight[List[Dict[str, Any]]] = SingleFlight()
+
+# Upper bound (exclusive) of the NUMERIC(5, 3) item_weight column
+MAX_ITEM_WEIGHT = 100
 
 
 class TripService:
     ALLOWED_SORT_FIELDS = {"created_at", "destination", "start_date", "duration_days"}
 
     @staticmethod
+    def _list_name(trip: Trip) -> str:
+        """Build the generated list name from the trip destination."""
+        try:
+            logger.debug(f"Creating list name for destination: '{trip.destination}'")
+            # Handle potential formatting issues with curly braces
+            dest = str(trip.destination).replace("{", "{{").replace("}", "}}")
+            list_name = f"Lista rzeczy do {dest}"
+            logger.debug(f"List name created: '{list_name}'")
+            return list_name
+        except Exception as e:
+            logger.error(f"Error creating list name: {str(e)}")
+            return "Lista rzeczy do podróży"
+
+    @staticmethod
+    def _item_values(generated_list_id: UUID, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Map an AI-generated item onto GeneratedListItem column values.
+
+        Rows are validated against the table constraints here, so a single bad
+        item can be skipped before the batch insert instead of failing it.
+
+        Raises:
+            ValueError: If the item has no name or a non-positive quantity
+        """
+        name = item.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError(f"Invalid item name: {name!r}")
+
+        try:
+            quantity = int(item.get("quantity", 1))
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid quantity value '{item.get('quantity')}'")
+        if quantity <= 0:
+            raise ValueError(f"Quantity must be positive, got {quantity}")
+
+        item_weight = None
+        if item.get("weight") is not None:
+            try:
+                item_weight = float(item["weight"])
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Invalid weight value '{item.get('weight')}': {str(e)}")
+            else:
+                # item_weight is NUMERIC(5, 3) and must not be negative
+                if not 0 <= item_weight < MAX_ITEM_WEIGHT:
+                    logger.warning(f"Weight out of range: {item_weight}")
+                    item_weight = None
+
+        return {
+            "generated_list_id": generated_list_id,
+            "item_id": item.get("item_id"),  # May be None for custom items
+            "item_name": name,
+            "quantity": quantity,
+            "is_packed": False,
+            "item_category": item.get("category"),
+            "item_weight": item_weight,
+            "item_dimensions": item.get("dimensions"),
+            **dimension_columns(item.get("dimensions"), prefix="item_"),
+        }
+
+    @staticmethod
+    @traced
+    async def get_special_lists(
+        include_special_lists: Optional[List[UUID]], user_id: UUID
+    ) -> List:
+        """Fetch the requested special lists, failing if any of them is missing."""
+        if not include_special_lists:
+            return []
+        logger.debug(f"Fetching special lists: {include_special_lists}")
+        special_lists = await SpecialListService.get_lists(
+            list_ids=include_special_lists, user_id=user_id
+        )
+        requested = set(include_special_lists)
+        if len(special_lists) != len(requested):
+            logger.error(
+                f"Special lists not found: requested {len(requested)}, found {len(special_lists)}"
+            )
+            raise ValueError("One or more special lists not found")
+        return special_lists
+
+    @staticmethod
+    @traced
     async def create_trip(
         user_id: UUID,
         destination: str,
@@ -48,23 +142,34 @@ class TripService:
         return await Trip.get(id=trip_id)
 
     @staticmethod
+    @traced
     async def list_trips(
-        user_id: UUID, limit: int = 10, offset: int = 0, sort: Optional[str] = None
-    ) -> Tuple[List[Trip], int]:
+        user_id: UUID,
+        limit: int = 10,
+        offset: int = 0,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Trip], Optional[int], Optional[str]]:
         """
         List trips for a user with pagination and sorting.
 
+        With a cursor, the page is selected by keyset on (created_at, id) and
+        the total is not counted, so deep pages cost the same as the first one.
+        Cursors are only available for the default (newest first) order.
+
         Args:
             user_id: ID of the user
             limit: Maximum number of trips to return
             offset: Number of trips to skip
             sort: Field to sort by (must be one of ALLOWED_SORT_FIELDS)
+            cursor: Cursor returned with the previous page
 
         Returns:
-            Tuple of (list of trips, total count)
+            Tuple of (list of trips, total count or None with a cursor,
+            cursor for the next page or None)
 
         Raises:
-            ValueError: If sort field is invalid
+            ValueError: If sort field is invalid or can't be used with a cursor
         """
         # Validate sort field
         if sort and sort not in TripService.ALLOWED_SORT_FIELDS:
@@ -72,26 +177,45 @@ class TripService:
                 f"Invalid sort field. Allowed fields are: {', '.join(TripService.ALLOWED_SORT_FIELDS)}"
             )
 
+        if cursor:
+            if sort or offset:
+                raise ValueError("Cursor can't be combined with sort or offset")
+            trips, next_cursor = await Trip.select_page(
+                Trip.user_id == user_id, limit=limit, cursor=cursor
+            )
+            return trips, None, next_cursor
+
         # Build query
         query = select(Trip).where(Trip.user_id == user_id)
 
         # Add sorting if specified
         if sort:
-            query = query.order_by(getattr(Trip, sort))
+            query = query.order_by(getattr(Trip, sort), Trip.id)
         else:
             # Default sort by created_at desc
-            query = query.order_by(Trip.created_at.desc())
+            query = query.order_by(Trip.created_at.desc(), Trip.id)
 
         # Add pagination
         query = query.offset(offset).limit(limit)
 
         # Execute queries
-        trips = await Trip.select(user_id=user_id)
-        total = len(trips)
+        trips = list((await db.session.execute(query)).scalars().all())
+        total = (
+            await db.session.scalar(
+                select(func.count(Trip.id)).where(Trip.user_id == user_id)
+            )
+            or 0
+        )
 
-        return trips, total
+        # Let clients continue from here with a cursor
+        next_cursor = None
+        if not sort and trips and offset + len(trips) < total:
+            next_cursor = encode_cursor(trips[-1].created_at, trips[-1].id)
+
+        return trips, total, next_cursor
 
     @staticmethod
+    @traced
     async def get_trip(trip_id: UUID, user_id: UUID) -> Optional[Trip]:
         """
         Get a single trip by ID and verify ownership.
@@ -115,6 +239,124 @@ class TripService:
         return trip
 
     @staticmethod
+    @traced
+    async def generate_items(
+        trip: Trip,
+        special_lists: List,
+        exclude_categories: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Ask the AI service for the trip's items.
+
+        Doesn't touch the database, so it can run without holding a session.
+        Concurrent calls for equivalent trips share one AI request.
+
+        Args:
+            trip: Trip object to generate items for
+            special_lists: Special lists (with items loaded) to include
+            exclude_categories: Optional list of categories to exclude
+
+        Returns:
+            The generated items, as dicts owned by the caller
+        """
+        logger.debug("Calling AI service to generate packing list")
+        flight_key = trip_fingerprint(
+            trip,
+            exclude_categories=exclude_categories,
+            special_list_ids=[sl.id for sl in special_lists],
+        )
+        shared_items = await generation_flight.do(
+            flight_key,
+            lambda: AIService.generate_packing_list(
+                trip=trip,
+                special_lists=special_lists,
+                exclude_categories=exclude_categories,
+            ),
+        )
+        # The list may be shared with other requests, so work on a copy
+        generated_items = [dict(item) for item in shared_items]
+        logger.debug(f"AI service returned {len(generated_items)} items")
+        return generated_items
+
+    @staticmethod
+    @traced
+    async def save_packing_list(
+        trip: Trip, user_id: UUID, generated_items: List[Dict[str, Any]]
+    ) -> "GeneratePackingListResponseDTO":
+        """Store generated items as the trip's packing list.
+
+        The list and its items are written atomically in a savepoint of the
+        current session; invalid items are skipped.
+
+        Args:
+            trip: Trip the list belongs to
+            user_id: ID of the list owner
+            generated_items: Items returned by generate_items
+
+        Returns:
+            The stored packing list with items
+
+        Raises:
+            Exception: If the list can't be written
+        """
+        list_name = TripService._list_name(trip)
+        try:
+            # Write the list and its items atomically: a failure rolls back
+            # the savepoint instead of leaving an empty list behind
+            async with db.session.begin_nested():
+                logger.debug(
+                    f"Creating GeneratedList: user_id={user_id}, trip_id={trip.id}, name='{list_name}'"
+                )
+                [generated_list] = await GeneratedList.create_many(
+                    [{"user_id": user_id, "trip_id": trip.id, "name": list_name}]
+                )
+
+                # Validate every row up front so one bad item can't fail the batch
+                rows = []
+                for i, item in enumerate(generated_items):
+                    try:
+                        rows.append(TripService._item_values(generated_list.id, item))
+                    except ValueError as e:
+                        logger.error(f"Skipping invalid item {i+1}: {str(e)}")
+
+                logger.debug(f"Inserting {len(rows)} items in one batch")
+                items = await GeneratedListItem.create_many(rows)
+        except Exception as e:
+            logger.error(f"Error during list generation: {str(e)}")
+            raise Exception(f"Failed to generate packing list: {str(e)}")
+
+        # Build the response from the inserted rows; nothing is packed yet
+        response_data = {
+            "id": generated_list.id,
+            "name": generated_list.name,
+            "trip_id": generated_list.trip_id,
+            "items": items,
+            "created_at": generated_list.created_at,
+            "updated_at": generated_list.updated_at,
+            "items_count": len(items),
+            "packed_items_count": 0,
+        }
+
+        dto = GeneratePackingListResponseDTO.model_validate(
+            response_data, from_attributes=True
+        )
+        logger.debug("Successfully generated packing list")
+        return dto
+
+    @staticmethod
+    @traced
+    async def release_connection() -> None:
+        """End the current transaction so its connection goes back to the pool.
+
+        Loaded objects are detached first, so they keep their attributes
+        instead of being expired by the commit and reloaded on the next access.
+        The session checks out a connection again when it is next used.
+        """
+        await db.session.flush()
+        db.session.expunge_all()
+        await db.session.commit()
+
+    @staticmethod
+    @traced
     async def generate_packing_list(
         trip: Trip,
         user_id: UUID,
@@ -124,6 +366,10 @@ class TripService:
         """
         Generate a packing list for a trip using AI service.
 
+        The inputs are read first and the transaction is committed, so no
+        pooled connection is held while the AI service responds; the list is
+        then written and committed in a second, short transaction.
+
         Args:
             trip: Trip object to generate list for
             user_id: ID of the user requesting generation
@@ -137,21 +383,6 @@ class TripService:
             ValueError: If trip is invalid or special lists not found
             Exception: For AI service or database errors
         """
-        # Setup logging
-        import logging
-
-        logger = logging.getLogger("trip_service")
-        logger.setLevel(logging.DEBUG)
-        # Create console handler if it doesn't exist
-        if not logger.handlers:
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.DEBUG)
-            formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
-
         try:
             logger.debug(f"Starting generate_packing_list for trip ID: {trip.id}")
             logger.debug(
@@ -166,144 +397,103 @@ class TripService:
                 raise ValueError("Access denied")
 
             # Get special lists if specified
-            special_lists = []
-            if include_special_lists:
-                logger.debug(f"Fetching special lists: {include_special_lists}")
-                special_lists = await SpecialListService.get_lists(
-                    list_ids=include_special_lists, user_id=user_id
-                )
-                if len(special_lists) != len(include_special_lists):
-                    logger.error(
-                        f"Special lists not found: requested {len(include_special_lists)}, found {len(special_lists)}"
-                    )
-                    raise ValueError("One or more special lists not found")
+            special_lists = await TripService.get_special_lists(
+                include_special_lists, user_id
+            )
 
-            # Generate list name based on trip destination
-            try:
-                logger.debug(
-                    f"Creating list name for destination: '{trip.destination}'"
-                )
-                # Handle potential formatting issues with curly braces
-                dest = str(trip.destination).replace("{", "{{").replace("}", "}}")
-                list_name = f"Lista rzeczy do {dest}"
-                logger.debug(f"List name created: '{list_name}'")
-            except Exception as e:
-                logger.error(f"Error creating list name: {str(e)}")
-                list_name = "Lista rzeczy do podróży"
-
-            # Create generated list entry
-            try:
-                logger.debug(
-                    f"Creating GeneratedList: user_id={user_id}, trip_id={trip.id}, name='{list_name}'"
-                )
-                generated_list_id = await GeneratedList.create(
-                    user_id=user_id, trip_id=trip.id, name=list_name
-                )
-                logger.debug(f"GeneratedList created with ID: {generated_list_id}")
-            except Exception as e:
-                logger.error(f"Error creating GeneratedList: {str(e)}")
-                raise Exception(f"Failed to create generated list: {str(e)}")
+            # Return the connection to the pool for the duration of the AI call
+            await TripService.release_connection()
+            generated_items = await TripService.generate_items(
+                trip, special_lists, exclude_categories
+            )
 
-            try:
-                # Call AI service to generate items
-                logger.debug("Calling AI service to generate packing list")
-                generated_items = await AIService.generate_packing_list(
-                    trip=trip,
-                    special_lists=special_lists,
-                    exclude_categories=exclude_categories,
-                )
-                logger.debug(f"AI service returned {len(generated_items)} items")
+            # Write the list in a short transaction of its own
+            packing_list = await TripService.save_packing_list(
+                trip, user_id, generated_items
+            )
+            await db.session.commit()
+            return packing_list
 
-                # Create generated list items
-                for i, item in enumerate(generated_items):
-                    try:
-                        logger.debug(
-                            f"Creating item {i+1}/{len(generated_items)}: {item.get('name', 'unknown')}"
-                        )
-                        item_weight = None
-                        if item.get("weight") is not None:
-                            try:
-                                item_weight = float(item["weight"])
-                            except (ValueError, TypeError) as e:
-                                logger.warning(
-                                    f"Invalid weight value '{item.get('weight')}': {str(e)}"
-                                )
-
-                        await GeneratedListItem.create(
-                            generated_list_id=generated_list_id,
-                            item_id=item.get("item_id"),  # May be None for custom items
-                            item_name=item["name"],
-                            quantity=item.get("quantity", 1),
-                            is_packed=False,
-                            item_category=item.get("category"),
-                            item_weight=item_weight,
-                            item_dimensions=item.get("dimensions"),
-                        )
-                    except Exception as e:
-                        logger.error(f"Error creating item {i+1}: {str(e)}")
-                        # Continue with next item instead of failing the whole process
-                        continue
-
-                # Fetch the complete list with items
-                logger.debug(
-                    f"Fetching complete list with items for ID: {generated_list_id}"
-                )
-                query = (
-                    select(GeneratedList)
-                    .where(GeneratedList.id == generated_list_id)
-                    .options(selectinload(GeneratedList.items))
-                )
-                result = await GeneratedList.select_one(query)
-                if not result:
-                    logger.error(
-                        f"Failed to load generated list with ID: {generated_list_id}"
-                    )
-                    raise Exception("Failed to load generated list with items")
+        except Exception as outer_e:
+            logger.error(f"Outer exception in generate_packing_list: {str(outer_e)}")
+            raise
 
-                logger.debug(
-                    f"Successfully fetched list with {len(result.items) if hasattr(result, 'items') else 0} items"
-                )
+    @staticmethod
+    async def stream_packing_list(
+        trip_id: UUID,
+        user_id: UUID,
+        include_special_lists: Optional[List[UUID]] = None,
+        exclude_categories: Optional[List[str]] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate a packing list, yielding events as items are produced by the AI.
 
-                # Convert to DTO and return
-                logger.debug("Converting result to DTO")
-                # Calculate items_count and packed_items_count
-                items_count = len(result.items) if hasattr(result, "items") else 0
-                packed_items_count = (
-                    sum(1 for item in result.items if item.is_packed)
-                    if hasattr(result, "items")
-                    else 0
-                )
+        Runs in its own database session because the response body is streamed
+        after the request-scoped session has already been closed. Each item is
+        inserted as soon as it is parsed; the transaction is committed once the
+        stream completes and rolled back if it fails or the client disconnects.
 
-                # Create response data with computed fields
-                response_data = {
-                    "id": result.id,
-                    "name": result.name,
-                    "trip_id": result.trip_id,
-                    "items": result.items,
-                    "created_at": result.created_at,
-                    "updated_at": result.updated_at,
-                    "items_count": items_count,
-                    "packed_items_count": packed_items_count,
-                }
-
-                dto = GeneratePackingListResponseDTO.model_validate(
-                    response_data, from_attributes=True
-                )
-                logger.debug("Successfully generated packing list")
-                return dto
+        Args:
+            trip_id: ID of the trip to generate list for
+            user_id: ID of the user requesting generation
+            include_special_lists: Optional list of special list IDs to include
+            exclude_categories: Optional list of categories to exclude
 
-            except Exception as e:
-                logger.error(f"Error during list generation: {str(e)}")
-                # Clean up generated list if something fails
-                try:
-                    logger.debug(
-                        f"Cleaning up generated list with ID: {generated_list_id}"
-                    )
-                    await GeneratedList.delete(id=generated_list_id)
-                except Exception as cleanup_error:
-                    logger.error(f"Error during cleanup: {str(cleanup_error)}")
-                raise Exception(f"Failed to generate packing list: {str(e)}")
+        Yields:
+            Tuples of (event name, payload): one "list" event, an "item" event
+            per generated item and a final "done" event
 
-        except Exception as outer_e:
-            logger.error(f"Outer exception in generate_packing_list: {str(outer_e)}")
-            raise
+        Raises:
+            ValueError: If trip is not found or special lists are missing
+        """
+        async with db(commit_on_exit=True):
+            trip = await TripService.get_trip(trip_id, user_id=user_id)
+            if not trip:
+                raise ValueError("Trip not found")
+
+            special_lists = await TripService.get_special_lists(
+                include_special_lists, user_id
+            )
+            list_name = TripService._list_name(trip)
+            [generated_list] = await GeneratedList.create_many(
+                [{"user_id": user_id, "trip_id": trip.id, "name": list_name}]
+            )
+            generated_list_id = generated_list.id
+            logger.debug(
+                f"Streaming GeneratedList created with ID: {generated_list_id}"
+            )
+            yield "list", {
+                "id": str(generated_list_id),
+                "name": list_name,
+                "tripId": str(trip.id),
+            }
+
+            items_count = 0
+            async for item in AIService.stream_packing_list(
+                trip=trip,
+                special_lists=special_lists,
+                exclude_categories=exclude_categories,
+            ):
+                try:
+                    values = TripService._item_values(generated_list_id, item)
+                except ValueError as e:
+                    logger.error(f"Skipping invalid streamed item: {str(e)}")
+                    continue
+                stmt = (
+                    insert(GeneratedListItem)
+                    .values(**values)
+                    .returning(GeneratedListItem)
+                )
+                try:
+                    # A failed insert only rolls back its savepoint, so the
+                    # list and the items already sent are still committed
+                    async with db.session.begin_nested():
+                        created = (await db.session.execute(stmt)).scalar_one()
+                except Exception as e:
+                    logger.error(f"Error creating streamed item: {str(e)}")
+                    continue
+                items_count += 1
+                dto = GeneratedListItemDTO.model_validate(created)
+                yield "item", dto.model_dump(mode="json", by_alias=True)
+
+            yield "done", {"id": str(generated_list_id), "itemsCount": items_count}
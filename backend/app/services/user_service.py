@@ -12,6 +12,7 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 from app.models import ActiveSession, User
+from app.services.password_executor import ExecutorBusyError, run_password_task
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -20,6 +21,8 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class UserService:
+    # bcrypt is CPU-bound: callers in async code should run these two through
+    # run_password_task so the event loop isn't blocked
     @staticmethod
     def get_password_hash(password: str) -> str:
         return pwd_context.hash(password)
@@ -36,7 +39,9 @@ class UserService:
     async def create_user(email: str, password: str, first_name: str) -> User:
         try:
             # Create new user
-            hashed_password = UserService.get_password_hash(password)
+            hashed_password = await run_password_task(
+                UserService.get_password_hash, password
+            )
             user_data = {
                 "email": email,
                 "hashed_password": hashed_password,
@@ -49,6 +54,8 @@ class UserService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
+        except ExecutorBusyError:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -71,7 +78,10 @@ class UserService:
                 )
 
             logger.debug("Verifying password for user: %s", email)
-            if not UserService.verify_password(password, user.hashed_password):
+            password_valid = await run_password_task(
+                UserService.verify_password, password, user.hashed_password
+            )
+            if not password_valid:
                 logger.warning("Invalid password for user: %s", email)
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,7 +92,7 @@ class UserService:
             logger.info("User authenticated successfully: %s", email)
             return user
 
-        except HTTPException:
+        except (HTTPException, ExecutorBusyError):
             raise
         except Exception as e:
             logger.error(
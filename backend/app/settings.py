@@ -1,3 +1,5 @@
+import os
+
 # Domain
 # This would be set to the production domain with an env var on deployment
 # used by Traefik to transmit traffic and aqcuire TLS certificates
@@ -30,6 +32,125 @@ POSTGRES_DB = ""
 POSTGRES_USER = ""
 POSTGRES_PASSWORD = ""
 
+# Outbound HTTP client (OpenRouter)
+HTTP_POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.environ.get("HTTP_DNS_CACHE_TTL", "300"))
+
+# Process-wide limits on OpenRouter calls; 0 disables a limit. Callers over the
+# limits wait at most OPENROUTER_MAX_QUEUE_WAIT seconds before being rejected.
+OPENROUTER_MAX_CONCURRENCY = int(os.environ.get("OPENROUTER_MAX_CONCURRENCY", "16"))
+OPENROUTER_REQUESTS_PER_SECOND = float(
+    os.environ.get("OPENROUTER_REQUESTS_PER_SECOND", "10")
+)
+OPENROUTER_TOKENS_PER_MINUTE = int(os.environ.get("OPENROUTER_TOKENS_PER_MINUTE", "0"))
+OPENROUTER_MAX_QUEUE_WAIT = float(os.environ.get("OPENROUTER_MAX_QUEUE_WAIT", "30"))
+
+# Circuit breaker for OpenRouter: opens when at least MIN_CALLS calls in the last
+# WINDOW seconds were made and FAILURE_RATE of them failed or took longer than
+# SLOW_CALL_SECONDS; calls then fail fast (fallback list) for COOLDOWN seconds
+OPENROUTER_CIRCUIT_FAILURE_RATE = float(
+    os.environ.get("OPENROUTER_CIRCUIT_FAILURE_RATE", "0.5")
+)
+OPENROUTER_CIRCUIT_SLOW_CALL_SECONDS = float(
+    os.environ.get("OPENROUTER_CIRCUIT_SLOW_CALL_SECONDS", "60")
+)
+OPENROUTER_CIRCUIT_MIN_CALLS = int(os.environ.get("OPENROUTER_CIRCUIT_MIN_CALLS", "5"))
+OPENROUTER_CIRCUIT_WINDOW = float(os.environ.get("OPENROUTER_CIRCUIT_WINDOW", "60"))
+OPENROUTER_CIRCUIT_COOLDOWN = float(os.environ.get("OPENROUTER_CIRCUIT_COOLDOWN", "30"))
+
+# Hedged requests: when set, a request the model hasn't answered by the given
+# percentile of its recent latencies (INITIAL_DELAY seconds until MIN_SAMPLES
+# are known) is also sent to this model, and the first valid answer wins
+OPENROUTER_HEDGE_MODEL = os.environ.get("OPENROUTER_HEDGE_MODEL", "")
+OPENROUTER_HEDGE_PERCENTILE = float(
+    os.environ.get("OPENROUTER_HEDGE_PERCENTILE", "0.9")
+)
+OPENROUTER_HEDGE_INITIAL_DELAY = float(
+    os.environ.get("OPENROUTER_HEDGE_INITIAL_DELAY", "15")
+)
+OPENROUTER_HEDGE_MIN_SAMPLES = int(os.environ.get("OPENROUTER_HEDGE_MIN_SAMPLES", "20"))
+
+# Model id prefixes (comma-separated) that support JSON-Schema structured output;
+# requests to other models ask for a plain JSON object
+OPENROUTER_JSON_SCHEMA_MODELS = [
+    prefix.strip()
+    for prefix in os.environ.get(
+        "OPENROUTER_JSON_SCHEMA_MODELS", "openai/,google/gemini"
+    ).split(",")
+    if prefix.strip()
+]
+
+# Generated packing list cache: "memory" (per process), "sqlite" (shared file) or "none"
+GENERATION_CACHE_BACKEND = os.environ.get("GENERATION_CACHE_BACKEND", "memory")
+GENERATION_CACHE_TTL = float(os.environ.get("GENERATION_CACHE_TTL", "86400"))
+GENERATION_CACHE_MAX_ENTRIES = int(
+    os.environ.get("GENERATION_CACHE_MAX_ENTRIES", "1000")
+)
+GENERATION_CACHE_MAX_BYTES = int(
+    os.environ.get("GENERATION_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+)
+GENERATION_CACHE_PATH = os.environ.get(
+    "GENERATION_CACHE_PATH", "/tmp/packmeup_generation_cache.sqlite3"
+)
+
+# Password hashing (bcrypt) thread pool; 0 workers means one per CPU core
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "0"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.environ.get("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+# Authenticated user cache used by get_current_user (per process)
+PRINCIPAL_CACHE_TTL = float(os.environ.get("PRINCIPAL_CACHE_TTL", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(
+    os.environ.get("PRINCIPAL_CACHE_MAX_ENTRIES", "10000")
+)
+
+# Background packing list generation (?async=true); 0 workers disables the
+# in-process pool, e.g. when jobs are processed by another process
+GENERATION_JOB_WORKERS = int(os.environ.get("GENERATION_JOB_WORKERS", "4"))
+GENERATION_JOB_POLL_INTERVAL = float(
+    os.environ.get("GENERATION_JOB_POLL_INTERVAL", "2")
+)
+# Seconds a claimed job stays locked to its worker before it counts as abandoned;
+# the worker renews it every third of this while the AI call runs
+GENERATION_JOB_LEASE = float(os.environ.get("GENERATION_JOB_LEASE", "300"))
+GENERATION_JOB_MAX_ATTEMPTS = int(os.environ.get("GENERATION_JOB_MAX_ATTEMPTS", "3"))
+GENERATION_JOB_RETRY_DELAY = float(os.environ.get("GENERATION_JOB_RETRY_DELAY", "10"))
+
+# Logging: root level plus per-logger overrides, e.g.
+# LOG_LEVELS="app.services.openrouter_service=DEBUG,sqlalchemy.engine=WARNING".
+# Records are written by a background thread (LOG_QUEUE=0 writes them in the
+# calling thread), as JSON lines or as text (LOG_FORMAT=text). Only one in
+# LOG_SAMPLE_EVERY per-item debug records is logged.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+LOG_QUEUE = os.environ.get("LOG_QUEUE", "1") != "0"
+LOG_SAMPLE_EVERY = int(os.environ.get("LOG_SAMPLE_EVERY", "20"))
+
+# Tracing (OpenTelemetry spans for routes, services, statements and OpenRouter
+# calls): "none", "file" (JSON lines appended to TRACE_FILE) or "console".
+# TRACE_SAMPLE_RATIO of new traces are recorded.
+TRACE_EXPORTER = os.environ.get("TRACE_EXPORTER", "none")
+TRACE_FILE = os.environ.get("TRACE_FILE", "/tmp/packmeup_traces.jsonl")
+TRACE_SAMPLE_RATIO = float(os.environ.get("TRACE_SAMPLE_RATIO", "1"))
+
+# Database engine. Each engine (the main one, and the read lane when
+# POSTGRES_READ_URL is set) keeps up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+# connections per process: size workers so that they fit in max_connections.
+# DB_POOL_RECYCLE=-1 never recycles a connection. DB_STATEMENT_CACHE_SIZE
+# prepared statements are cached per connection (0 behind pgbouncer in
+# transaction mode). DB_STATEMENT_TIMEOUT is in milliseconds (0 leaves the
+# server's default) and DB_JIT=0 turns off Postgres' JIT compiler.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "0") == "1"
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", "100"))
+DB_STATEMENT_TIMEOUT = int(os.environ.get("DB_STATEMENT_TIMEOUT", "0"))
+DB_JIT = os.environ.get("DB_JIT", "1") != "0"
+
 # SENTRY_DSN=
 
 # Configure these with your own Docker registry images
@@ -39,3 +160,8 @@ POSTGRES_PASSWORD = ""
 from app.local_settings import *  # noqa: F403
 
 POSTGRES_URL = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+# Read-only lane used by GET endpoints: when set, their sessions use a separate
+# engine on this URL (a read replica, or POSTGRES_URL again for a second pool);
+# otherwise they share the main pool. Reads from a replica may lag behind writes.
+POSTGRES_READ_URL = os.environ.get("POSTGRES_READ_URL", "")
@@ -0,0 +1,171 @@
+import functools
+import inspect
+import logging
+import os
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple, TypeVar
+
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind, Tracer
+
+from app import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+SERVICE_NAME = "packmeup-api"
+
+# Parameters recorded as span attributes, by parameter name
+ID_ATTRIBUTES = {
+    "trip_id": "trip.id",
+    "list_id": "list.id",
+    "generated_list_id": "list.id",
+    "item_id": "item.id",
+    "tag_id": "tag.id",
+    "job_id": "job.id",
+    "trip": "trip.id",
+    "list_ids": "special_list.ids",
+    "include_special_lists": "special_list.ids",
+}
+
+_DISABLED: ContextManager[Optional[Span]] = nullcontext()
+
+_provider: Optional[TracerProvider] = None
+_tracer: Optional[Tracer] = None
+
+
+def id_attribute(value: Any) -> Any:
+    """Convert an id argument (a UUID, a model or a list of UUIDs) to a value.
+
+    Returns None for a model that has no id yet.
+    """
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    value = getattr(value, "id", value)
+    return None if value is None else str(value)
+
+
+def span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: SpanKind = SpanKind.INTERNAL,
+) -> ContextManager[Optional[Span]]:
+    """Start a span as the current span; yields None while tracing is off."""
+    if _tracer is None:
+        return _DISABLED
+    return _tracer.start_as_current_span(name, kind=kind, attributes=attributes)
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def traced(fn: F) -> F:
+    """Run a function (sync or async) in a span named after its qualified name.
+
+    Arguments listed in ID_ATTRIBUTES (trip and list ids, or a Trip) become
+    span attributes. While tracing is off the call goes straight through.
+    """
+    name = fn.__qualname__
+    recorded: List[Tuple[int, str, str]] = []
+    for index, parameter in enumerate(inspect.signature(fn).parameters.values()):
+        if parameter.name in ID_ATTRIBUTES:
+            recorded.append((index, parameter.name, ID_ATTRIBUTES[parameter.name]))
+
+    def attributes(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        values = {}
+        for index, parameter, key in recorded:
+            value = args[index] if index < len(args) else kwargs.get(parameter)
+            if value is not None:
+                value = id_attribute(value)
+            if value is not None:
+                values[key] = value
+        return values
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return await fn(*args, **kwargs)
+            with _tracer.start_as_current_span(
+                name, attributes=attributes(args, kwargs)
+            ):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _tracer is None:
+            return fn(*args, **kwargs)
+        with _tracer.start_as_current_span(name, attributes=attributes(args, kwargs)):
+            return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class JsonLinesSpanExporter(ConsoleSpanExporter):
+    """Append finished spans to a file, one OTLP-style JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(
+            service_name=SERVICE_NAME,
+            out=open(path, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+
+    def shutdown(self) -> None:
+        self.out.close()
+
+
+def configure_tracing(exporter: Optional[SpanExporter] = None) -> None:
+    """Start tracing with the given exporter or the one set by TRACE_EXPORTER.
+
+    TRACE_EXPORTER is "none" (tracing off), "file" (JSON lines appended to
+    TRACE_FILE) or "console" (stdout). Configured exporters get spans in
+    batches from a background thread; an exporter passed in, e.g. an
+    InMemorySpanExporter in tests, gets each span as soon as it ends.
+
+    Raises:
+        ValueError: If TRACE_EXPORTER isn't a known exporter
+    """
+    global _provider, _tracer
+    shutdown_tracing()
+
+    if exporter is not None:
+        processor: Any = SimpleSpanProcessor(exporter)
+    elif settings.TRACE_EXPORTER == "none":
+        return
+    elif settings.TRACE_EXPORTER == "file":
+        processor = BatchSpanProcessor(JsonLinesSpanExporter(settings.TRACE_FILE))
+    elif settings.TRACE_EXPORTER == "console":
+        processor = BatchSpanProcessor(ConsoleSpanExporter(SERVICE_NAME))
+    else:
+        raise ValueError(f"Unknown trace exporter: {settings.TRACE_EXPORTER}")
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACE_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(processor)
+    _tracer = _provider.get_tracer(__name__)
+    logger.info(f"Tracing enabled (sample ratio {settings.TRACE_SAMPLE_RATIO})")
+
+
+def shutdown_tracing() -> None:
+    """Export the remaining spans and turn tracing off."""
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
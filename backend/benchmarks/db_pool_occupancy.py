@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Measure how long packing list generation holds a pooled DB connection.
+
+Runs concurrent generations against a real PostgreSQL database with the AI
+call replaced by a fixed delay. Every generation gets its own trip, so calls
+aren't merged by the in-flight deduplication. The run is repeated with the
+AI call made inside the request transaction (the old behaviour) and through
+``TripService.generate_packing_list``, which releases the connection before
+the call and writes the list in a second, short transaction. Pool checkout
+and checkin events give the time each connection was held and the peak
+number checked out at once. The temporary user and its rows are deleted at
+the end.
+
+Usage (from the ``backend`` directory):
+
+    python -m benchmarks.db_pool_occupancy --generations 50 --ai-latency 1.0
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from fastapi_sqlalchemy import AsyncDBSessionMiddleware  # noqa: E402
+from fastapi_sqlalchemy import async_db as db  # noqa: E402
+from sqlalchemy import delete, event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine  # noqa: E402
+
+from app import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Trip, User  # noqa: E402
+from app.services.ai_service import AIService  # noqa: E402
+from app.services.trip_service import TripService  # noqa: E402
+
+ITEMS = [
+    {"name": "Paszport", "quantity": 1, "category": "Dokumenty"},
+    {"name": "Skarpetki", "quantity": 3, "category": "Odzież"},
+    {"name": "Szczoteczka do zębów", "quantity": 1, "category": "Kosmetyki"},
+]
+
+
+class PoolMonitor:
+    """Record connection hold times and peak usage from pool events."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.holds: List[float] = []
+        self.peak = 0
+        self._checked_out: Dict[int, float] = {}
+        pool = engine.sync_engine.pool
+        event.listen(pool, "checkout", self._checkout)
+        event.listen(pool, "checkin", self._checkin)
+
+    def reset(self) -> None:
+        self.holds = []
+        self.peak = 0
+
+    def _checkout(self, dbapi_connection, record, proxy) -> None:
+        self._checked_out[id(record)] = time.perf_counter()
+        self.peak = max(self.peak, len(self._checked_out))
+
+    def _checkin(self, dbapi_connection, record) -> None:
+        start = self._checked_out.pop(id(record), None)
+        if start is not None:
+            self.holds.append((time.perf_counter() - start) * 1000)
+
+
+async def _inline(trip_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    """Old behaviour: the AI call runs inside the request transaction."""
+    async with db(commit_on_exit=True):
+        trip = await TripService.get_trip(trip_id, user_id=user_id)
+        special_lists = await TripService.get_special_lists(None, user_id)
+        items = await TripService.generate_items(trip, special_lists)
+        await TripService.save_packing_list(trip, user_id, items)
+
+
+async def _two_phase(trip_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    async with db(commit_on_exit=True):
+        trip = await TripService.get_trip(trip_id, user_id=user_id)
+        await TripService.generate_packing_list(trip, user_id=user_id)
+
+
+async def _run(
+    generate: Callable[[uuid.UUID, uuid.UUID], Awaitable[None]],
+    trip_ids: List[uuid.UUID],
+    user_id: uuid.UUID,
+) -> List[float]:
+    """Run one generation per trip concurrently and return their latencies."""
+    latencies: List[float] = []
+
+    async def one(trip_id: uuid.UUID) -> None:
+        start = time.perf_counter()
+        await generate(trip_id, user_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one(trip_id) for trip_id in trip_ids))
+    return latencies
+
+
+def _report(label: str, monitor: PoolMonitor, latencies: List[float], wall: float):
+    holds = sorted(monitor.holds)
+    p99 = holds[min(len(holds) - 1, int(len(holds) * 0.99))]
+    print(
+        f"{label:<12} hold p50={statistics.median(holds):8.2f} ms"
+        f"  p99={p99:8.2f} ms  peak={monitor.peak:3d} connections"
+        f"  generation p50={statistics.median(latencies):8.2f} ms"
+        f"  wall={wall:6.2f} s"
+    )
+
+
+async def _create_trips(user_id: uuid.UUID, count: int, label: str) -> List:
+    async with db(commit_on_exit=True):
+        trips = [
+            Trip(
+                user_id=user_id,
+                destination=f"Benchmark {label} {n}",
+                duration_days=3,
+                num_adults=1,
+                children_ages=[],
+            )
+            for n in range(count)
+        ]
+        db.session.add_all(trips)
+        await db.session.flush()
+        return [trip.id for trip in trips]
+
+
+async def main(
+    db_url: str, generations: int, ai_latency: float, pool_size: int
+) -> None:
+    logging.disable(logging.CRITICAL)
+    engine = create_async_engine(db_url, pool_size=pool_size, max_overflow=0)
+    AsyncDBSessionMiddleware(app, custom_engine=engine)
+    monitor = PoolMonitor(engine)
+
+    async def generate_packing_list(trip, special_lists=None, exclude_categories=None):
+        await asyncio.sleep(ai_latency)
+        return ITEMS
+
+    user_id: Optional[uuid.UUID] = None
+    try:
+        async with db(commit_on_exit=True):
+            user = User(
+                email=f"benchmark-{uuid.uuid4().hex}@example.com", hashed_password="-"
+            )
+            db.session.add(user)
+            await db.session.flush()
+            user_id = user.id
+
+        with patch.object(AIService, "generate_packing_list", generate_packing_list):
+            for label, generate in (("inline", _inline), ("two-phase", _two_phase)):
+                trip_ids = await _create_trips(user_id, generations, label)
+                monitor.reset()
+                start = time.perf_counter()
+                latencies = await _run(generate, trip_ids, user_id)
+                _report(label, monitor, latencies, time.perf_counter() - start)
+    finally:
+        if user_id is not None:
+            async with db(commit_on_exit=True):
+                await db.session.execute(delete(User).where(User.id == user_id))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db-url", default=settings.POSTGRES_URL)
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument(
+        "--ai-latency", type=float, default=1.0, help="Stub AI delay in seconds"
+    )
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.db_url, args.generations, args.ai_latency, args.pool_size))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare schema validation of a structured response with the repair path.
+
+A model answering with the JSON-Schema response format returns
+``{"items": [...]}`` with typed fields. ``validate_items`` checks and coerces
+it in one pydantic-core pass; before, every response went through
+``parse_items`` and ``AIService._normalize_item`` per item. Reports the CPU
+time per response for both.
+
+Usage (from the ``backend`` directory):
+
+    python -m benchmarks.item_validation --items 40 --rounds 2000
+"""
+
+import argparse
+import json
+import logging
+import time
+from typing import Callable, Dict, List
+
+from app.services.ai_service import AIService
+from app.services.item_schema import ITEM_CATEGORIES, validate_items
+from app.services.json_stream import parse_items
+
+
+def _response(count: int) -> str:
+    items = [
+        {
+            "name": f"Rzecz {n}",
+            "quantity": n % 3 + 1,
+            "category": ITEM_CATEGORIES[n % len(ITEM_CATEGORIES)],
+            "weight": round(0.1 * (n % 7 + 1), 1) if n % 4 else None,
+        }
+        for n in range(count)
+    ]
+    return json.dumps({"items": items}, ensure_ascii=False)
+
+
+def _repair(text: str) -> List[Dict]:
+    parsed = enumerate(parse_items(text))
+    items = [AIService._normalize_item(item, i) for i, item in parsed]
+    return [item for item in items if item is not None]
+
+
+def _measure(parse: Callable[[str], object], text: str, rounds: int) -> float:
+    """Return the CPU time per call in microseconds."""
+    start = time.process_time()
+    for _ in range(rounds):
+        parse(text)
+    return (time.process_time() - start) / rounds * 1e6
+
+
+def main(items: int, rounds: int) -> None:
+    logging.disable(logging.CRITICAL)
+    text = _response(items)
+    assert validate_items(text) == _repair(text)
+    repair_us = _measure(_repair, text, rounds)
+    validate_us = _measure(validate_items, text, rounds)
+    print(f"{items} items, {len(text)} characters")
+    print(f"parse_items + _normalize_item  {repair_us:8.1f} µs")
+    print(f"validate_items                 {validate_us:8.1f} µs")
+    print(f"speedup                        {repair_us / validate_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.items, args.rounds)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Compare the old JSON cleanup of model responses with ``parse_items``.
+
+Runs both parsers over a corpus of model responses with the defects seen in
+practice (markdown fences, prose around the JSON, a wrapping object, trailing
+commas, missing commas and answers cut off by ``max_tokens``) and reports
+the CPU time per response and the number of items with a name each recovers.
+The old behaviour is ``AIService._clean_json_content`` followed by
+``json.loads`` and the ``_extract_items_from_text`` regex fallback, copied
+here as they were before ``parse_items`` replaced them.
+
+Usage (from the ``backend`` directory):
+
+    python -m benchmarks.json_repair --rounds 2000
+"""
+
+import argparse
+import json
+import logging
+import re
+import time
+from typing import Callable, Dict, List
+
+from app.services.json_stream import parse_items
+
+
+def _items(count: int, start: int = 0) -> List[Dict]:
+    categories = ["Odzież", "Kosmetyki", "Elektronika", "Dokumenty", "Zdrowie"]
+    return [
+        {
+            "name": f'Rzecz {{{n}}} "{n}"',
+            "quantity": n % 3 + 1,
+            "category": categories[n % len(categories)],
+            "weight": round(0.1 * (n % 7 + 1), 1),
+            "dimensions": f"{10 + n}x{5 + n % 4}x{2 + n % 3}",
+        }
+        for n in range(start, start + count)
+    ]
+
+
+def _array(items: List[Dict]) -> str:
+    return json.dumps(items, ensure_ascii=False, indent=2)
+
+
+def _corpus() -> Dict[str, str]:
+    full = _array(_items(25))
+    truncated = full[: int(len(full) * 0.8)]
+    return {
+        "valid": full,
+        "fenced": f"```json\n{full}\n```",
+        "prose": f"Oto lista rzeczy do spakowania:\n{full}\nMiłej podróży!",
+        "wrapped": json.dumps({"items": _items(25)}, ensure_ascii=False),
+        "single object": json.dumps(_items(1)[0], ensure_ascii=False),
+        "trailing commas": full.replace('"\n  }', '",\n  }').replace("}\n]", "},\n]"),
+        "missing comma": full.replace('"quantity"', '"quantity"', 1).replace(
+            "},\n  {", "}\n  {", 3
+        ),
+        "truncated": truncated,
+        "truncated fenced": f"```json\n{truncated}",
+        "truncated wrapped": json.dumps({"items": _items(25)}, ensure_ascii=False)[
+            :1500
+        ],
+        "prose and trailing comma": "Proponuję:\n"
+        + _array(_items(10)).replace("}\n]", "},\n]")
+        + "\nDaj znać, jeśli coś zmienić.",
+    }
+
+
+def _legacy_clean(content: str) -> str:
+    """``AIService._clean_json_content`` before it was replaced."""
+    try:
+        array_match = re.search(r"\[.*\]", content, re.DOTALL)
+        if array_match:
+            extracted_json = array_match.group(0)
+            try:
+                json.loads(extracted_json)
+                return extracted_json
+            except json.JSONDecodeError:
+                pass
+        else:
+            extracted_json = content
+        if "```json" in extracted_json:
+            extracted_json = re.sub(r"```json\s*", "", extracted_json)
+            extracted_json = re.sub(r"```\s*", "", extracted_json)
+        start_idx = extracted_json.find("[")
+        end_idx = extracted_json.rfind("]")
+        if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
+            extracted_json = extracted_json[start_idx : end_idx + 1]
+        extracted_json = re.sub(r",\s*}", "}", extracted_json)
+        extracted_json = re.sub(r",\s*]", "]", extracted_json)
+        open_braces = extracted_json.count("{")
+        close_braces = extracted_json.count("}")
+        if open_braces > close_braces:
+            extracted_json += "}" * (open_braces - close_braces)
+        open_brackets = extracted_json.count("[")
+        close_brackets = extracted_json.count("]")
+        if open_brackets > close_brackets:
+            extracted_json += "]" * (open_brackets - close_brackets)
+        try:
+            result = json.loads(extracted_json)
+            if not isinstance(result, list):
+                return json.dumps([result])
+            return extracted_json
+        except json.JSONDecodeError:
+            return "[]"
+    except Exception:
+        return "[]"
+
+
+def _legacy_extract(text: str) -> List[Dict]:
+    """``AIService._extract_items_from_text`` before it was replaced."""
+    items = []
+    for match in re.finditer(
+        r'{\s*"name"\s*:\s*"([^"]+)"\s*,\s*"quantity"\s*:\s*(\d+)\s*,\s*"category"\s*:\s*"([^"]+)"',
+        text,
+    ):
+        items.append(
+            {
+                "name": match.group(1),
+                "quantity": int(match.group(2)),
+                "category": match.group(3),
+            }
+        )
+    return items
+
+
+def _legacy_parse(text: str) -> List[Dict]:
+    try:
+        parsed = json.loads(_legacy_clean(text))
+        return parsed if isinstance(parsed, list) else [parsed]
+    except json.JSONDecodeError:
+        return _legacy_extract(text)
+
+
+def _recovered(items: List[Dict]) -> int:
+    return sum(1 for item in items if isinstance(item, dict) and item.get("name"))
+
+
+def _measure(parse: Callable[[str], List[Dict]], text: str, rounds: int) -> float:
+    """Return the CPU time per call in microseconds."""
+    start = time.process_time()
+    for _ in range(rounds):
+        parse(text)
+    return (time.process_time() - start) / rounds * 1e6
+
+
+def main(rounds: int) -> None:
+    logging.disable(logging.CRITICAL)
+    print(
+        f"{'response':<26}{'old µs':>10}{'new µs':>10}{'speedup':>9}"
+        f"{'old items':>11}{'new items':>11}"
+    )
+    totals = [0.0, 0.0, 0, 0]
+    for name, text in _corpus().items():
+        old_us = _measure(_legacy_parse, text, rounds)
+        new_us = _measure(parse_items, text, rounds)
+        old_items = _recovered(_legacy_parse(text))
+        new_items = _recovered(parse_items(text))
+        for i, value in enumerate((old_us, new_us, old_items, new_items)):
+            totals[i] += value
+        print(
+            f"{name:<26}{old_us:>10.1f}{new_us:>10.1f}{old_us / new_us:>8.1f}x"
+            f"{old_items:>11}{new_items:>11}"
+        )
+    old_us, new_us, old_items, new_items = totals
+    print(
+        f"{'total':<26}{old_us:>10.1f}{new_us:>10.1f}{old_us / new_us:>8.1f}x"
+        f"{old_items:>11}{new_items:>11}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.rounds)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Measure the logging overhead of a packing list generation request.
+
+Runs ``AIService.generate_packing_list`` sequentially with the OpenRouter
+call replaced by a canned fenced response of ``--items`` items, so the
+repair path and its per-item debug lines run too. The generation cache is
+disabled and so is the rate limiter. Logging is configured by
+``configure_logging`` writing to a temporary file, with the pipeline on
+(records queued for the writer thread) and off (records formatted and
+written by the calling thread), at DEBUG and at INFO. ``--write-latency-us``
+makes every write block for that long, like stderr piped to a slow log
+collector. Reports the event loop time per request and the overhead over a
+run with logging disabled. Writing out what is still queued at the end of a
+run isn't counted, because that happens off the request path.
+
+Usage (from the ``backend`` directory):
+
+    python -m benchmarks.logging_overhead --requests 500 --write-latency-us 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+os.environ.setdefault("OPENROUTER_API_ENDPOINT", "http://stub")
+
+from app import logging_config, settings  # noqa: E402
+from app.models import Trip  # noqa: E402
+from app.services.ai_service import AIService  # noqa: E402
+from app.services.openrouter_service import OpenRouterService  # noqa: E402
+from app.services.rate_limiter import UpstreamLimiter  # noqa: E402
+
+UNLIMITED = UpstreamLimiter(
+    max_concurrency=0, requests_per_second=0, tokens_per_minute=0, max_wait=0
+)
+
+
+def _response(items: int) -> Dict[str, Any]:
+    content = json.dumps(
+        [
+            {"name": f"Rzecz {n}", "quantity": n % 3 + 1, "category": "Odzież"}
+            for n in range(items)
+        ],
+        ensure_ascii=False,
+        indent=2,
+    )
+    return {"choices": [{"message": {"content": f"```json\n{content}\n```"}}]}
+
+
+async def _run(requests: int, items: int) -> float:
+    """Return the mean time per request in milliseconds."""
+    data = _response(items)
+
+    async def post(self, session, headers, payload, timeout):
+        return data
+
+    trip = Trip(destination="Lizbona", duration_days=7, num_adults=2)
+    with (
+        patch.object(OpenRouterService, "_post", post),
+        patch("app.services.ai_service.get_http_client", return_value=MagicMock()),
+        patch(
+            "app.services.openrouter_service.get_openrouter_limiter",
+            return_value=UNLIMITED,
+        ),
+        patch("app.services.ai_service.get_generation_cache", return_value=None),
+    ):
+        start = time.perf_counter()
+        for _ in range(requests):
+            await AIService.generate_packing_list(trip)
+        return (time.perf_counter() - start) / requests * 1000
+
+
+class SlowStream:
+    """File wrapper whose writes block for a fixed time first."""
+
+    def __init__(self, stream: Any, latency: float) -> None:
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text: str) -> int:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def _configure(queue: bool, level: str, stream: Any) -> None:
+    settings.LOG_QUEUE = queue
+    settings.LOG_LEVEL = level
+    logging_config.configure_logging(stream)
+
+
+def main(requests: int, items: int, write_latency_us: float) -> None:
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as file:
+        stream = SlowStream(file, write_latency_us / 1e6)
+        logging.disable(logging.CRITICAL)
+        asyncio.run(_run(requests // 10, items))  # warm up
+        baseline = asyncio.run(_run(requests, items))
+        logging.disable(logging.NOTSET)
+        print(f"logging disabled      {baseline:7.3f} ms/request")
+
+        for level in ("DEBUG", "INFO"):
+            for queue in (False, True):
+                _configure(queue, level, stream)
+                elapsed = asyncio.run(_run(requests, items))
+                logging_config.stop_logging()
+                name = f"pipeline {'on' if queue else 'off'}, {level}"
+                print(
+                    f"{name:<22}{elapsed:7.3f} ms/request, "
+                    f"overhead {elapsed - baseline:6.3f} ms"
+                )
+        print(f"{file.tell() / 1024:.0f} KiB of logs written")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--items", type=int, default=30)
+    parser.add_argument("--write-latency-us", type=float, default=0)
+    args = parser.parse_args()
+    main(args.requests, args.items, args.write_latency_us)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Measure non-auth request latency during a login storm.
+
+Serves a small FastAPI app with uvicorn in a separate process: ``/login``
+verifies a bcrypt hash with ``UserService.verify_password`` and ``/ping``
+returns immediately. While many logins run concurrently, a probe calls
+``/ping`` at a fixed interval. The run is repeated with verification done
+inline on the event loop (the old behaviour) and through the bounded
+password executor.
+
+Usage (from the ``backend`` directory):
+
+    python -m benchmarks.login_storm --logins 200 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import time
+from typing import List, Tuple
+
+import aiohttp
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+PASSWORD = "StrongPass123"
+
+
+def _serve(mode: str, port: int, workers: int, queue_limit: int) -> None:
+    import logging
+
+    import uvicorn
+    from fastapi import FastAPI, HTTPException
+
+    from app import settings
+    from app.services.password_executor import ExecutorBusyError, run_password_task
+    from app.services.user_service import UserService
+
+    logging.disable(logging.CRITICAL)
+    settings.PASSWORD_HASH_WORKERS = workers
+    settings.PASSWORD_HASH_QUEUE_LIMIT = queue_limit
+    hashed = UserService.get_password_hash(PASSWORD)
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login() -> dict:
+        try:
+            if mode == "inline":
+                valid = UserService.verify_password(PASSWORD, hashed)
+            else:
+                valid = await run_password_task(
+                    UserService.verify_password, PASSWORD, hashed
+                )
+        except ExecutorBusyError:
+            raise HTTPException(status_code=503)
+        return {"valid": valid}
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(session: aiohttp.ClientSession, base: str) -> None:
+    for _ in range(200):
+        try:
+            async with session.get(f"{base}/ping") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError("Benchmark server did not start")
+
+
+async def _storm(
+    base: str, logins: int, concurrency: int, interval: float
+) -> Tuple[List[float], float, int]:
+    """Run the login storm and return (ping latencies ms, logins/s, rejected)."""
+    connector = aiohttp.TCPConnector(limit=concurrency + 1)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await _wait_ready(session, base)
+        semaphore = asyncio.Semaphore(concurrency)
+        rejected = 0
+        done = asyncio.Event()
+
+        async def login() -> None:
+            nonlocal rejected
+            async with semaphore:
+                async with session.post(f"{base}/login") as response:
+                    await response.read()
+                    rejected += response.status == 503
+
+        async def probe() -> List[float]:
+            latencies = []
+            while not done.is_set():
+                start = time.perf_counter()
+                async with session.get(f"{base}/ping") as response:
+                    await response.read()
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(interval)
+            return latencies
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        return await probe_task, logins / elapsed, rejected
+
+
+def _report(label: str, latencies: List[float], rate: float, rejected: int) -> None:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<8} ping p50={p50:7.2f} ms  p99={p99:7.2f} ms  "
+        f"max={ordered[-1]:7.2f} ms  logins={rate:6.1f}/s  rejected={rejected}"
+    )
+
+
+def main(logins: int, concurrency: int, workers: int, queue_limit: int) -> None:
+    for mode in ("inline", "pool"):
+        port = _free_port()
+        server = multiprocessing.Process(
+            target=_serve, args=(mode, port, workers, queue_limit), daemon=True
+        )
+        server.start()
+        try:
+            latencies, rate, rejected = asyncio.run(
+                _storm(f"http://127.0.0.1:{port}", logins, concurrency, 0.01)
+            )
+        finally:
+            server.terminate()
+            server.join()
+        _report(mode, latencies, rate, rejected)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Pool threads (0 = one per core)"
+    )
+    parser.add_argument("--queue-limit", type=int, default=64)
+    args = parser.parse_args()
+    main(args.logins, args.concurrency, args.workers, args.queue_limit)
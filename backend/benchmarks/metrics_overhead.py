@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Measure the cost of recording and rendering metrics.
+
+Times a labelled ``Histogram.observe`` and ``Counter.inc`` as used on the
+request path, next to the same observation taken under a ``threading.Lock``
+(what a thread-safe client library does per update) for comparison. Then
+fills every application histogram with ``--series`` label combinations and
+times ``render()``, which only runs when ``/metrics`` is scraped. Reports
+CPU time per call.
+
+Usage (from the ``backend`` directory):
+
+    python -m benchmarks.metrics_overhead --rounds 1000000 --series 50
+"""
+
+import argparse
+import threading
+import time
+from typing import Callable
+
+from app import metrics
+from app.metrics import LATENCY_BUCKETS, Counter, Histogram
+
+
+def _measure(fn: Callable[[], object], rounds: int) -> float:
+    """Return the CPU time per call in nanoseconds."""
+    start = time.process_time()
+    for _ in range(rounds):
+        fn()
+    return (time.process_time() - start) / rounds * 1e9
+
+
+def main(rounds: int, series: int) -> None:
+    histogram = Histogram("bench_seconds", "Benchmark", ("method", "route"))
+    counter = Counter("bench_total", "Benchmark", ("model",))
+    lock = threading.Lock()
+
+    def observe() -> None:
+        histogram.observe(0.012, "GET", "/api/trips/{trip_id}")
+
+    def observe_locked() -> None:
+        with lock:
+            histogram.observe(0.012, "GET", "/api/trips/{trip_id}")
+
+    def inc() -> None:
+        counter.inc("openai/gpt-4o-mini")
+
+    empty = _measure(lambda: None, rounds)
+    for name, fn in (
+        ("Histogram.observe", observe),
+        ("Histogram.observe + Lock", observe_locked),
+        ("Counter.inc", inc),
+    ):
+        print(f"{name:<28}{_measure(fn, rounds) - empty:7.0f} ns")
+
+    for metric in metrics._metrics:
+        for n in range(series):
+            labels = tuple(f"{name}-{n}" for name in metric.labels)
+            if isinstance(metric, Histogram):
+                metric.observe(LATENCY_BUCKETS[n % len(LATENCY_BUCKETS)], *labels)
+            else:
+                metric.inc(*labels)
+    output = metrics.render()
+    render_us = _measure(metrics.render, max(rounds // 10000, 10)) / 1000
+    print(
+        f"{'render()':<28}{render_us:7.0f} µs "
+        f"({output.count(chr(10))} lines, {len(output) / 1024:.0f} KiB)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1_000_000)
+    parser.add_argument("--series", type=int, default=50)
+    args = parser.parse_args()
+    main(args.rounds, args.series)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Compare per-request sessions against the pooled OpenRouter client.
+
+Starts a local stub of the chat completions endpoint and sends the same
+request through ``OpenRouterService`` twice: once opening a new
+``aiohttp.ClientSession`` per call (the old behaviour) and once through the
+shared, pooled session used by the application.
+
+Usage (from the ``backend`` directory):
+
+    python -m benchmarks.openrouter_pool --requests 500 --concurrency 10 --tls
+"""
+
+import argparse
+import asyncio
+import datetime
+import ssl
+import statistics
+import tempfile
+import time
+from typing import List, Optional
+
+import aiohttp
+from aiohttp import web
+
+from app.services.http_client import create_connector
+from app.services.openrouter_service import OpenRouterService
+from app.services.rate_limiter import UpstreamLimiter
+
+# Measure connection reuse only, without the process-wide request limits
+UNLIMITED = UpstreamLimiter(
+    max_concurrency=0, requests_per_second=0, tokens_per_minute=0, max_wait=0
+)
+
+STUB_RESPONSE = {
+    "choices": [
+        {
+            "message": {
+                "content": '[{"name": "Pasta do zębów", "quantity": 1, "category": "Kosmetyki"}]'
+            }
+        }
+    ]
+}
+
+
+async def _completions(request: web.Request) -> web.Response:
+    await request.read()
+    return web.json_response(STUB_RESPONSE)
+
+
+def _self_signed_context() -> ssl.SSLContext:
+    """Create a server TLS context with an ephemeral self-signed certificate."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    with tempfile.NamedTemporaryFile(suffix=".pem", delete=False) as pem:
+        pem.write(cert.public_bytes(serialization.Encoding.PEM))
+        pem.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(pem.name)
+    return context
+
+
+async def _run(
+    endpoint: str,
+    requests: int,
+    concurrency: int,
+    shared: Optional[aiohttp.ClientSession],
+    verify_ssl: bool,
+) -> List[float]:
+    """Send ``requests`` calls and return their latencies in milliseconds."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def call(session: aiohttp.ClientSession) -> None:
+        service = OpenRouterService(
+            "bench-key", endpoint, session=session, limiter=UNLIMITED
+        )
+        service.set_user_message("ping")
+        await service.send_request()
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            if shared is not None:
+                await call(shared)
+            else:
+                # Old behaviour: a fresh session (and connection) per request
+                connector = aiohttp.TCPConnector(ssl=None if verify_ssl else False)
+                async with aiohttp.ClientSession(connector=connector) as session:
+                    await call(session)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def _report(label: str, latencies: List[float]) -> None:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:<22} p50={p50:7.2f} ms  p99={p99:7.2f} ms  n={len(ordered)}")
+
+
+async def main(requests: int, concurrency: int, tls: bool) -> None:
+    app = web.Application()
+    app.router.add_post("/api/v1/chat/completions", _completions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(
+        runner, "127.0.0.1", 0, ssl_context=_self_signed_context() if tls else None
+    )
+    await site.start()
+    port = runner.addresses[0][1]
+    scheme = "https" if tls else "http"
+    endpoint = f"{scheme}://127.0.0.1:{port}/api/v1/chat/completions"
+
+    # The stub certificate is self-signed, so verification is disabled client-side
+    verify_ssl = not tls
+    try:
+        per_call = await _run(endpoint, requests, concurrency, None, verify_ssl)
+        _report("session per request", per_call)
+
+        connector = create_connector(ssl=None if verify_ssl else False)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            pooled = await _run(endpoint, requests, concurrency, session, verify_ssl)
+        _report("pooled session", pooled)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--tls", action="store_true", help="Serve the stub over HTTPS")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.tls))
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Measure the cost of rendering the user prompt for a trip.
+
+Compares ``render_user_prompt``, which fills a template parsed once at
+import, with the old ``AIService._build_prompt``, copied here as it was
+(without its debug logging): an f-string built per call with every field
+escaped by ``.replace`` chains and the luggage section appended branch by
+branch. Both produce the same prompt for trips without braces in their
+fields. Reports the CPU time per render.
+
+Usage (from the ``backend`` directory):
+
+    python -m benchmarks.prompt_render --rounds 20000
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from app.models import Trip
+from app.services.prompts import render_user_prompt
+
+
+def _legacy_build_prompt(trip: Trip) -> str:
+    """``AIService._build_prompt`` before the prompts were templated."""
+    try:
+        # Safe string representation, escaping any format specifiers
+
+        dest = (
+            str(trip.destination).replace("{", "{{").replace("}", "}}")
+            if trip.destination
+            else "Not specified"
+        )
+        days = (
+            str(trip.duration_days).replace("{", "{{").replace("}", "}}")
+            if trip.duration_days
+            else "0"
+        )
+        adults = (
+            str(trip.num_adults).replace("{", "{{").replace("}", "}}")
+            if trip.num_adults
+            else "0"
+        )
+
+        children_safe = (
+            str(trip.children_ages).replace("{", "{{").replace("}", "}}")
+            if trip.children_ages
+            else "None"
+        )
+        accommodation_safe = (
+            str(trip.accommodation).replace("{", "{{").replace("}", "}}")
+            if trip.accommodation
+            else "Not specified"
+        )
+        transport_safe = (
+            str(trip.transport).replace("{", "{{").replace("}", "}}")
+            if trip.transport
+            else "Not specified"
+        )
+
+        # Handle activities safely
+        if trip.activities and isinstance(trip.activities, list):
+            try:
+                activities_joined = ", ".join(
+                    str(a).replace("{", "{{").replace("}", "}}")
+                    for a in trip.activities
+                )
+            except Exception:
+                activities_joined = "Not specified"
+        else:
+            activities_joined = "Not specified"
+
+        season_safe = (
+            str(trip.season).replace("{", "{{").replace("}", "}}")
+            if trip.season
+            else "Not specified"
+        )
+
+        prompt = f"""
+Wygeneruj listę rzeczy do spakowania na podróż o następujących szczegółach:
+- Cel podróży: {dest}
+- Czas trwania: {days} dni
+- Liczba dorosłych: {adults}
+- Wiek dzieci: {children_safe} (lista wieków dzieci, np. [], [2, 5], jeśli brak dzieci, lista będzie pusta)
+- Zakwaterowanie: {accommodation_safe} (np. hotel, apartament z kuchnią, kemping)
+- Transport: {transport_safe}(np. samolot, samochód, pociąg)
+- Aktywności: {activities_joined} (np. plażowanie, zwiedzanie miasta, trekking, spotkania biznesowe)
+- Pora roku: {season_safe} (np. lato, zima, wiosna, jesień)
+
+Dla każdego przedmiotu na liście, zwróć obiekt JSON z następującymi **kluczami w języku angielskim**:
+- `name`: (string) Jasna i konkretna **nazwa przedmiotu w języku polskim**.
+- `quantity`: (integer) Wymagana liczba sztuk, obliczona na podstawie czasu trwania podróży i liczby podróżujących. Dla przedmiotów, których dokładna ilość jest trudna do ustalenia z góry (np. krem z filtrem, pasta do zębów, płyn pod prysznic) lub których ilość jest "jedna sztuka zbiorcza" (np. apteczka, kosmetyczka), użyj wartości 1. Dostosuj ilość ubrań (np. skarpetki, bielizna) do długości wyjazdu oraz dostępności prania.
+- `category`: (string) Jedna z predefiniowanych **polskich nazw kategorii**: "Odzież", "Elektronika", "Kosmetyki", "Dokumenty", "Akcesoria", "Zdrowie", "Rozrywka".
+- `weight`: (number, opcjonalnie) Przybliżona waga w kg. Staraj się podać dla jak największej liczby przedmiotów, zwłaszcza jeśli są ograniczenia bagażowe. Użyj kropki jako separatora dziesiętnego.
+
+Przykład pojedynczego obiektu JSON:
+`{{"name": "Pasta do zębów", "quantity": 1, "category": "Kosmetyki", "weight": 0.1}}`
+
+Sformatuj odpowiedź jako tablicę JSON tych obiektów.
+Upewnij się, że wszystkie wartości dla klucza `quantity` są liczbami całkowitymi, a dla klucza `weight` liczbami (mogą być dziesiętne).
+Upewnij się, że całkowita waga nie przekracza limitów bagażu, jeśli zostały określone.
+Nie umieszczaj tablicy JSON w żadnym dodatkowym obiekcie nadrzędnym.
+Klucze w obiektach JSON muszą być w języku angielskim, a **wartości tekstowe (takie jak wartości dla kluczy `name` i `category`) muszą być w języku polskim.**
+"""
+    except Exception:
+        # Fallback to a simpler prompt
+        prompt = """
+Wygeneruj listę rzeczy do spakowania na podróż.
+Dla każdego przedmiotu zwróć obiekt JSON z następującymi kluczami:
+- name: Nazwa przedmiotu po polsku
+- quantity: Liczba sztuk (liczba całkowita)
+- category: Kategoria (po polsku): Odzież, Elektronika, Kosmetyki, Dokumenty, Akcesoria, Zdrowie, Rozrywka
+- weight: Przybliżona waga w kg (opcjonalnie)
+
+Przykład: {"name": "Pasta do zębów", "quantity": 1, "category": "Kosmetyki", "weight": 0.1}
+"""
+
+    if trip.available_luggage:
+        try:
+            prompt += "\nOgraniczenia bagażowe:\n"
+
+            # Ensure we're dealing with a list or convert to list if it's a single item
+            if not isinstance(trip.available_luggage, list):
+                luggage_items = [trip.available_luggage]
+            else:
+                luggage_items = trip.available_luggage
+
+            for i, luggage in enumerate(luggage_items):
+                # Try different ways to access luggage data
+                if isinstance(luggage, dict):
+                    if "max_weight" in luggage:
+                        weight_val = (
+                            str(luggage["max_weight"])
+                            .replace("{", "{{")
+                            .replace("}", "}}")
+                        )
+                        prompt += f"- Maksymalna waga: {weight_val} kg\n"
+                    if "maxWeight" in luggage:  # Try alternative property name
+                        weight_val = (
+                            str(luggage["maxWeight"])
+                            .replace("{", "{{")
+                            .replace("}", "}}")
+                        )
+                        prompt += f"- Maksymalna waga: {weight_val} kg\n"
+                    if "dimensions" in luggage:
+                        dim_val = (
+                            str(luggage["dimensions"])
+                            .replace("{", "{{")
+                            .replace("}", "}}")
+                        )
+                        prompt += f"- Wymiary: {dim_val}\n"
+                elif hasattr(luggage, "max_weight") and luggage.max_weight:
+                    weight_val = (
+                        str(luggage.max_weight).replace("{", "{{").replace("}", "}}")
+                    )
+                    prompt += f"- Maksymalna waga: {weight_val} kg\n"
+                elif hasattr(luggage, "maxWeight") and luggage.maxWeight:
+                    weight_val = (
+                        str(luggage.maxWeight).replace("{", "{{").replace("}", "}}")
+                    )
+                    prompt += f"- Maksymalna waga: {weight_val} kg\n"
+
+                if hasattr(luggage, "dimensions") and luggage.dimensions:
+                    dim_val = (
+                        str(luggage.dimensions).replace("{", "{{").replace("}", "}}")
+                    )
+                    prompt += f"- Wymiary: {dim_val}\n"
+        except Exception:
+            pass
+
+    return prompt
+
+
+def _trip() -> Trip:
+    return Trip(
+        destination="Lizbona",
+        duration_days=7,
+        num_adults=2,
+        children_ages=[4, 9],
+        accommodation="apartament z kuchnią",
+        transport="samolot",
+        activities=["zwiedzanie", "plażowanie", "surfing"],
+        season="lato",
+        available_luggage=[
+            {"max_weight": 23, "dimensions": "75x50x30"},
+            {"max_weight": 8, "dimensions": "55x40x20"},
+        ],
+    )
+
+
+def _measure(render: Callable[[Trip], str], trip: Trip, rounds: int) -> float:
+    """Return the CPU time per call in microseconds."""
+    start = time.process_time()
+    for _ in range(rounds):
+        render(trip)
+    return (time.process_time() - start) / rounds * 1e6
+
+
+def main(rounds: int) -> None:
+    trip = _trip()
+    assert _legacy_build_prompt(trip) == render_user_prompt(trip)
+    old_us = _measure(_legacy_build_prompt, trip, rounds)
+    new_us = _measure(render_user_prompt, trip, rounds)
+    print(f"_build_prompt       {old_us:8.2f} µs")
+    print(f"render_user_prompt  {new_us:8.2f} µs")
+    print(f"speedup             {old_us / new_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.rounds)
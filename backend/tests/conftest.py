@@ -82,4 +82,39 @@ def mock_db_session(mocker):
     return mock_session
 
 
+@pytest.fixture(autouse=True)
+def reset_singletons():
+    """Give every test fresh process-wide components and empty metrics."""
+    from app import metrics
+    from app.services import (
+        circuit_breaker,
+        generation_cache,
+        hedging,
+        principal_cache,
+        rate_limiter,
+    )
+
+    resets = [
+        generation_cache.reset,
+        principal_cache.reset,
+        rate_limiter.reset,
+        circuit_breaker.reset,
+        hedging.reset,
+        metrics.reset,
+    ]
+    for reset in resets:
+        reset()
+    yield
+    for reset in resets:
+        reset()
+
+
+@pytest.fixture(autouse=True)
+def no_generation_workers(monkeypatch):
+    """Don't start background generation workers with the app's lifespan."""
+    from app.services.generation_jobs import generation_workers
+
+    monkeypatch.setattr(generation_workers, "workers", 0)
+
+
 # Add more fixtures as needed for your specific application requirements
@@ -0,0 +1,114 @@
+import pytest
+
+from app.models import Trip
+from app.services.ai_service import FALLBACK_ITEMS, AIService
+from app.services.json_stream import JsonItemStream
+
+STREAMED_RESPONSE = (
+    '```json\n[\n  {"name": "Skarpetki", "quantity": 3, "category": "Odzież"},\n'
+    '  {"name": "Mapa {miasta}", "quantity": "1", "category": "Akcesoria", "weight": "0.1"},\n'
+    '  {"name": "Cytat \\"x\\"", "quantity": 1, "category": "Rozrywka"}\n]\n```'
+)
+
+
+@pytest.fixture
+def trip():
+    return Trip(
+        destination="Kraków",
+        duration_days=3,
+        num_adults=2,
+        children_ages=[],
+        activities=["zwiedzanie"],
+    )
+
+
+@pytest.fixture
+def openrouter_env(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("OPENROUTER_API_ENDPOINT", "http://stub")
+
+
+def chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestJsonItemStream:
+    @pytest.mark.parametrize("size", [1, 3, 17, 1000])
+    def test_feed_in_chunks(self, size):
+        """Test that objects are emitted regardless of how the text is split."""
+        # Arrange
+        parser = JsonItemStream()
+
+        # Act
+        items = []
+        for chunk in chunks(STREAMED_RESPONSE, size):
+            items.extend(parser.feed(chunk))
+
+        # Assert
+        assert [item["name"] for item in items] == [
+            "Skarpetki",
+            "Mapa {miasta}",
+            'Cytat "x"',
+        ]
+
+    def test_emits_items_before_array_closes(self):
+        """Test that a completed object is returned before the rest arrives."""
+        # Arrange
+        parser = JsonItemStream()
+
+        # Act
+        first = parser.feed('[{"name": "A", "quantity": 1}, {"name": "B"')
+
+        # Assert
+        assert first == [{"name": "A", "quantity": 1}]
+        assert parser.feed(', "quantity": 2}]') == [{"name": "B", "quantity": 2}]
+
+
+class TestAIServiceStream:
+    @pytest.mark.asyncio
+    async def test_stream_packing_list(self, trip, openrouter_env, mocker):
+        """Test that streamed items are normalized, adjusted and filtered."""
+
+        # Arrange
+        async def fake_stream(self):
+            for chunk in chunks(STREAMED_RESPONSE, 7):
+                yield chunk
+
+        mocker.patch(
+            "app.services.openrouter_service.OpenRouterService.stream", fake_stream
+        )
+
+        # Act
+        items = [
+            item
+            async for item in AIService.stream_packing_list(
+                trip, exclude_categories=["rozrywka"]
+            )
+        ]
+
+        # Assert
+        assert [item["name"] for item in items] == ["Skarpetki", "Mapa {miasta}"]
+        assert items[0]["quantity"] == 6  # personal item scaled for 2 adults
+        assert items[1]["quantity"] == 1
+        assert items[1]["weight"] == 0.1
+
+    @pytest.mark.asyncio
+    async def test_stream_falls_back_on_error(self, trip, openrouter_env, mocker):
+        """Test that the default list is streamed when the upstream call fails."""
+
+        # Arrange
+        async def failing_stream(self):
+            raise Exception("boom")
+            yield  # pragma: no cover
+
+        mocker.patch(
+            "app.services.openrouter_service.OpenRouterService.stream", failing_stream
+        )
+
+        # Act
+        items = [item async for item in AIService.stream_packing_list(trip)]
+
+        # Assert
+        assert [item["name"] for item in items] == [
+            item["name"] for item in FALLBACK_ITEMS
+        ]
@@ -0,0 +1,147 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models import Trip
+from app.services import circuit_breaker
+from app.services.ai_service import FALLBACK_ITEMS, AIService
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from app.services.openrouter_service import OpenRouterService
+
+
+@pytest.fixture
+def clock():
+    return [0.0]
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "test",
+        failure_rate=0.5,
+        slow_call_seconds=10,
+        min_calls=4,
+        window=60,
+        cooldown=30,
+        clock=lambda: clock[0],
+    )
+
+
+def trip_breaker(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.before_call()
+        breaker.record(0.1, failed=True)
+
+
+class TestCircuitBreaker:
+    def test_opens_on_failure_rate(self, breaker):
+        """Test that the circuit opens once enough calls failed."""
+        # Arrange
+        for failed in (False, True, False):
+            breaker.before_call()
+            breaker.record(0.1, failed=failed)
+        assert breaker.state == CircuitState.CLOSED
+
+        # Act
+        breaker.before_call()
+        breaker.record(0.1, failed=True)
+
+        # Assert
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.stats()["rejected"] == 1
+
+    def test_slow_calls_count_as_failures(self, breaker):
+        """Test that calls over the latency threshold open the circuit."""
+        # Act
+        for _ in range(4):
+            breaker.before_call()
+            breaker.record(12.0, failed=False)
+
+        # Assert
+        assert breaker.state == CircuitState.OPEN
+
+    def test_old_outcomes_leave_the_window(self, breaker, clock):
+        """Test that failures older than the window are forgotten."""
+        # Arrange
+        for _ in range(3):
+            breaker.record(0.1, failed=True)
+        clock[0] = 61.0
+
+        # Act
+        breaker.record(0.1, failed=True)
+
+        # Assert
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.stats()["calls"] == 1
+
+    def test_half_open_probe_closes_circuit(self, breaker, clock):
+        """Test that one call is let through after the cooldown."""
+        # Arrange
+        trip_breaker(breaker)
+        clock[0] = 30.0
+
+        # Act
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record(0.1, failed=False)
+
+        # Assert
+        assert breaker.state == CircuitState.CLOSED
+        breaker.before_call()
+
+    def test_failed_probe_reopens_circuit(self, breaker, clock):
+        """Test that a failing probe starts another cooldown."""
+        # Arrange
+        trip_breaker(breaker)
+        clock[0] = 30.0
+
+        # Act
+        breaker.before_call()
+        breaker.record(0.1, failed=True)
+
+        # Assert
+        assert breaker.state == CircuitState.OPEN
+        clock[0] = 59.0
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.stats()["opened"] == 2
+
+
+class TestOpenCircuitFallback:
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, breaker):
+        """Test that no request is sent while the circuit is open."""
+        # Arrange
+        trip_breaker(breaker)
+        session = MagicMock()
+        service = OpenRouterService(
+            "key", "http://stub", session=session, breaker=breaker
+        )
+
+        # Act
+        with pytest.raises(CircuitOpenError):
+            await service.send_request()
+
+        # Assert
+        session.post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generation_returns_fallback(self, breaker, monkeypatch, mocker):
+        """Test that generation falls back to the default list immediately."""
+        # Arrange
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        monkeypatch.setenv("OPENROUTER_API_ENDPOINT", "http://stub")
+        monkeypatch.setattr(circuit_breaker, "_openrouter_breaker", breaker)
+        trip_breaker(breaker)
+        post = mocker.patch("app.services.openrouter_service.OpenRouterService._post")
+
+        # Act
+        items = await AIService.generate_packing_list(
+            Trip(destination="Kraków", duration_days=3, num_adults=1)
+        )
+
+        # Assert
+        assert items == FALLBACK_ITEMS
+        post.assert_not_called()
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import settings
+from app.database import TimedQueuePool, engine_args
+
+
+class TestEngineArgs:
+    def test_pool_and_connection_settings(self, monkeypatch):
+        """Test that pool limits and per-connection options come from settings."""
+        # Arrange
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+        monkeypatch.setattr(settings, "DB_POOL_PRE_PING", True)
+        monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+        monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT", 5000)
+        monkeypatch.setattr(settings, "DB_JIT", False)
+
+        # Act
+        args = engine_args()
+
+        # Assert
+        assert args["pool_size"] == 20
+        assert args["max_overflow"] == 0
+        assert args["pool_pre_ping"] is True
+        assert args["connect_args"] == {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "server_settings": {"statement_timeout": "5000", "jit": "off"},
+        }
+
+    def test_server_defaults_are_left_alone(self, monkeypatch):
+        """Test that no server settings are sent unless configured."""
+        # Arrange
+        monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT", 0)
+        monkeypatch.setattr(settings, "DB_JIT", True)
+
+        # Act
+        args = engine_args()
+
+        # Assert
+        assert args["connect_args"]["server_settings"] == {}
+
+
+class TestPoolStats:
+    @pytest.mark.asyncio
+    async def test_checked_out_waiting_and_timeouts(self):
+        """Test that the pool reports busy connections, waiters and timeouts."""
+        # Arrange
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            poolclass=TimedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        pool = engine.pool
+
+        # Act
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            waiter = asyncio.create_task(engine.connect().start())
+            await asyncio.sleep(0.01)
+            busy = pool.stats()
+            with pytest.raises(exc.TimeoutError):
+                await waiter
+        idle = pool.stats()
+        await engine.dispose()
+
+        # Assert
+        assert busy["checked_out"] == 1
+        assert busy["waiting"] == 1
+        assert busy["max_connections"] == 1
+        assert idle["checked_out"] == 0
+        assert idle["idle"] == 1
+        assert idle["waiting"] == 0
+        assert idle["timeouts"] == 1
+        assert idle["wait_seconds_max"] >= 0.05
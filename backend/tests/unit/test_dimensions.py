@@ -0,0 +1,57 @@
+import pytest
+
+from app.api.dto import LuggageModel
+from app.dimensions import dimension_columns, parse_dimensions
+
+
+class TestParseDimensions:
+    def test_parses_dimensions(self):
+        """Test that WxHxD strings are parsed with spaces and units ignored."""
+        assert parse_dimensions("55x40x20") == (55.0, 40.0, 20.0)
+        assert parse_dimensions("10.5 X 4 x 2 cm") == (10.5, 4.0, 2.0)
+        assert parse_dimensions("10.005x4x2") == (10.01, 4.0, 2.0)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            None,
+            "",
+            "55x40",
+            "ax40x20",
+            "0x40x20",
+            "10000x1x1",
+            "nanx1x1",
+            # Round to 0.00 and 10000.00 in NUMERIC(6, 2)
+            "0.004x40x20",
+            "9999.995x1x1",
+        ],
+    )
+    def test_rejects_malformed_dimensions(self, value):
+        """Test that malformed, non-positive or too large dimensions are ignored."""
+        assert parse_dimensions(value) is None
+
+
+class TestDimensionColumns:
+    def test_prefixed_columns(self):
+        """Test that the parsed values are mapped onto prefixed column names."""
+        assert dimension_columns("30x20x10", prefix="item_") == {
+            "item_width": 30.0,
+            "item_height": 20.0,
+            "item_depth": 10.0,
+        }
+
+    def test_unparseable_value_gives_nulls(self):
+        """Test that all three columns stay NULL for an unparseable string."""
+        assert dimension_columns("duży") == {
+            "width": None,
+            "height": None,
+            "depth": None,
+        }
+
+
+class TestLuggageModel:
+    def test_rejects_malformed_dimensions(self):
+        """Test that luggage dimensions are validated with the shared parser."""
+        with pytest.raises(ValueError):
+            LuggageModel(dimensions="55x40")
+        assert LuggageModel(dimensions="55 x 40 x 20").dimensions == "55 x 40 x 20"
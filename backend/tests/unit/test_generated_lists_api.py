@@ -0,0 +1,164 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api.auth import get_current_user_id
+from app.api.generated_lists import list_page_query
+from app.main import app
+from app.pagination import decode_cursor, encode_cursor
+
+TEST_USER_ID = uuid.uuid4()
+
+
+def compile_sql(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def test_client():
+    app.dependency_overrides[get_current_user_id] = lambda: TEST_USER_ID
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_current_user_id, None)
+
+
+@pytest.fixture
+def mock_db(mocker):
+    return mocker.patch("app.api.generated_lists.db")
+
+
+def summary_row(name, total, items_count=0, packed_items_count=0):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name=name,
+        trip_id=uuid.uuid4(),
+        created_at=datetime.now(timezone.utc),
+        updated_at=None,
+        total=total,
+        items_count=items_count,
+        packed_items_count=packed_items_count,
+    )
+
+
+class TestListPageQuery:
+    def test_filters_sorts_and_paginates_in_sql(self):
+        """Test that the page, total and counts are all computed by the database."""
+        # Act
+        sql = compile_sql(
+            list_page_query(
+                TEST_USER_ID,
+                limit=10,
+                offset=20,
+                search="kraków",
+                trip_id=uuid.uuid4(),
+                sort_field="name",
+                sort_order="asc",
+            )
+        )
+
+        # Assert
+        assert "ILIKE" in sql
+        assert "generated_lists.trip_id = " in sql
+        assert "count(*) OVER ()" in sql
+        assert "LIMIT" in sql and "OFFSET" in sql
+        assert "ORDER BY generated_lists.name ASC, generated_lists.id ASC" in sql
+        assert "count(*) FILTER (WHERE generated_list_items.is_packed)" in sql
+        assert "GROUP BY generated_list_items.generated_list_id" in sql
+        assert "generated_list_items.item_name" not in sql
+
+    def test_cursor_page_uses_keyset_without_total(self):
+        """Test that a cursor page skips OFFSET and the window count."""
+        # Act
+        sql = compile_sql(
+            list_page_query(
+                TEST_USER_ID,
+                limit=11,
+                cursor=encode_cursor(datetime.now(timezone.utc), uuid.uuid4()),
+            )
+        )
+
+        # Assert
+        assert "OVER ()" not in sql
+        assert "generated_lists.created_at < " in sql
+
+    def test_cursor_requires_default_order(self):
+        """Test that a cursor can't be combined with another sort order."""
+        cursor = encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+        with pytest.raises(ValueError):
+            list_page_query(TEST_USER_ID, limit=10, sort_field="name", cursor=cursor)
+
+    def test_unknown_sort_field_falls_back_to_created_at(self):
+        """Test that an unsupported sort field can't reach the ORDER BY clause."""
+        sql = compile_sql(list_page_query(TEST_USER_ID, limit=10, sort_field="1; --"))
+        assert "ORDER BY generated_lists.created_at DESC, generated_lists.id ASC" in sql
+
+
+class TestListGeneratedLists:
+    def test_returns_page_with_counts(self, test_client, mock_db):
+        """Test that totals and counts come from the query result."""
+        # Arrange
+        rows = [
+            summary_row(
+                "Lista rzeczy do Kraków", 12, items_count=5, packed_items_count=2
+            ),
+            summary_row("Lista rzeczy do Gdańsk", 12),
+        ]
+        mock_db.session.execute = AsyncMock(
+            return_value=MagicMock(all=MagicMock(return_value=rows))
+        )
+
+        # Act
+        response = test_client.get("/api/generated-lists/?page=2&page_size=10")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 12
+        assert data["totalPages"] == 2
+        assert data["items"][0]["itemsCount"] == 5
+        assert data["items"][0]["packedItemsCount"] == 2
+        mock_db.session.execute.assert_awaited_once()
+
+    def test_cursor_page_returns_next_cursor(self, test_client, mock_db):
+        """Test that a cursor page returns the position of its last row."""
+        # Arrange
+        rows = [summary_row(f"Lista {i}", None) for i in range(3)]
+        mock_db.session.execute = AsyncMock(
+            return_value=MagicMock(all=MagicMock(return_value=rows))
+        )
+        cursor = encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+
+        # Act
+        response = test_client.get(f"/api/generated-lists/?page_size=2&cursor={cursor}")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert data["total"] is None
+        assert decode_cursor(data["nextCursor"]) == (rows[1].created_at, rows[1].id)
+
+    def test_invalid_cursor_is_bad_request(self, test_client, mock_db):
+        """Test that a malformed cursor is reported as a client error."""
+        response = test_client.get("/api/generated-lists/?cursor=nonsense")
+        assert response.status_code == 400
+
+    def test_page_past_the_end_counts_separately(self, test_client, mock_db):
+        """Test that an empty page still reports the total number of lists."""
+        # Arrange
+        mock_db.session.execute = AsyncMock(
+            return_value=MagicMock(all=MagicMock(return_value=[]))
+        )
+        mock_db.session.scalar = AsyncMock(return_value=3)
+
+        # Act
+        response = test_client.get("/api/generated-lists/?page=5")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["total"] == 3
+        assert response.json()["items"] == []
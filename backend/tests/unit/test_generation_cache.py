@@ -0,0 +1,178 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models import Trip
+from app.services.ai_service import AIService
+from app.services.generation_cache import (
+    CacheBackend,
+    GenerationCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    trip_fingerprint,
+)
+
+
+def make_trip(**overrides):
+    data = {
+        "destination": "Kraków",
+        "duration_days": 3,
+        "num_adults": 2,
+        "children_ages": [],
+        "accommodation": "hotel",
+        "transport": "plane",
+        "activities": ["zwiedzanie", "muzea"],
+        "season": "summer",
+        "available_luggage": [{"max_weight": 10, "dimensions": "55x40x20"}],
+    }
+    data.update(overrides)
+    return Trip(**data)
+
+
+class TestTripFingerprint:
+    def test_equivalent_trips_match(self):
+        """Test that formatting differences don't change the fingerprint."""
+        # Arrange
+        trip = make_trip()
+        same_trip = make_trip(
+            destination="  krakow ",
+            activities=["Muzea", "zwiedzanie"],
+            available_luggage=[{"maxWeight": 10.0, "dimensions": "55 x 40 x 20"}],
+        )
+
+        # Act & Assert
+        assert trip_fingerprint(trip) == trip_fingerprint(same_trip)
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"duration_days": 4},
+            {"num_adults": 1},
+            {"children_ages": [5]},
+            {"season": "winter"},
+            {"available_luggage": None},
+        ],
+    )
+    def test_prompt_relevant_fields_change_key(self, overrides):
+        """Test that any prompt-relevant difference produces a new fingerprint."""
+        assert trip_fingerprint(make_trip()) != trip_fingerprint(make_trip(**overrides))
+
+    def test_excluded_categories_change_key(self):
+        """Test that excluded categories are part of the key."""
+        trip = make_trip()
+        assert trip_fingerprint(trip) != trip_fingerprint(
+            trip, exclude_categories=["Odzież"]
+        )
+
+
+class TestMemoryCacheBackend:
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        # Arrange
+        backend = MemoryCacheBackend(ttl=60, max_entries=2, max_bytes=10_000)
+        await backend.set("a", "1")
+        await backend.set("b", "2")
+        await backend.get("a")
+
+        # Act
+        await backend.set("c", "3")
+
+        # Assert
+        assert await backend.get("a") == "1"
+        assert await backend.get("b") is None
+        assert backend.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_bound(self):
+        """Test that entries are evicted to stay under the byte limit."""
+        # Arrange
+        backend = MemoryCacheBackend(ttl=60, max_entries=100, max_bytes=20)
+
+        # Act
+        await backend.set("a", "x" * 10)
+        await backend.set("b", "y" * 10)
+        await backend.set("c", "z" * 100)
+
+        # Assert
+        assert backend.size() == (1, 11)
+        assert await backend.get("c") is None
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, mocker):
+        """Test that expired entries are not returned."""
+        # Arrange
+        clock = mocker.patch("app.services.generation_cache.time.monotonic")
+        clock.return_value = 100.0
+        backend = MemoryCacheBackend(ttl=10, max_entries=10, max_bytes=1000)
+        await backend.set("a", "1")
+
+        # Act
+        clock.return_value = 111.0
+
+        # Assert
+        assert await backend.get("a") is None
+
+
+class TestCacheBackend:
+    def test_missing_method_fails_on_construction(self):
+        """Test that a backend must implement the whole interface."""
+
+        # Arrange
+        class GetOnlyBackend(CacheBackend):
+            async def get(self, key):
+                return None
+
+        # Act & Assert
+        with pytest.raises(TypeError):
+            GetOnlyBackend()
+
+
+class TestSQLiteCacheBackend:
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, tmp_path):
+        """Test that two backends on the same file see each other's entries."""
+        # Arrange
+        path = str(tmp_path / "cache.sqlite3")
+        writer = SQLiteCacheBackend(path, ttl=60, max_entries=2)
+        reader = SQLiteCacheBackend(path, ttl=60, max_entries=2)
+
+        # Act
+        await writer.set("a", "1")
+        await writer.set("b", "2")
+        await reader.get("a")
+        await writer.set("c", "3")
+
+        # Assert
+        assert await reader.get("a") == "1"
+        assert await reader.get("b") is None
+        assert await reader.get("c") == "3"
+
+
+class TestGenerationCacheInAIService:
+    @pytest.mark.asyncio
+    async def test_second_equivalent_trip_hits_cache(self, monkeypatch, mocker):
+        """Test that an equivalent trip is served without calling OpenRouter."""
+        # Arrange
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        monkeypatch.setenv("OPENROUTER_API_ENDPOINT", "http://stub")
+        ask = mocker.patch(
+            "app.services.openrouter_service.OpenRouterService.ask",
+            new_callable=AsyncMock,
+            return_value=json.dumps(
+                [{"name": "Paszport", "quantity": 1, "category": "Dokumenty"}]
+            ),
+        )
+        cache = GenerationCache(MemoryCacheBackend(60, 10, 10_000))
+        mocker.patch("app.services.ai_service.get_generation_cache", return_value=cache)
+
+        # Act
+        first = await AIService.generate_packing_list(make_trip())
+        second = await AIService.generate_packing_list(make_trip(destination="KRAKOW"))
+
+        # Assert
+        assert first == second
+        ask.assert_awaited_once()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
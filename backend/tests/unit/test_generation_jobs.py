@@ -0,0 +1,394 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api.auth import get_current_user_id
+from app.main import app
+from app.models import GenerationJob, Trip
+from app.services.constants import JobStatus
+from app.services.generation_jobs import (
+    GenerationJobService,
+    GenerationWorkerPool,
+    JobLeaseLostError,
+)
+
+TEST_USER_ID = uuid.uuid4()
+TEST_TRIP_ID = uuid.uuid4()
+
+
+class FakeDB:
+    """Stand-in for async_db that records whether a session is open."""
+
+    def __init__(self):
+        self.session = MagicMock(execute=AsyncMock())
+        self.active = 0
+        self.opened = 0
+        self.rolled_back = []
+
+    @asynccontextmanager
+    async def _session(self):
+        self.active += 1
+        self.opened += 1
+        try:
+            yield self
+        except Exception as e:
+            self.rolled_back.append(e)
+            raise
+        finally:
+            self.active -= 1
+
+    def __call__(self, **kwargs):
+        return self._session()
+
+
+def make_job(attempts=1, **params):
+    return GenerationJob(
+        id=uuid.uuid4(),
+        user_id=TEST_USER_ID,
+        trip_id=TEST_TRIP_ID,
+        status=JobStatus.RUNNING,
+        attempts=attempts,
+        params=params,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def fake_db(mocker):
+    fake = FakeDB()
+    mocker.patch("app.services.generation_jobs.db", fake)
+    return fake
+
+
+@pytest.fixture
+def pool():
+    return GenerationWorkerPool(
+        workers=1, poll_interval=0.01, lease=60, max_attempts=3, retry_delay=10
+    )
+
+
+@pytest.fixture
+def services(mocker):
+    """Patch the trip service steps and job bookkeeping used by a worker."""
+    return SimpleNamespace(
+        get_trip=mocker.patch(
+            "app.services.trip_service.TripService.get_trip",
+            AsyncMock(return_value=Trip(id=TEST_TRIP_ID, user_id=TEST_USER_ID)),
+        ),
+        get_special_lists=mocker.patch(
+            "app.services.trip_service.TripService.get_special_lists",
+            AsyncMock(return_value=[]),
+        ),
+        generate_items=mocker.patch(
+            "app.services.trip_service.TripService.generate_items", AsyncMock()
+        ),
+        save_packing_list=mocker.patch(
+            "app.services.trip_service.TripService.save_packing_list", AsyncMock()
+        ),
+        claim_next=mocker.patch.object(GenerationJobService, "claim_next", AsyncMock()),
+        finish=mocker.patch.object(GenerationJobService, "finish", AsyncMock()),
+    )
+
+
+class TestGenerationJobService:
+    def test_claim_skips_jobs_locked_by_other_workers(self):
+        """Test that the claim locks one runnable job with SKIP LOCKED."""
+        # Act
+        sql = str(
+            GenerationJobService.claim_statement(
+                datetime.now(timezone.utc), lease=60, max_attempts=3
+            ).compile(dialect=postgresql.dialect())
+        )
+
+        # Assert
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "ORDER BY generation_jobs.created_at" in sql
+        assert "attempts=(generation_jobs.attempts + " in sql
+        assert "RETURNING" in sql
+
+    @pytest.mark.asyncio
+    async def test_finish_only_updates_the_current_run(self, fake_db):
+        """Test that a run whose lease was taken over can't record a result."""
+        # Arrange
+        job = make_job(attempts=2)
+        fake_db.session.execute.return_value = MagicMock(
+            scalar_one_or_none=MagicMock(return_value=None)
+        )
+
+        # Act
+        recorded = await GenerationJobService.finish(job, JobStatus.SUCCEEDED)
+
+        # Assert
+        assert recorded is False
+        statement = fake_db.session.execute.await_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "generation_jobs.status = %(status_1)s" in sql
+        assert "generation_jobs.attempts = %(attempts_1)s" in sql
+        assert statement.compile().params["attempts_1"] == 2
+
+    @pytest.mark.asyncio
+    async def test_resubmitted_key_returns_existing_job(self, fake_db, mocker):
+        """Test that an idempotency key already used returns the first job."""
+        # Arrange
+        existing = make_job()
+        fake_db.session.execute.return_value = MagicMock(
+            scalar_one_or_none=MagicMock(return_value=None)
+        )
+        mocker.patch(
+            "app.models.GenerationJob.select_one", AsyncMock(return_value=existing)
+        )
+
+        # Act
+        job, created = await GenerationJobService.submit(
+            TEST_TRIP_ID, TEST_USER_ID, idempotency_key="abc"
+        )
+
+        # Assert
+        assert job is existing
+        assert created is False
+        with pytest.raises(ValueError):
+            await GenerationJobService.submit(
+                uuid.uuid4(), TEST_USER_ID, idempotency_key="abc"
+            )
+
+    @pytest.mark.asyncio
+    async def test_insert_retried_when_conflicting_job_vanishes(self, fake_db, mocker):
+        """Test that the insert is retried if the job holding the key is gone."""
+        # Arrange
+        queued = make_job()
+        fake_db.session.execute.side_effect = [
+            MagicMock(scalar_one_or_none=MagicMock(return_value=None)),
+            MagicMock(scalar_one_or_none=MagicMock(return_value=queued)),
+        ]
+        mocker.patch(
+            "app.models.GenerationJob.select_one", AsyncMock(return_value=None)
+        )
+
+        # Act
+        job, created = await GenerationJobService.submit(
+            TEST_TRIP_ID, TEST_USER_ID, idempotency_key="abc"
+        )
+
+        # Assert
+        assert job is queued
+        assert created is True
+
+
+class TestGenerationWorkerPool:
+    @pytest.mark.asyncio
+    async def test_ai_call_runs_without_a_session(self, pool, fake_db, services):
+        """Test that no session is open while the AI call runs."""
+        # Arrange
+        list_id = uuid.uuid4()
+        job = make_job(exclude_categories=["Elektronika"])
+        services.claim_next.return_value = job
+        sessions_during_call = []
+        services.generate_items.side_effect = lambda *args: (
+            sessions_during_call.append(fake_db.active) or [{"name": "Paszport"}]
+        )
+        services.save_packing_list.return_value = SimpleNamespace(id=list_id)
+
+        # Act
+        ran = await pool.run_once()
+
+        # Assert
+        assert ran is True
+        assert sessions_during_call == [0]
+        assert services.generate_items.await_args.args[2] == ["Elektronika"]
+        services.finish.assert_awaited_once_with(
+            job, JobStatus.SUCCEEDED, generated_list_id=list_id
+        )
+        fake_db.session.expunge.assert_called_once_with(job)
+
+    @pytest.mark.asyncio
+    async def test_no_runnable_job(self, pool, fake_db, services):
+        """Test that an idle worker reports that nothing ran."""
+        # Arrange
+        services.claim_next.return_value = None
+
+        # Act
+        ran = await pool.run_once()
+
+        # Assert
+        assert ran is False
+        services.generate_items.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_transient_error_is_retried_later(self, pool, fake_db, services):
+        """Test that an AI failure puts the job back to pending with a delay."""
+        # Arrange
+        job = make_job(attempts=1)
+        services.claim_next.return_value = job
+        services.generate_items.side_effect = RuntimeError("timeout")
+
+        # Act
+        await pool.run_once()
+
+        # Assert
+        args, kwargs = services.finish.await_args
+        assert args == (job, JobStatus.PENDING)
+        assert kwargs["retry_at"] > datetime.now(timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_invalid_input_fails_without_retry(self, pool, fake_db, services):
+        """Test that a missing trip fails the job at once."""
+        # Arrange
+        job = make_job(attempts=1)
+        services.claim_next.return_value = job
+        services.get_trip.return_value = None
+
+        # Act
+        await pool.run_once()
+
+        # Assert
+        services.finish.assert_awaited_once_with(
+            job, JobStatus.FAILED, error="Trip not found"
+        )
+        services.generate_items.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_lease_renewed_during_ai_call(self, pool, fake_db, services, mocker):
+        """Test that a long AI call keeps extending the job's lease."""
+        # Arrange
+        pool.lease = 0.03
+        job = make_job()
+        services.claim_next.return_value = job
+
+        async def slow(*args):
+            await asyncio.sleep(0.05)
+            return [{"name": "Paszport"}]
+
+        services.generate_items.side_effect = slow
+        renew = mocker.patch.object(
+            GenerationJobService, "renew", AsyncMock(return_value=True)
+        )
+
+        # Act
+        await pool.run_once()
+
+        # Assert
+        assert renew.await_count >= 2
+        renew.assert_awaited_with(job, 0.03)
+
+    @pytest.mark.asyncio
+    async def test_result_discarded_when_lease_lost(self, pool, fake_db, services):
+        """Test that a run which lost its job rolls back instead of saving."""
+        # Arrange
+        services.claim_next.return_value = make_job()
+        services.save_packing_list.return_value = SimpleNamespace(id=uuid.uuid4())
+        services.finish.return_value = False
+
+        # Act
+        await pool.run_once()
+
+        # Assert
+        [error] = fake_db.rolled_back
+        assert isinstance(error, JobLeaseLostError)
+        services.save_packing_list.assert_awaited_once()
+        services.finish.assert_awaited_once()
+        assert pool.processed == 0
+        assert pool.failed == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_is_released(self, pool, fake_db, services):
+        """Test that stopping a worker mid-job hands the job back to the queue."""
+        # Arrange
+        services.claim_next.return_value = make_job()
+        started = asyncio.Event()
+
+        async def hang(*args):
+            started.set()
+            await asyncio.Event().wait()
+
+        services.generate_items.side_effect = hang
+        task = asyncio.create_task(pool.run_once())
+        await started.wait()
+
+        # Act
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # Assert
+        [release] = fake_db.session.execute.await_args_list
+        sql = str(release.args[0].compile(dialect=postgresql.dialect()))
+        assert "attempts=(generation_jobs.attempts - " in sql
+
+
+class TestJobEndpoints:
+    @pytest.fixture
+    def test_client(self):
+        app.dependency_overrides[get_current_user_id] = lambda: TEST_USER_ID
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_current_user_id, None)
+
+    def test_async_generation_returns_202(self, test_client, mocker):
+        """Test that async=true queues a job instead of generating inline."""
+        # Arrange
+        job = make_job()
+        mocker.patch(
+            "app.services.trip_service.TripService.get_trip",
+            AsyncMock(return_value=Trip(id=TEST_TRIP_ID, user_id=TEST_USER_ID)),
+        )
+        submit = mocker.patch.object(
+            GenerationJobService, "submit", AsyncMock(return_value=(job, True))
+        )
+        generate = mocker.patch(
+            "app.services.trip_service.TripService.generate_packing_list"
+        )
+        mock_db = mocker.patch("app.api.trips.db")
+        mock_db.session.commit = AsyncMock()
+        wake = mocker.patch("app.api.trips.generation_workers.wake")
+
+        # Act
+        response = test_client.post(
+            f"/api/trips/{TEST_TRIP_ID}/generate-list?async=true",
+            headers={"Idempotency-Key": "abc"},
+        )
+
+        # Assert
+        assert response.status_code == 202
+        assert response.json()["id"] == str(job.id)
+        assert response.headers["Location"] == f"/api/jobs/{job.id}"
+        assert submit.await_args.kwargs["idempotency_key"] == "abc"
+        mock_db.session.commit.assert_awaited_once()
+        wake.assert_called_once()
+        generate.assert_not_called()
+
+    def test_get_job_status(self, test_client, mocker):
+        """Test that the owner can poll the job status."""
+        # Arrange
+        job = make_job()
+        job.status = JobStatus.SUCCEEDED
+        job.generated_list_id = uuid.uuid4()
+        mocker.patch.object(
+            GenerationJobService, "get_job", AsyncMock(return_value=job)
+        )
+
+        # Act
+        response = test_client.get(f"/api/jobs/{job.id}")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["status"] == "succeeded"
+        assert response.json()["generatedListId"] == str(job.generated_list_id)
+
+    def test_unknown_job_returns_404(self, test_client, mocker):
+        """Test that another user's or a missing job is not found."""
+        # Arrange
+        mocker.patch.object(
+            GenerationJobService, "get_job", AsyncMock(return_value=None)
+        )
+
+        # Act
+        response = test_client.get(f"/api/jobs/{uuid.uuid4()}")
+
+        # Assert
+        assert response.status_code == 404
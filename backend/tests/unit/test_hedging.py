@@ -0,0 +1,163 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.hedging import HedgePolicy, has_items
+from app.services.openrouter_service import OpenRouterService
+
+PRIMARY = "primary-model"
+BACKUP = "backup-model"
+
+
+@pytest.fixture
+def policy():
+    return HedgePolicy(BACKUP, percentile=0.9, initial_delay=0.05, min_samples=3)
+
+
+def model_calls(answers):
+    """Build a call that answers per model after the given delay."""
+    started = []
+    cancelled = []
+
+    async def call(model):
+        started.append(model)
+        delay, answer = answers[model]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(model)
+            raise
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    return call, started, cancelled
+
+
+class TestHedgePolicy:
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, policy):
+        """Test that no backup request is sent when the primary is fast."""
+        # Arrange
+        call, started, _ = model_calls({PRIMARY: (0, "[]"), BACKUP: (0, "{}")})
+
+        # Act
+        result = await policy.run(call, PRIMARY)
+
+        # Assert
+        assert result == "[]"
+        assert started == [PRIMARY]
+        assert policy.stats()["hedge_rate"] == 0.0
+        assert policy.stats()["wins"] == {PRIMARY: 1}
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_loses_to_backup(self, policy):
+        """Test that the backup answer wins and the primary is cancelled."""
+        # Arrange
+        call, started, cancelled = model_calls(
+            {PRIMARY: (10, "[]"), BACKUP: (0, '[{"name": "Paszport"}]')}
+        )
+
+        # Act
+        result = await policy.run(call, PRIMARY)
+
+        # Assert
+        assert result == '[{"name": "Paszport"}]'
+        assert started == [PRIMARY, BACKUP]
+        assert cancelled == [PRIMARY]
+        assert policy.stats()["hedged"] == 1
+        assert policy.stats()["wins"] == {BACKUP: 1}
+
+    @pytest.mark.asyncio
+    async def test_invalid_primary_answer_is_hedged_at_once(self, policy):
+        """Test that an answer without items doesn't win and triggers the backup."""
+        # Arrange
+        policy.initial_delay = 10
+        backup = '```json\n[{"name": "Paszport"}]\n```'
+        call, started, _ = model_calls(
+            {PRIMARY: (0, "Oto lista:"), BACKUP: (0, backup)}
+        )
+
+        # Act
+        result = await policy.run(call, PRIMARY)
+
+        # Assert
+        assert result == backup
+        assert started == [PRIMARY, BACKUP]
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises(self, policy):
+        """Test that the last error is raised when no model answers."""
+        # Arrange
+        call, _, _ = model_calls(
+            {PRIMARY: (0, RuntimeError("primary")), BACKUP: (0, RuntimeError("backup"))}
+        )
+
+        # Act
+        with pytest.raises(RuntimeError, match="backup"):
+            await policy.run(call, PRIMARY)
+
+        # Assert
+        assert policy.stats()["failed"] == 1
+
+    def test_delay_follows_latency_percentile(self, policy):
+        """Test that the hedge delay is the configured latency percentile."""
+        # Arrange
+        assert policy.delay() == 0.05
+
+        # Act
+        policy._latencies.extend([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0])
+
+        # Assert
+        assert policy.delay() == 9.0
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_latency_is_not_recorded(self, policy):
+        """Test that only successful primary answers feed the hedge delay."""
+        # Arrange
+        call, _, _ = model_calls(
+            {PRIMARY: (0, RuntimeError("primary")), BACKUP: (0, "[]")}
+        )
+
+        # Act
+        await policy.run(call, PRIMARY)
+
+        # Assert
+        assert list(policy._latencies) == []
+
+    def test_has_items(self):
+        """Test which answers count as usable packing lists."""
+        assert has_items('[{"name": "Paszport"}]')
+        assert has_items('{"items": []}')
+        assert has_items('Oto lista:\n[{"name": "Paszport"},]\nMiłej podróży!')
+        assert has_items('[{"name": "Paszport"}, {"name": "Ład')
+        assert not has_items("")
+        assert not has_items("Oto lista")
+        assert not has_items(None)
+
+
+class TestOpenRouterHedging:
+    @pytest.mark.asyncio
+    async def test_ask_hedges_with_backup_model(self, policy, mocker):
+        """Test that ask() sends the same request to the backup model."""
+        # Arrange
+        send = mocker.patch.object(
+            OpenRouterService,
+            "send_request",
+            new_callable=AsyncMock,
+            side_effect=[
+                {"choices": [{"message": {"content": "nie wiem"}}]},
+                {"choices": [{"message": {"content": "[]"}}]},
+            ],
+        )
+        service = OpenRouterService("key", "http://stub", hedge=policy)
+        service.set_model_name(PRIMARY)
+
+        # Act
+        content = await service.ask()
+
+        # Assert
+        assert content == "[]"
+        assert [c.args[0] for c in send.await_args_list] == [PRIMARY, BACKUP]
+        assert service._build_request_payload(BACKUP)["model"] == BACKUP
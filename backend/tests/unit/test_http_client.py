@@ -0,0 +1,54 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services import http_client
+from app.services.openrouter_service import OpenRouterService
+
+
+def make_session(payload):
+    """Create a mock aiohttp session whose post() returns the given JSON payload."""
+    response = MagicMock()
+    response.status = 200
+    response.json = AsyncMock(return_value=payload)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    session = MagicMock()
+    session.post = MagicMock(return_value=context)
+    session.close = AsyncMock()
+    return session
+
+
+class TestHttpClient:
+    @pytest.mark.asyncio
+    async def test_start_and_close(self):
+        """Test the shared session lifecycle."""
+        # Arrange
+        assert http_client.get_http_client() is None
+
+        # Act
+        session = await http_client.start_http_client()
+
+        # Assert
+        assert http_client.get_http_client() is session
+        assert await http_client.start_http_client() is session
+        await http_client.close_http_client()
+        assert session.closed
+        assert http_client.get_http_client() is None
+
+    @pytest.mark.asyncio
+    async def test_openrouter_reuses_shared_session(self):
+        """Test that OpenRouterService sends through the injected session."""
+        # Arrange
+        session = make_session({"choices": [{"message": {"content": "[]"}}]})
+        service = OpenRouterService("key", "http://stub", session=session)
+        service.set_user_message("hello")
+
+        # Act
+        await service.send_request()
+        await service.send_request()
+
+        # Assert
+        assert session.post.call_count == 2
+        session.close.assert_not_called()
@@ -0,0 +1,121 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models import Trip
+from app.services.ai_service import AIService
+from app.services.item_schema import ITEM_LIST_RESPONSE_FORMAT, validate_items
+from app.services.openrouter_service import OpenRouterService
+
+ITEMS = [
+    {"name": "Paszport", "quantity": 1, "category": "Dokumenty", "weight": None},
+    {"name": "Skarpetki", "quantity": 3, "category": "Odzież", "weight": 0.05},
+]
+
+
+@pytest.fixture
+def openrouter_env(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setenv("OPENROUTER_API_ENDPOINT", "http://stub")
+
+
+class TestValidateItems:
+    def test_schema_response(self):
+        """Test that a structured response is validated as is."""
+        # Act
+        items = validate_items(json.dumps({"items": ITEMS}))
+
+        # Assert
+        assert items == [
+            {"name": "Paszport", "quantity": 1, "category": "Dokumenty"},
+            {"name": "Skarpetki", "quantity": 3, "category": "Odzież", "weight": 0.05},
+        ]
+
+    def test_bare_array_is_coerced(self):
+        """Test that a bare array validates and its fields are coerced."""
+        # Act
+        items = validate_items(
+            '[{"name": "Mapa", "quantity": "2", "category": "Akcesoria", '
+            '"weight": "0.1", "dimensions": "20x10x1"}]'
+        )
+
+        # Assert
+        assert items == [
+            {
+                "name": "Mapa",
+                "quantity": 2,
+                "category": "Akcesoria",
+                "weight": 0.1,
+                "dimensions": "20x10x1",
+            }
+        ]
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "```json\n[]\n```",
+            '[{"name": "Mapa", "quantity": 1, "category": "Inne"}]',
+            '[{"name": "Mapa", "category": "Akcesoria"}]',
+            '[{"name": "Mapa", "quantity": 1, "category": "Akcesoria"},',
+        ],
+        ids=["fenced", "unknown category", "missing quantity", "truncated"],
+    )
+    def test_mismatch_needs_repair(self, content):
+        """Test that responses outside the schema are left to the repair path."""
+        assert validate_items(content) is None
+
+
+class TestSchemaFormat:
+    @pytest.mark.parametrize(
+        "model, expected",
+        [
+            ("openai/gpt-4o-mini", ITEM_LIST_RESPONSE_FORMAT),
+            ("mistralai/mistral-7b-instruct:free", {"type": "json_object"}),
+        ],
+    )
+    def test_schema_only_for_supporting_models(self, model, expected, openrouter_env):
+        """Test that the schema format is only sent to models that support it."""
+        # Arrange
+        service = AIService()
+
+        # Act
+        payload = service.openrouter._build_request_payload(model)
+
+        # Assert
+        assert payload["response_format"] == expected
+
+    def test_stream_keeps_plain_format(self):
+        """Test that streamed requests don't ask for the wrapping schema object."""
+        # Arrange
+        service = OpenRouterService("key", "http://stub")
+        service.set_response_format({"type": "json_object"})
+        service.set_schema_format(ITEM_LIST_RESPONSE_FORMAT)
+
+        # Act
+        payload = service._build_request_payload("openai/gpt-4o", structured=False)
+
+        # Assert
+        assert payload["response_format"] == {"type": "json_object"}
+
+
+class TestAIServiceValidation:
+    @pytest.mark.asyncio
+    async def test_schema_response_skips_repair(self, openrouter_env, mocker):
+        """Test that a response matching the schema isn't repaired."""
+        # Arrange
+        mocker.patch(
+            "app.services.openrouter_service.OpenRouterService.ask",
+            new_callable=AsyncMock,
+            return_value=json.dumps({"items": ITEMS}),
+        )
+        parse = mocker.patch("app.services.ai_service.parse_items")
+
+        # Act
+        items = await AIService.generate_packing_list(
+            Trip(destination="Kraków", duration_days=3, num_adults=1)
+        )
+
+        # Assert
+        assert [item["name"] for item in items] == ["Paszport", "Skarpetki"]
+        parse.assert_not_called()
@@ -0,0 +1,90 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models import Trip
+from app.services.ai_service import AIService
+from app.services.json_stream import parse_items
+
+ITEMS = (
+    '{"name": "Skarpetki", "quantity": 3, "category": "Odzież"},\n'
+    '{"name": "Mapa {miasta}", "quantity": 1, "category": "Akcesoria"}'
+)
+NAMES = ["Skarpetki", "Mapa {miasta}"]
+
+
+class TestParseItems:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            f"[{ITEMS}]",
+            f"```json\n[{ITEMS}]\n```",
+            f"Oto lista:\n[{ITEMS}]\nMiłej podróży!",
+            f'{{"items": [{ITEMS}]}}',
+            "[" + ITEMS.replace('"}', '", }') + ",]",
+            "[" + ITEMS.replace("},", "}") + "]",
+            "[" + ITEMS.replace(', "category"', ' "category"') + "]",
+        ],
+        ids=[
+            "valid",
+            "fenced",
+            "prose",
+            "wrapped",
+            "trailing commas",
+            "missing comma between items",
+            "missing comma between fields",
+        ],
+    )
+    def test_recovers_all_items(self, text):
+        """Test that each kind of malformed response yields every item."""
+        # Act
+        items = parse_items(text)
+
+        # Assert
+        assert [item["name"] for item in items] == NAMES
+        assert items[0]["category"] == "Odzież"
+
+    def test_keeps_fields_of_truncated_item(self):
+        """Test that a response cut off mid-item keeps the fields read so far."""
+        # Arrange
+        text = f'```json\n[{ITEMS},\n{{"name": "Cytat \\"x\\"", "quantity": 2, "cate'
+
+        # Act
+        items = parse_items(text)
+
+        # Assert
+        assert [item["name"] for item in items] == NAMES + ['Cytat "x"']
+        assert items[2] == {"name": 'Cytat "x"', "quantity": 2}
+
+    def test_single_object(self):
+        """Test that a single object is returned as a one-item list."""
+        assert parse_items('{"name": "Paszport", "weight": 0.1}') == [
+            {"name": "Paszport", "weight": 0.1}
+        ]
+
+    @pytest.mark.parametrize("text", ["", "Nie mogę pomóc.", "[]", '["a", 1]'])
+    def test_no_items(self, text):
+        """Test that responses without objects yield no items."""
+        assert parse_items(text) == []
+
+
+class TestAIServiceParsing:
+    @pytest.mark.asyncio
+    async def test_truncated_response_keeps_complete_items(self, monkeypatch, mocker):
+        """Test that a cut-off answer is used instead of the fallback list."""
+        # Arrange
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        monkeypatch.setenv("OPENROUTER_API_ENDPOINT", "http://stub")
+        mocker.patch(
+            "app.services.openrouter_service.OpenRouterService.ask",
+            new_callable=AsyncMock,
+            return_value=f'```json\n[{ITEMS},\n{{"name": "Ład',
+        )
+
+        # Act
+        items = await AIService.generate_packing_list(
+            Trip(destination="Kraków", duration_days=3, num_adults=1)
+        )
+
+        # Assert
+        assert [item["name"] for item in items] == NAMES
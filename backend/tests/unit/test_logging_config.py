@@ -0,0 +1,146 @@
+import io
+import itertools
+import json
+import logging
+import sys
+
+import pytest
+
+from app import logging_config, settings
+from app.logging_config import (
+    JsonFormatter,
+    Preview,
+    configure_logging,
+    debug_sampled,
+    parse_levels,
+    stop_logging,
+)
+
+
+@pytest.fixture
+def restore_logging():
+    """Put back the root logger configuration changed by configure_logging."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    state = logging_config._listener, logging_config._installed
+    logging_config._listener = logging_config._installed = None
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    logging_config._listener, logging_config._installed = state
+
+
+def make_record(msg, *args, **extra):
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+    def test_record_with_extra_fields(self):
+        """Test that records become one JSON object including extra fields."""
+        # Act
+        line = JsonFormatter().format(make_record("Trip %s", "Kraków", trip_id=7))
+
+        # Assert
+        entry = json.loads(line)
+        assert entry["message"] == "Trip Kraków"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "app.test"
+        assert entry["trip_id"] == 7
+        assert "args" not in entry
+
+    def test_exception_is_included(self):
+        """Test that the traceback is part of the JSON object."""
+        # Arrange
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record("Failed")
+            record.exc_info = sys.exc_info()
+
+        # Act
+        entry = json.loads(JsonFormatter().format(record))
+
+        # Assert
+        assert "ValueError: boom" in entry["exc_info"]
+
+
+class TestPreview:
+    def test_truncates_long_values(self):
+        """Test that long values are cut and their length is shown."""
+        assert str(Preview("x" * 250, limit=10)) == "xxxxxxxxxx... (250 characters)"
+        assert str(Preview({"a": 1})) == "{'a': 1}"
+
+    def test_not_formatted_when_level_is_disabled(self):
+        """Test that a preview of a disabled record is never formatted."""
+
+        # Arrange
+        class Payload:
+            formatted = 0
+
+            def __str__(self):
+                Payload.formatted += 1
+                return "payload"
+
+        logger = logging.getLogger("app.test.preview")
+        logger.setLevel(logging.INFO)
+
+        # Act
+        logger.debug("Payload: %s", Preview(Payload()))
+
+        # Assert
+        assert Payload.formatted == 0
+
+
+class TestSampling:
+    def test_debug_sampled_keeps_one_in_n(self, monkeypatch, caplog):
+        """Test that only one in LOG_SAMPLE_EVERY calls is logged."""
+        # Arrange
+        monkeypatch.setattr(settings, "LOG_SAMPLE_EVERY", 3)
+        monkeypatch.setattr(logging_config, "_sample_counter", itertools.count())
+        logger = logging.getLogger("app.test.sampled")
+        caplog.set_level(logging.DEBUG, logger="app.test.sampled")
+
+        # Act
+        for i in range(7):
+            debug_sampled(logger, "Item %d", i)
+
+        # Assert
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages == ["Item 0", "Item 3", "Item 6"]
+        assert all(r.sampled for r in caplog.records)
+        assert caplog.records[0].funcName == "test_debug_sampled_keeps_one_in_n"
+
+
+class TestConfigureLogging:
+    def test_parse_levels(self):
+        """Test that per-logger levels are read from the setting."""
+        assert parse_levels(" app.services=debug, sqlalchemy.engine=WARNING ,x") == {
+            "app.services": "DEBUG",
+            "sqlalchemy.engine": "WARNING",
+        }
+
+    def test_queued_records_are_written_by_listener(self, monkeypatch, restore_logging):
+        """Test that records go through the queue and come out as JSON lines."""
+        # Arrange
+        monkeypatch.setattr(settings, "LOG_QUEUE", True)
+        monkeypatch.setattr(settings, "LOG_FORMAT", "json")
+        monkeypatch.setattr(settings, "LOG_LEVEL", "WARNING")
+        monkeypatch.setattr(settings, "LOG_LEVELS", "app.test.queued=DEBUG")
+        stream = io.StringIO()
+        configure_logging(stream)
+
+        # Act
+        logging.getLogger("app.test.queued").debug("Payload: %s", Preview("x" * 300))
+        logging.getLogger("app.test.other").info("Not logged")
+        stop_logging()
+        logging.getLogger("app.test.queued").setLevel(logging.NOTSET)
+
+        # Assert
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 1
+        entry = json.loads(lines[0])
+        assert entry["logger"] == "app.test.queued"
+        assert entry["message"].endswith("... (300 characters)")
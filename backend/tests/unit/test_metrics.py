@@ -0,0 +1,209 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import metrics
+from app.database import TimedQueuePool
+from app.main import app
+from app.metrics import (
+    AI_ITEMS_RECOVERED,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_STATEMENT_SECONDS,
+    EXECUTOR_TASK_SECONDS,
+    OPENROUTER_REQUEST_SECONDS,
+    OPENROUTER_RETRIES,
+    Counter,
+    Histogram,
+)
+from app.models import Trip
+from app.services.ai_service import AIService
+from app.services.openrouter_service import OpenRouterHTTPError, OpenRouterService
+from app.services.password_executor import BoundedExecutor
+from app.services.rate_limiter import UpstreamLimiter
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative_when_rendered(self):
+        """Test that observations land in the first bucket that holds them."""
+        # Arrange
+        histogram = Histogram("t", "Test", ("route",), buckets=(0.1, 1.0))
+
+        # Act
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "/a")
+
+        # Assert
+        assert list(histogram.lines()) == [
+            't_bucket{route="/a",le="0.1"} 2',
+            't_bucket{route="/a",le="1.0"} 3',
+            't_bucket{route="/a",le="+Inf"} 4',
+            't_sum{route="/a"} 3.65',
+            't_count{route="/a"} 4',
+        ]
+        assert histogram.count("/a") == 4
+        assert histogram.count("/b") == 0
+
+
+class TestRender:
+    def test_text_format(self, monkeypatch):
+        """Test the exposition format, including label escaping."""
+        # Arrange
+        counter = Counter("test_total", "Test counter", ("path",))
+        monkeypatch.setattr(metrics, "_metrics", [counter])
+        monkeypatch.setattr(metrics, "_stats_sources", {})
+        counter.inc('a"b\\c')
+        counter.inc('a"b\\c', amount=2)
+
+        # Act
+        output = metrics.render()
+
+        # Assert
+        assert output == (
+            "# HELP test_total Test counter\n"
+            "# TYPE test_total counter\n"
+            'test_total{path="a\\"b\\\\c"} 3\n'
+        )
+
+    def test_component_stats_become_gauges(self, monkeypatch):
+        """Test that numeric stats are rendered and disabled components skipped."""
+        # Arrange
+        component = SimpleNamespace(
+            stats=lambda: {"hits": 3, "hit_ratio": 0.75, "state": "closed"}
+        )
+        monkeypatch.setattr(metrics, "_metrics", [])
+        monkeypatch.setattr(metrics, "_stats_sources", {})
+        metrics.register_stats("cache", lambda: component)
+        metrics.register_stats("hedge", lambda: None)
+
+        # Act
+        output = metrics.render()
+
+        # Assert
+        assert output == (
+            "# TYPE cache_hits gauge\ncache_hits 3\n"
+            "# TYPE cache_hit_ratio gauge\ncache_hit_ratio 0.75\n"
+        )
+
+
+class TestMetricsEndpoint:
+    def test_requests_are_recorded_by_route_template(self):
+        """Test that request latency is labelled by route template and status."""
+        # Arrange
+        client = TestClient(app)
+        client.get("/api/nothing-here/123")
+        client.get("/metrics")
+
+        # Act
+        response = client.get("/metrics")
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/metrics",'
+            'status="200"} 1\n'
+        ) in response.text
+        assert 'route="unmatched",status="404"' in response.text
+        assert "principal_cache_hits 0\n" in response.text
+        assert "db_pool_checked_out 0\n" in response.text
+        assert "db_read_pool_" not in response.text
+
+
+class TestInstrumentation:
+    @pytest.mark.asyncio
+    async def test_crud_statement_is_timed(self, mocker):
+        """Test that CrudMixin methods record their time by method and model."""
+        # Arrange
+        db = mocker.patch("app.crud.db")
+        db.session.execute = AsyncMock(return_value=MagicMock())
+
+        # Act
+        await Trip.select(user_id=1)
+
+        # Assert
+        assert DB_STATEMENT_SECONDS.count("select", "Trip") == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_checkout_is_timed(self):
+        """Test that each connection checkout records its wait."""
+        # Arrange
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:", poolclass=TimedQueuePool
+        )
+
+        # Act
+        for _ in range(2):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+        # Assert
+        assert DB_POOL_CHECKOUT_SECONDS.count() == 2
+
+    @pytest.mark.asyncio
+    async def test_openrouter_attempts_and_retries(self, mocker):
+        """Test that every attempt is recorded with its status and retries counted."""
+        # Arrange
+        mocker.patch(
+            "app.services.openrouter_service.OpenRouterService._post",
+            new_callable=AsyncMock,
+            side_effect=[OpenRouterHTTPError(502, "bad gateway"), {"choices": []}],
+        )
+        unlimited = UpstreamLimiter(
+            max_concurrency=0, requests_per_second=0, tokens_per_minute=0, max_wait=0
+        )
+        service = OpenRouterService(
+            "key", "http://stub", session=MagicMock(), limiter=unlimited
+        )
+        service.set_model_name("test/model")
+        service._backoff_factor = 0
+
+        # Act
+        await service.send_request()
+
+        # Assert
+        assert OPENROUTER_REQUEST_SECONDS.count("test/model", "502") == 1
+        assert OPENROUTER_REQUEST_SECONDS.count("test/model", "200") == 1
+        assert OPENROUTER_RETRIES.value("test/model") == 1
+
+    @pytest.mark.asyncio
+    async def test_executor_task_time(self):
+        """Test that the time a worker spends on a task is recorded by task name."""
+        # Arrange
+        executor = BoundedExecutor(max_workers=1, max_queue=1, name="test")
+
+        def hash_password() -> str:
+            return "hashed"
+
+        # Act
+        await executor.run(hash_password)
+        executor.shutdown()
+
+        # Assert
+        assert EXECUTOR_TASK_SECONDS.count("test", "hash_password") == 1
+
+    @pytest.mark.asyncio
+    async def test_repaired_items_are_counted(self, mocker, monkeypatch):
+        """Test that items recovered by the repair path are recorded."""
+        # Arrange
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        monkeypatch.setenv("OPENROUTER_API_ENDPOINT", "http://stub")
+        mocker.patch(
+            "app.services.openrouter_service.OpenRouterService.ask",
+            new_callable=AsyncMock,
+            return_value='```json\n[{"name": "Mapa", "quantity": 1, '
+            '"category": "Akcesoria"},]\n```',
+        )
+
+        # Act
+        await AIService.generate_packing_list(
+            Trip(destination="Kraków", duration_days=3, num_adults=1)
+        )
+
+        # Assert
+        assert AI_ITEMS_RECOVERED.count("repair") == 1
+        assert AI_ITEMS_RECOVERED.sum("repair") == 1
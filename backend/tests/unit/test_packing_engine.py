@@ -0,0 +1,162 @@
+import random
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.auth import get_current_user_id
+from app.main import app
+from app.services.packing_engine import pack_items
+
+TEST_USER_ID = uuid.uuid4()
+LUGGAGE = [
+    {"max_weight": 23, "dimensions": "75x50x30"},
+    {"max_weight": 10, "dimensions": "55x40x20"},
+    {"max_weight": 8, "dimensions": "40x30x20"},
+    {"maxWeight": 5, "dimensions": "35x25x15"},
+]
+
+
+def make_item(weight=None, dimensions=None, quantity=1):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        quantity=quantity,
+        item_weight=weight,
+        item_dimensions=dimensions,
+    )
+
+
+class TestPackItems:
+    def test_rotated_item_fits(self):
+        """Test that an item fits a bag in any orientation."""
+        # Arrange
+        item = make_item(dimensions="20x50x10")
+
+        # Act
+        plan = pack_items([item], [{"dimensions": "55x40x20"}])
+
+        # Assert
+        assert plan.bags[0].item_ids == [item.id]
+        assert plan.overflow == []
+
+    def test_oversized_and_overweight_items_overflow(self):
+        """Test that items exceeding every bag are returned as overflow."""
+        # Arrange
+        too_long = make_item(dimensions="120x10x10")
+        too_heavy = make_item(weight=3, quantity=4)
+        fits = make_item(weight=1, dimensions="10x10x10")
+
+        # Act
+        plan = pack_items(
+            [too_long, too_heavy, fits], {"max_weight": 10, "dimensions": "55x40x20"}
+        )
+
+        # Assert
+        assert plan.bags[0].item_ids == [fits.id]
+        assert plan.bags[0].total_weight == 1
+        assert set(plan.overflow) == {too_long.id, too_heavy.id}
+
+    def test_local_search_packs_what_first_fit_leaves_out(self):
+        """Test that moving a packed item makes room for an overflow item."""
+        # Arrange
+        # First fit puts the heavier item into the big bag, where the bulky
+        # one then no longer fits; moving it to the small bag makes room
+        heavy = make_item(weight=6, dimensions="10x10x10")
+        bulky = make_item(weight=5, dimensions="50x30x10")
+        luggage = [
+            {"max_weight": 10, "dimensions": "60x40x20"},
+            {"max_weight": 6, "dimensions": "20x20x20"},
+        ]
+
+        # Act
+        plan = pack_items([heavy, bulky], luggage)
+
+        # Assert
+        assert plan.overflow == []
+        assert plan.bags[0].item_ids == [bulky.id]
+        assert plan.bags[1].item_ids == [heavy.id]
+
+    def test_requires_luggage(self):
+        """Test that a trip without luggage can't be planned."""
+        with pytest.raises(ValueError):
+            pack_items([make_item(weight=1)], None)
+
+    def test_solves_large_trip_quickly(self):
+        """Test that 200 items and 4 bags are packed well under 50 ms."""
+        # Arrange
+        rng = random.Random(7)
+        items = [
+            make_item(
+                weight=round(rng.uniform(0.02, 2.5), 3),
+                dimensions=f"{rng.randint(2, 30)}x{rng.randint(2, 25)}x"
+                f"{rng.randint(1, 10)}",
+                quantity=rng.randint(1, 3),
+            )
+            for _ in range(200)
+        ]
+        pack_items(items, LUGGAGE)
+
+        # Act
+        start = time.perf_counter()
+        plan = pack_items(items, LUGGAGE)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert elapsed < 0.05
+        packed = sum(len(bag.item_ids) for bag in plan.bags)
+        assert packed + len(plan.overflow) == 200
+        for bag in plan.bags:
+            assert bag.total_weight <= bag.max_weight
+            assert bag.total_volume <= bag.volume
+
+
+class TestPackingPlanEndpoint:
+    @pytest.fixture
+    def test_client(self):
+        app.dependency_overrides[get_current_user_id] = lambda: TEST_USER_ID
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_current_user_id, None)
+
+    def test_returns_allocation_and_overflow(self, test_client, mocker):
+        """Test that the endpoint packs the list into the trip's luggage."""
+        # Arrange
+        small, large = make_item(weight=1), make_item(weight=30)
+        mock_db = mocker.patch("app.api.generated_lists.db")
+        mock_db.session.execute = AsyncMock(
+            return_value=MagicMock(
+                first=MagicMock(
+                    return_value=SimpleNamespace(available_luggage=LUGGAGE[:1])
+                )
+            )
+        )
+        mocker.patch(
+            "app.models.GeneratedListItem.select",
+            AsyncMock(return_value=[small, large]),
+        )
+
+        # Act
+        response = test_client.get(f"/api/generated-lists/{uuid.uuid4()}/packing-plan")
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["bags"][0]["itemIds"] == [str(small.id)]
+        assert data["bags"][0]["maxWeight"] == 23
+        assert data["overflow"] == [str(large.id)]
+
+    def test_missing_list_returns_404(self, test_client, mocker):
+        """Test that another user's or a missing list is not found."""
+        # Arrange
+        mock_db = mocker.patch("app.api.generated_lists.db")
+        mock_db.session.execute = AsyncMock(
+            return_value=MagicMock(first=MagicMock(return_value=None))
+        )
+
+        # Act
+        response = test_client.get(f"/api/generated-lists/{uuid.uuid4()}/packing-plan")
+
+        # Assert
+        assert response.status_code == 404
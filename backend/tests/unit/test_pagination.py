@@ -0,0 +1,153 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models import Trip
+from app.pagination import after_cursor, decode_cursor, encode_cursor
+from app.services.trip_service import TripService
+
+TEST_USER_ID = uuid.uuid4()
+NOW = datetime(2026, 6, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+def make_trips(count):
+    return [
+        Trip(
+            id=uuid.uuid4(),
+            user_id=TEST_USER_ID,
+            destination=f"Miasto {i}",
+            duration_days=3,
+            created_at=NOW - timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def session(mocker):
+    """Replace the request session used by CrudMixin and TripService."""
+    session = MagicMock()
+    mocker.patch("app.crud.db").session = session
+    mocker.patch("app.services.trip_service.db").session = session
+    return session
+
+
+def returning(session, objs):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = objs
+    session.execute = AsyncMock(return_value=result)
+
+
+class TestCursor:
+    def test_round_trip(self):
+        """Test that a cursor decodes to the position it was built from."""
+        list_id = uuid.uuid4()
+        assert decode_cursor(encode_cursor(NOW, list_id)) == (NOW, list_id)
+
+    @pytest.mark.parametrize("cursor", ["nonsense", "bm9uc2Vuc2U", "!!!"])
+    def test_invalid_cursor(self, cursor):
+        """Test that a tampered cursor is rejected with ValueError."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+    def test_after_cursor_matches_index_order(self):
+        """Test that the condition continues a created_at DESC, id ASC scan."""
+        cursor = encode_cursor(NOW, uuid.uuid4())
+
+        sql = compile_sql(after_cursor(Trip.created_at, Trip.id, cursor))
+
+        assert sql == (
+            "trips.created_at < %(created_at_1)s OR "
+            "trips.created_at = %(created_at_2)s AND trips.id > %(id_1)s::UUID"
+        )
+
+
+class TestSelectPage:
+    @pytest.mark.asyncio
+    async def test_returns_next_cursor_when_more_rows(self, session):
+        """Test that one extra row is fetched to detect the next page."""
+        # Arrange
+        trips = make_trips(3)
+        returning(session, trips)
+
+        # Act
+        page, next_cursor = await Trip.select_page(
+            Trip.user_id == TEST_USER_ID, limit=2
+        )
+
+        # Assert
+        assert page == trips[:2]
+        assert decode_cursor(next_cursor) == (trips[1].created_at, trips[1].id)
+        sql = compile_sql(session.execute.await_args.args[0])
+        assert "ORDER BY trips.created_at DESC, trips.id" in sql
+        assert "LIMIT" in sql and "OFFSET" not in sql
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, session):
+        """Test that the last page doesn't return a cursor."""
+        returning(session, make_trips(1))
+
+        page, next_cursor = await Trip.select_page(
+            limit=2, cursor=encode_cursor(NOW, uuid.uuid4())
+        )
+
+        assert len(page) == 1
+        assert next_cursor is None
+        assert "trips.created_at <" in compile_sql(session.execute.await_args.args[0])
+
+
+class TestListTrips:
+    @pytest.mark.asyncio
+    async def test_offset_page_is_limited_in_sql(self, session):
+        """Test that limit/offset are applied by the query, not ignored."""
+        # Arrange
+        trips = make_trips(2)
+        returning(session, trips)
+        session.scalar = AsyncMock(return_value=5)
+
+        # Act
+        result, total, next_cursor = await TripService.list_trips(
+            TEST_USER_ID, limit=2, offset=2
+        )
+
+        # Assert
+        assert result == trips
+        assert total == 5
+        assert decode_cursor(next_cursor) == (trips[1].created_at, trips[1].id)
+        sql = compile_sql(session.execute.await_args.args[0])
+        assert "LIMIT" in sql and "OFFSET" in sql
+
+    @pytest.mark.asyncio
+    async def test_cursor_page_skips_count(self, session):
+        """Test that a cursor page uses keyset pagination without a total."""
+        # Arrange
+        returning(session, make_trips(2))
+        session.scalar = AsyncMock()
+
+        # Act
+        result, total, next_cursor = await TripService.list_trips(
+            TEST_USER_ID, limit=2, cursor=encode_cursor(NOW, uuid.uuid4())
+        )
+
+        # Assert
+        assert len(result) == 2
+        assert total is None
+        assert next_cursor is None
+        session.scalar.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_cursor_with_sort_rejected(self):
+        """Test that a cursor can't be combined with a custom order."""
+        with pytest.raises(ValueError):
+            await TripService.list_trips(
+                TEST_USER_ID,
+                sort="destination",
+                cursor=encode_cursor(NOW, uuid.uuid4()),
+            )
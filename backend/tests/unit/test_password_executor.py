@@ -0,0 +1,72 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.password_executor import BoundedExecutor, ExecutorBusyError
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor(max_workers=1, max_queue=1, name="test")
+    yield executor
+    executor.shutdown()
+
+
+class TestBoundedExecutor:
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop_thread(self, executor):
+        """Test that work runs in a pool thread, not the loop thread."""
+        # Act
+        thread_name = await executor.run(lambda: threading.current_thread().name)
+
+        # Assert
+        assert thread_name.startswith("test")
+        assert executor.stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self, executor):
+        """Test that tasks beyond workers + queue limit are rejected."""
+        # Arrange
+        release = threading.Event()
+        running = executor.run(release.wait)
+        queued = executor.run(lambda: True)
+        tasks = [asyncio.ensure_future(running), asyncio.ensure_future(queued)]
+        await asyncio.sleep(0)
+
+        # Act
+        with pytest.raises(ExecutorBusyError):
+            await executor.run(lambda: True)
+        depth = executor.queue_depth
+        release.set()
+        await asyncio.gather(*tasks)
+
+        # Assert
+        assert depth == 1
+        assert executor.stats()["rejected"] == 1
+        assert executor.stats()["completed"] == 2
+        assert executor.stats()["in_flight"] == 0
+
+
+class TestExecutorBusyResponse:
+    def test_login_rejected_with_retry_after(self, mocker):
+        """Test that a saturated password executor surfaces as 503."""
+        # Arrange
+        mocker.patch(
+            "app.services.auth_service.AuthService.authenticate",
+            AsyncMock(side_effect=ExecutorBusyError("Server is busy")),
+        )
+
+        # Act
+        response = TestClient(app).post(
+            "/api/auth/login",
+            json={"username": "test@example.com", "password": "StrongPass123"},
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
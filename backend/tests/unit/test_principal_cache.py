@@ -0,0 +1,139 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.middleware.auth import get_current_claims, get_current_user
+from app.models import User
+from app.services.auth_service import AuthService
+from app.services.principal_cache import PrincipalCache
+
+TEST_USER_ID = uuid.uuid4()
+TEST_EMAIL = "test@example.com"
+
+
+def make_user(user_id=TEST_USER_ID):
+    return User(
+        id=user_id,
+        email=TEST_EMAIL,
+        first_name="Test",
+        hashed_password="$2b$12$hash",
+        is_admin=False,
+    )
+
+
+@pytest.fixture
+def token(monkeypatch):
+    monkeypatch.setattr("app.services.auth_service.JWT_SECRET_KEY", "test_secret")
+    return AuthService.create_access_token(
+        {"sub": str(TEST_USER_ID), "email": TEST_EMAIL}
+    )
+
+
+class TestPrincipalCache:
+    def test_hit_returns_detached_copy_without_password(self):
+        """Test that a hit builds a new transient User from the snapshot."""
+        # Arrange
+        cache = PrincipalCache(ttl=60, max_entries=10)
+        user = make_user()
+        cache.set(user)
+
+        # Act
+        cached = cache.get(TEST_USER_ID)
+
+        # Assert
+        assert cached is not user
+        assert cached.id == TEST_USER_ID
+        assert cached.email == TEST_EMAIL
+        assert cached.hashed_password is None
+        assert cache.stats()["hits"] == 1
+
+    def test_bounded_size(self):
+        """Test that the least recently used user is evicted."""
+        # Arrange
+        cache = PrincipalCache(ttl=60, max_entries=2)
+        first, second, third = (make_user(uuid.uuid4()) for _ in range(3))
+        cache.set(first)
+        cache.set(second)
+        cache.get(first.id)
+
+        # Act
+        cache.set(third)
+
+        # Assert
+        assert cache.get(second.id) is None
+        assert cache.get(first.id) is not None
+        assert cache.evictions == 1
+
+    def test_ttl_expiry(self, mocker):
+        """Test that entries older than the TTL are not returned."""
+        # Arrange
+        clock = mocker.patch("app.services.principal_cache.time.monotonic")
+        clock.return_value = 100.0
+        cache = PrincipalCache(ttl=30, max_entries=10)
+        cache.set(make_user())
+
+        # Act
+        clock.return_value = 131.0
+
+        # Assert
+        assert cache.get(TEST_USER_ID) is None
+
+
+class TestAuthDependencies:
+    @pytest.mark.asyncio
+    async def test_second_request_skips_database(self, token, mocker):
+        """Test that get_current_user loads the user once within the TTL."""
+        # Arrange
+        user_get = mocker.patch(
+            "app.models.User.get", new_callable=AsyncMock, return_value=make_user()
+        )
+
+        # Act
+        first = await get_current_user(token)
+        second = await get_current_user(token)
+
+        # Assert
+        user_get.assert_awaited_once()
+        assert first.id == second.id == TEST_USER_ID
+
+    @pytest.mark.asyncio
+    async def test_logout_invalidates(self, token, mocker):
+        """Test that logging out forces the next request to reload the user."""
+        # Arrange
+        user_get = mocker.patch(
+            "app.models.User.get", new_callable=AsyncMock, return_value=make_user()
+        )
+        mocker.patch(
+            "app.services.user_service.UserService.delete_session",
+            new_callable=AsyncMock,
+        )
+        await get_current_user(token)
+
+        # Act
+        await AuthService.logout(TEST_USER_ID)
+        await get_current_user(token)
+
+        # Assert
+        assert user_get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_claims_dependency_needs_no_database(self, token, mocker):
+        """Test that the claims-only dependency never loads the user."""
+        # Arrange
+        user_get = mocker.patch("app.models.User.get", new_callable=AsyncMock)
+
+        # Act
+        claims = await get_current_claims(token)
+
+        # Assert
+        assert claims.user_id == TEST_USER_ID
+        user_get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_claims_dependency_rejects_invalid_token(self, token):
+        """Test that an invalid token is rejected with 401."""
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_claims(token + "x")
+        assert exc_info.value.status_code == 401
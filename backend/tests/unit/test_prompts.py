@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import Trip
+from app.services import generation_cache
+from app.services.generation_cache import trip_fingerprint
+from app.services.prompts import (
+    PROMPT_HASH,
+    PromptTemplate,
+    TripPromptView,
+    render_user_prompt,
+)
+
+
+def make_trip(**overrides):
+    fields = dict(
+        destination="Kraków {centrum}",
+        duration_days=3,
+        num_adults=2,
+        children_ages=[4],
+        activities=["zwiedzanie", "rower"],
+        season="lato",
+    )
+    fields.update(overrides)
+    return Trip(**fields)
+
+
+class TestPromptTemplate:
+    def test_render_inserts_values_verbatim(self):
+        """Test that values are inserted as is and escaped braces are literal."""
+        # Arrange
+        template = PromptTemplate('Cel: {destination}, np. {{"name": "x"}}')
+
+        # Act
+        text = template.render({"destination": "Kraków {centrum}"})
+
+        # Assert
+        assert text == 'Cel: Kraków {centrum}, np. {"name": "x"}'
+
+    def test_format_spec_is_rejected(self):
+        """Test that fields with a format spec are rejected at compile time."""
+        with pytest.raises(ValueError):
+            PromptTemplate("{weight:.1f}")
+
+
+class TestUserPrompt:
+    def test_trip_fields_are_rendered(self):
+        """Test that the trip fields appear in the prompt without escaping."""
+        # Act
+        prompt = render_user_prompt(make_trip())
+
+        # Assert
+        assert "- Cel podróży: Kraków {centrum}\n" in prompt
+        assert "- Wiek dzieci: [4] " in prompt
+        assert "- Aktywności: zwiedzanie, rower " in prompt
+        assert "- Zakwaterowanie: Not specified " in prompt
+        assert '`{"name": "Pasta do zębów"' in prompt
+        assert "Ograniczenia bagażowe" not in prompt
+
+    def test_luggage_section(self):
+        """Test that luggage limits are listed for dicts and objects alike."""
+        # Arrange
+        trip = make_trip(
+            available_luggage=[
+                {"maxWeight": 20, "dimensions": "55x40x20"},
+                SimpleNamespace(max_weight=None, dimensions="40x30x15"),
+            ]
+        )
+
+        # Act
+        view = TripPromptView.from_trip(trip)
+
+        # Assert
+        assert view.luggage == (
+            "\nOgraniczenia bagażowe:\n"
+            "- Maksymalna waga: 20 kg\n"
+            "- Wymiary: 55x40x20\n"
+            "- Wymiary: 40x30x15\n"
+        )
+        assert render_user_prompt(trip).endswith(view.luggage)
+
+
+class TestPromptHash:
+    def test_hash_is_part_of_fingerprint(self, monkeypatch):
+        """Test that a prompt change gives trips a new cache key."""
+        # Arrange
+        trip = make_trip()
+        before = trip_fingerprint(trip)
+
+        # Act
+        monkeypatch.setattr(generation_cache, "PROMPT_HASH", "0" * 64)
+
+        # Assert
+        assert len(PROMPT_HASH) == 64
+        assert trip_fingerprint(trip) != before
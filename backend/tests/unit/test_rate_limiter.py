@@ -0,0 +1,189 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.openrouter_service import OpenRouterService
+from app.services.rate_limiter import (
+    RateLimitTimeoutError,
+    TokenBucket,
+    UpstreamLimiter,
+    parse_retry_after,
+)
+
+
+def make_limiter(**overrides):
+    options = {
+        "max_concurrency": 0,
+        "requests_per_second": 0,
+        "tokens_per_minute": 0,
+        "max_wait": 1,
+        **overrides,
+    }
+    return UpstreamLimiter(**options)
+
+
+def make_response(status, payload=None, headers=None):
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.json = AsyncMock(return_value=payload)
+    response.text = AsyncMock(return_value="rate limited")
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return context
+
+
+class TestTokenBucket:
+    def test_waits_for_refill_after_burst(self):
+        """Test that reservations beyond the capacity wait for the refill."""
+        # Arrange
+        now = [0.0]
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+
+        # Act
+        delays = []
+        for _ in range(4):
+            delays.append(bucket.delay(1))
+            bucket.take(1)
+        now[0] = 1.5
+        refilled = bucket.delay(1)
+
+        # Assert
+        assert delays == [0.0, 0.0, 0.5, 1.0]
+        assert refilled == 0.0
+
+
+class TestParseRetryAfter:
+    def test_seconds_and_dates(self):
+        """Test that both forms of the header are understood."""
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestUpstreamLimiter:
+    @pytest.mark.asyncio
+    async def test_caps_requests_in_flight(self):
+        """Test that callers over the concurrency limit wait for a free slot."""
+        # Arrange
+        limiter = make_limiter(max_concurrency=2)
+        running = 0
+        peak = 0
+
+        async def call():
+            nonlocal running, peak
+            async with limiter.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        # Act
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        # Assert
+        assert peak == 2
+        assert limiter.stats()["acquired"] == 6
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.stats()["wait_seconds_max"] > 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_after_bounded_wait(self):
+        """Test that a caller waiting longer than max_wait is rejected."""
+        # Arrange
+        limiter = make_limiter(max_concurrency=1, max_wait=0.01)
+        await limiter.acquire()
+
+        # Act
+        with pytest.raises(RateLimitTimeoutError):
+            await limiter.acquire()
+
+        # Assert
+        assert limiter.stats()["rejected"] == 1
+        assert limiter.stats()["queue_depth"] == 0
+        limiter.release()
+        await limiter.acquire()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_over_the_wait_is_rejected(self):
+        """Test that a caller isn't queued when the rate allows it too late."""
+        # Arrange
+        limiter = make_limiter(tokens_per_minute=600, max_wait=0.5)
+
+        # Act
+        async with limiter.slot(tokens=600):
+            pass
+
+        # Assert
+        with pytest.raises(RateLimitTimeoutError):
+            await limiter.acquire(tokens=100)
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_all_callers(self, mocker):
+        """Test that a deferral delays the next request by the given time."""
+        # Arrange
+        limiter = make_limiter(max_wait=10)
+        sleep = mocker.patch(
+            "app.services.rate_limiter.asyncio.sleep", new_callable=AsyncMock
+        )
+
+        # Act
+        limiter.defer(5)
+        await limiter.acquire()
+
+        # Assert
+        assert sleep.await_args.args[0] == pytest.approx(5, abs=0.1)
+        assert limiter.stats()["throttled"] == 1
+
+
+class TestOpenRouterThrottling:
+    @pytest.mark.asyncio
+    async def test_429_is_retried_after_retry_after(self, mocker):
+        """Test that a 429 is retried no sooner than upstream asked."""
+        # Arrange
+        limiter = make_limiter(max_wait=10)
+        defer = mocker.spy(limiter, "defer")
+        session = MagicMock()
+        session.post = MagicMock(
+            side_effect=[
+                make_response(429, headers={"Retry-After": "3"}),
+                make_response(200, {"choices": [], "usage": {"total_tokens": 10}}),
+            ]
+        )
+        sleep = mocker.patch(
+            "app.services.openrouter_service.asyncio.sleep", new_callable=AsyncMock
+        )
+        service = OpenRouterService(
+            "key", "http://stub", session=session, limiter=limiter
+        )
+        service.set_user_message("hello")
+
+        # Act
+        data = await service.send_request()
+
+        # Assert
+        assert data == {"choices": [], "usage": {"total_tokens": 10}}
+        defer.assert_called_once_with(3.0)
+        assert sleep.await_args_list[0].args == (3.0,)
+        assert limiter.stats()["acquired"] == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_is_not_retried(self):
+        """Test that a rejected caller fails at once without calling upstream."""
+        # Arrange
+        limiter = make_limiter(max_concurrency=1, max_wait=0.01)
+        await limiter.acquire()
+        session = MagicMock()
+        service = OpenRouterService(
+            "key", "http://stub", session=session, limiter=limiter
+        )
+
+        # Act
+        with pytest.raises(RateLimitTimeoutError):
+            await service.send_request()
+
+        # Assert
+        session.post.assert_not_called()
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent callers with the same key run the work once."""
+        # Arrange
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return [{"name": "Paszport"}]
+
+        # Act
+        callers = [asyncio.create_task(flight.do("trip", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers)
+
+        # Assert
+        assert calls == 1
+        assert all(result == [{"name": "Paszport"}] for result in results)
+        assert flight.stats() == {"executions": 1, "coalesced": 4, "inflight": 0}
+
+    @pytest.mark.asyncio
+    async def test_key_released_after_completion(self):
+        """Test that a call after completion starts a new execution."""
+        # Arrange
+        flight = SingleFlight()
+
+        async def work():
+            return 1
+
+        # Act
+        await flight.do("trip", work)
+        await flight.do("trip", work)
+
+        # Assert
+        assert flight.executions == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self):
+        """Test that all waiting callers receive the same error."""
+        # Arrange
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0)
+            raise ValueError("upstream failed")
+
+        # Act
+        results = await asyncio.gather(
+            flight.do("trip", work), flight.do("trip", work), return_exceptions=True
+        )
+
+        # Assert
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that a disconnecting caller leaves the shared work running."""
+        # Arrange
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("trip", work))
+        second = asyncio.create_task(flight.do("trip", work))
+        await asyncio.sleep(0)
+
+        # Act
+        first.cancel()
+        release.set()
+
+        # Assert
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
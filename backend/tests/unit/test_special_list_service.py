@@ -0,0 +1,144 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models import (
+    Base,
+    Item,
+    SpecialList,
+    SpecialListItem,
+    Tag,
+    User,
+    special_list_tags_table,
+)
+from app.pagination import encode_cursor
+from app.services.special_list_service import SpecialListService
+
+OWNER_ID = uuid.uuid4()
+OTHER_USER_ID = uuid.uuid4()
+
+TABLES = [
+    User.__table__,
+    Item.__table__,
+    Tag.__table__,
+    SpecialList.__table__,
+    SpecialListItem.__table__,
+    special_list_tags_table,
+]
+
+
+@pytest.fixture
+async def session(mocker):
+    """Provide a session on an in-memory SQLite database with special lists."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=TABLES)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        mocker.patch("app.services.special_list_service.db").session = session
+        yield session
+    await engine.dispose()
+
+
+async def create_lists(session, count, user_id=OWNER_ID):
+    """Create ``count`` lists for the user, each with two items and a tag."""
+    if await session.get(User, user_id) is None:
+        session.add(
+            User(id=user_id, email=f"{user_id}@example.com", hashed_password="x")
+        )
+    lists = []
+    for i in range(count):
+        special_list = SpecialList(
+            id=uuid.uuid4(), user_id=user_id, name=f"Lista {i}", category="sport"
+        )
+        special_list.tags = [Tag(id=uuid.uuid4(), name=f"tag-{special_list.id}")]
+        special_list.item_associations = [
+            SpecialListItem(
+                item=Item(id=uuid.uuid4(), name=f"item-{special_list.id}-{n}"),
+                quantity=n + 1,
+            )
+            for n in range(2)
+        ]
+        session.add(special_list)
+        lists.append(special_list)
+    await session.commit()
+    session.expunge_all()
+    return [special_list.id for special_list in lists]
+
+
+def count_statements(session):
+    statements = []
+    event.listen(
+        session.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestGetLists:
+    @pytest.mark.asyncio
+    async def test_statement_count_is_constant(self, session):
+        """Test that fetching more lists doesn't issue more statements."""
+        # Arrange
+        list_ids = await create_lists(session, 10)
+        statements = count_statements(session)
+
+        # Act
+        await SpecialListService.get_lists(list_ids[:1], user_id=OWNER_ID)
+        single = len(statements)
+        session.expunge_all()
+        statements.clear()
+        lists = await SpecialListService.get_lists(list_ids, user_id=OWNER_ID)
+
+        # Assert
+        assert len(statements) == single
+        assert len(lists) == 10
+        # Items and tags were loaded eagerly, so reading them runs no queries
+        statements.clear()
+        assert all(len(lst.item_associations) == 2 for lst in lists)
+        assert all(lst.item_associations[0].item.name for lst in lists)
+        assert all(len(lst.tags) == 1 for lst in lists)
+        assert statements == []
+
+    @pytest.mark.asyncio
+    async def test_ownership_checked_and_order_kept(self, session):
+        """Test that other users' lists are skipped and request order is kept."""
+        # Arrange
+        own_ids = await create_lists(session, 3)
+        [foreign_id] = await create_lists(session, 1, user_id=OTHER_USER_ID)
+        requested = [own_ids[2], foreign_id, own_ids[0], own_ids[2]]
+
+        # Act
+        lists = await SpecialListService.get_lists(requested, user_id=OWNER_ID)
+
+        # Assert
+        assert [lst.id for lst in lists] == [own_ids[2], own_ids[0]]
+
+
+class TestGetUserLists:
+    @pytest.mark.asyncio
+    async def test_offset_page_cursor_resumes_on_ties(self, session, mocker):
+        """Test that a cursor from an offset page continues it when times tie."""
+        # Arrange
+        mocker.patch("app.crud.db").session = session
+        list_ids = await create_lists(session, 5)
+        await session.execute(
+            update(SpecialList).values(created_at=datetime(2026, 1, 1))
+        )
+        await session.commit()
+
+        # Act
+        first, total = await SpecialListService.get_user_lists(
+            OWNER_ID, page=1, page_size=2
+        )
+        cursor = encode_cursor(first[-1].created_at, first[-1].id)
+        rest, _ = await SpecialListService.get_user_lists_page(
+            OWNER_ID, page_size=10, cursor=cursor
+        )
+
+        # Assert
+        assert total == 5
+        assert [lst.id for lst in first + rest] == sorted(list_ids)
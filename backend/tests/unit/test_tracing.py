@@ -0,0 +1,178 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import SpanKind
+
+from app import settings, tracing
+from app.api.auth import get_current_user_id
+from app.main import app
+from app.models import Trip
+from app.services.openrouter_service import OpenRouterHTTPError, OpenRouterService
+from app.services.rate_limiter import UpstreamLimiter
+from app.tracing import configure_tracing, shutdown_tracing, traced
+
+TEST_USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracing(exporter)
+    yield exporter
+    shutdown_tracing()
+
+
+def by_name(exporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+class TestTraced:
+    @pytest.mark.asyncio
+    async def test_id_arguments_become_attributes(self, exporter):
+        """Test that trip and list ids are recorded, passed positionally or not."""
+        # Arrange
+        trip = Trip(id=uuid.uuid4(), destination="Kraków")
+        list_id = uuid.uuid4()
+
+        @traced
+        async def generate(trip, list_ids, user_id, list_id=None):
+            return "done"
+
+        # Act
+        result = await generate(trip, [list_id], TEST_USER_ID, list_id=list_id)
+
+        # Assert
+        assert result == "done"
+        [span] = exporter.get_finished_spans()
+        assert span.name.endswith("generate")
+        assert span.attributes == {
+            "trip.id": str(trip.id),
+            "special_list.ids": (str(list_id),),
+            "list.id": str(list_id),
+        }
+
+    @pytest.mark.asyncio
+    async def test_disabled_tracing_records_nothing(self):
+        """Test that calls go straight through while tracing is off."""
+
+        # Arrange
+        @traced
+        async def get_trip(trip_id):
+            return trip_id
+
+        # Act
+        result = await get_trip("abc")
+
+        # Assert
+        assert result == "abc"
+        assert not tracing.tracing_enabled()
+
+
+class TestRequestTrace:
+    def test_route_service_and_statement_spans(self, exporter, mocker):
+        """Test that a request produces nested route, service and statement spans."""
+        # Arrange
+        trip_id = uuid.uuid4()
+        db = mocker.patch("app.crud.db")
+        result = MagicMock()
+        result.unique.return_value.scalars.return_value.one_or_none.return_value = Trip(
+            id=trip_id,
+            user_id=TEST_USER_ID,
+            destination="Kraków",
+            duration_days=3,
+            num_adults=2,
+            created_at=datetime.now(timezone.utc),
+        )
+        db.session.execute = AsyncMock(return_value=result)
+        app.dependency_overrides[get_current_user_id] = lambda: TEST_USER_ID
+
+        # Act
+        try:
+            response = TestClient(app).get(f"/api/trips/{trip_id}")
+        finally:
+            app.dependency_overrides.pop(get_current_user_id, None)
+
+        # Assert
+        assert response.status_code == 200
+        spans = by_name(exporter)
+        route = spans["GET /api/trips/{trip_id}"]
+        service = spans["TripService.get_trip"]
+        statement = spans["Trip.get"]
+        assert route.kind == SpanKind.SERVER
+        assert route.attributes["trip.id"] == str(trip_id)
+        assert route.attributes["http.response.status_code"] == 200
+        assert service.parent.span_id == route.context.span_id
+        assert service.attributes["trip.id"] == str(trip_id)
+        assert statement.parent.span_id == service.context.span_id
+        assert statement.attributes["db.row.id"] == str(trip_id)
+
+
+class TestOpenRouterSpans:
+    @pytest.mark.asyncio
+    async def test_each_attempt_is_a_span(self, exporter, mocker):
+        """Test that retried attempts are separate children of send_request."""
+        # Arrange
+        mocker.patch(
+            "app.services.openrouter_service.OpenRouterService._post",
+            new_callable=AsyncMock,
+            side_effect=[OpenRouterHTTPError(503, "busy"), {"choices": []}],
+        )
+        unlimited = UpstreamLimiter(
+            max_concurrency=0, requests_per_second=0, tokens_per_minute=0, max_wait=0
+        )
+        service = OpenRouterService(
+            "key", "http://stub", session=MagicMock(), limiter=unlimited
+        )
+        service.set_model_name("test/model")
+        service._backoff_factor = 0
+
+        # Act
+        await service.send_request()
+
+        # Assert
+        spans = exporter.get_finished_spans()
+        attempts = [span for span in spans if span.name == "OpenRouter attempt"]
+        [parent] = [span for span in spans if span.name.endswith("send_request")]
+        assert [span.attributes["openrouter.status"] for span in attempts] == [
+            "503",
+            "200",
+        ]
+        assert [span.attributes["openrouter.attempt"] for span in attempts] == [1, 2]
+        assert all(span.parent.span_id == parent.context.span_id for span in attempts)
+
+
+class TestConfigureTracing:
+    def test_file_exporter_writes_json_lines(self, tmp_path, monkeypatch):
+        """Test that the file exporter appends one JSON span per line."""
+        # Arrange
+        path = tmp_path / "traces.jsonl"
+        monkeypatch.setattr(settings, "TRACE_EXPORTER", "file")
+        monkeypatch.setattr(settings, "TRACE_FILE", str(path))
+        configure_tracing()
+
+        # Act
+        with tracing.span("work", {"trip.id": "t-1"}):
+            pass
+        shutdown_tracing()
+
+        # Assert
+        [line] = path.read_text().splitlines()
+        span = json.loads(line)
+        assert span["name"] == "work"
+        assert span["attributes"] == {"trip.id": "t-1"}
+
+    def test_unknown_exporter(self, monkeypatch):
+        """Test that a misspelt exporter is rejected."""
+        # Arrange
+        monkeypatch.setattr(settings, "TRACE_EXPORTER", "otlp-typo")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            configure_tracing()
@@ -0,0 +1,298 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models import GeneratedList, GeneratedListItem, Trip
+from app.services.trip_service import TripService
+
+TEST_USER_ID = uuid.uuid4()
+TEST_LIST_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def trip():
+    return Trip(
+        id=uuid.uuid4(),
+        user_id=TEST_USER_ID,
+        destination="Kraków",
+        duration_days=3,
+        num_adults=1,
+        children_ages=[],
+    )
+
+
+@pytest.fixture
+def mock_db(mocker):
+    """Replace the request session used by TripService."""
+    mock = mocker.patch("app.services.trip_service.db")
+    mock.session.flush = AsyncMock()
+    mock.session.commit = AsyncMock()
+    return mock
+
+
+def created_items(rows):
+    now = datetime.now(timezone.utc)
+    return [GeneratedListItem(id=uuid.uuid4(), created_at=now, **row) for row in rows]
+
+
+class TestItemValues:
+    def test_maps_item_to_columns(self):
+        """Test that an AI item is mapped onto column values."""
+        # Act
+        values = TripService._item_values(
+            TEST_LIST_ID,
+            {
+                "name": "Paszport",
+                "quantity": "2",
+                "category": "Dokumenty",
+                "weight": "0.1",
+                "dimensions": "12.5 x 9 x 0.5 cm",
+            },
+        )
+
+        # Assert
+        assert values["generated_list_id"] == TEST_LIST_ID
+        assert values["item_name"] == "Paszport"
+        assert values["quantity"] == 2
+        assert values["item_weight"] == 0.1
+        assert values["item_dimensions"] == "12.5 x 9 x 0.5 cm"
+        assert (values["item_width"], values["item_height"], values["item_depth"]) == (
+            12.5,
+            9,
+            0.5,
+        )
+
+    @pytest.mark.parametrize(
+        "item",
+        [
+            {"name": ""},
+            {"name": None},
+            {"name": "Mapa", "quantity": 0},
+            {"name": "Mapa", "quantity": "dużo"},
+        ],
+    )
+    def test_rejects_invalid_rows(self, item):
+        """Test that rows violating table constraints are rejected."""
+        with pytest.raises(ValueError):
+            TripService._item_values(TEST_LIST_ID, item)
+
+    @pytest.mark.parametrize("weight", [-1, 150, "ciężki"])
+    def test_drops_invalid_weight(self, weight):
+        """Test that an unusable weight is dropped instead of failing the row."""
+        values = TripService._item_values(
+            TEST_LIST_ID, {"name": "Namiot", "weight": weight}
+        )
+        assert values["item_weight"] is None
+
+
+class TestCreateMany:
+    @pytest.mark.asyncio
+    async def test_single_batched_statement(self, mocker):
+        """Test that all rows are sent with one multi-row INSERT ... RETURNING."""
+        # Arrange
+        session = mocker.patch("app.crud.db").session
+        session.scalars = AsyncMock(return_value=MagicMock())
+        rows = [
+            TripService._item_values(TEST_LIST_ID, {"name": name})
+            for name in ("Paszport", "Mapa", "Latarka")
+        ]
+
+        # Act
+        await GeneratedListItem.create_many(rows)
+
+        # Assert
+        session.scalars.assert_awaited_once()
+        stmt, params = session.scalars.await_args.args
+        assert params == rows
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("INSERT INTO generated_list_items")
+        assert "RETURNING" in sql
+
+    @pytest.mark.asyncio
+    async def test_no_rows(self, mocker):
+        """Test that an empty batch doesn't touch the database."""
+        session = mocker.patch("app.crud.db").session
+        session.scalars = AsyncMock()
+
+        assert await GeneratedListItem.create_many([]) == []
+        session.scalars.assert_not_awaited()
+
+
+class TestGeneratePackingList:
+    @pytest.mark.asyncio
+    async def test_items_inserted_in_one_batch(self, trip, mock_db, mocker):
+        """Test that valid items are inserted together and returned directly."""
+        # Arrange
+        mocker.patch(
+            "app.services.trip_service.AIService.generate_packing_list",
+            new_callable=AsyncMock,
+            return_value=[
+                {"name": "Paszport", "quantity": 1, "category": "Dokumenty"},
+                {"name": "", "quantity": 1},
+                {"name": "Skarpetki", "quantity": 3, "category": "Odzież"},
+            ],
+        )
+        generated_list = GeneratedList(
+            id=TEST_LIST_ID,
+            user_id=TEST_USER_ID,
+            trip_id=trip.id,
+            name="Lista rzeczy do Kraków",
+            created_at=datetime.now(timezone.utc),
+        )
+        mocker.patch(
+            "app.models.GeneratedList.create_many",
+            new_callable=AsyncMock,
+            return_value=[generated_list],
+        )
+        create_items = mocker.patch(
+            "app.models.GeneratedListItem.create_many",
+            new_callable=AsyncMock,
+            side_effect=created_items,
+        )
+
+        # Act
+        result = await TripService.generate_packing_list(trip, user_id=TEST_USER_ID)
+
+        # Assert
+        create_items.assert_awaited_once()
+        rows = create_items.await_args.args[0]
+        assert [row["item_name"] for row in rows] == ["Paszport", "Skarpetki"]
+        assert result.id == TEST_LIST_ID
+        assert result.items_count == 2
+        assert result.packed_items_count == 0
+        assert [item.item_name for item in result.items] == ["Paszport", "Skarpetki"]
+        mock_db.session.begin_nested.assert_called_once()
+        mock_db.session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_transaction_open_during_ai_call(self, trip, mock_db, mocker):
+        """Test that no transaction is held open while the AI call runs.
+
+        The connection is released before the call and the list is committed
+        right after it is written.
+        """
+        # Arrange
+        calls = []
+        mock_db.session.commit.side_effect = lambda: calls.append("commit")
+        mock_db.session.expunge_all.side_effect = lambda: calls.append("expunge")
+
+        async def generate(**kwargs):
+            calls.append("ai")
+            return [{"name": "Paszport", "quantity": 1}]
+
+        mocker.patch(
+            "app.services.trip_service.AIService.generate_packing_list",
+            side_effect=generate,
+        )
+        mocker.patch(
+            "app.models.GeneratedList.create_many",
+            new_callable=AsyncMock,
+            return_value=[
+                GeneratedList(
+                    id=TEST_LIST_ID,
+                    trip_id=trip.id,
+                    name="Lista rzeczy do Kraków",
+                    created_at=datetime.now(timezone.utc),
+                )
+            ],
+        )
+
+        async def insert_items(rows):
+            calls.append("insert")
+            return created_items(rows)
+
+        mocker.patch(
+            "app.models.GeneratedListItem.create_many", side_effect=insert_items
+        )
+
+        # Act
+        result = await TripService.generate_packing_list(trip, user_id=TEST_USER_ID)
+
+        # Assert
+        assert calls == ["expunge", "commit", "ai", "insert", "commit"]
+        assert result.items_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_rolls_back_savepoint(self, trip, mock_db, mocker):
+        """Test that a failing item insert propagates out of the savepoint."""
+        # Arrange
+        mocker.patch(
+            "app.services.trip_service.AIService.generate_packing_list",
+            new_callable=AsyncMock,
+            return_value=[{"name": "Paszport", "quantity": 1}],
+        )
+        mocker.patch(
+            "app.models.GeneratedList.create_many",
+            new_callable=AsyncMock,
+            return_value=[GeneratedList(id=TEST_LIST_ID, trip_id=trip.id)],
+        )
+        mocker.patch(
+            "app.models.GeneratedListItem.create_many",
+            new_callable=AsyncMock,
+            side_effect=Exception("connection lost"),
+        )
+
+        # Act
+        with pytest.raises(Exception, match="Failed to generate packing list"):
+            await TripService.generate_packing_list(trip, user_id=TEST_USER_ID)
+
+        # Assert
+        savepoint = mock_db.session.begin_nested.return_value
+        exc_type = savepoint.__aexit__.await_args.args[0]
+        assert exc_type is Exception
+
+
+class TestStreamPackingList:
+    @pytest.mark.asyncio
+    async def test_failed_insert_only_rolls_back_its_savepoint(
+        self, trip, mock_db, mocker
+    ):
+        """Test that a failing streamed item is skipped and later items still stream."""
+        # Arrange
+        mocker.patch(
+            "app.services.trip_service.TripService.get_trip",
+            new_callable=AsyncMock,
+            return_value=trip,
+        )
+        mocker.patch(
+            "app.models.GeneratedList.create_many",
+            new_callable=AsyncMock,
+            return_value=[GeneratedList(id=TEST_LIST_ID, trip_id=trip.id)],
+        )
+
+        async def stream(**kwargs):
+            for name in ("Paszport", "Mapa"):
+                yield {"name": name, "quantity": 1}
+
+        mocker.patch(
+            "app.services.trip_service.AIService.stream_packing_list",
+            side_effect=stream,
+        )
+        [row] = created_items(
+            [TripService._item_values(TEST_LIST_ID, {"name": "Mapa"})]
+        )
+        result = MagicMock()
+        result.scalar_one.return_value = row
+        mock_db.session.execute = AsyncMock(
+            side_effect=[Exception("duplicate key"), result]
+        )
+
+        # Act
+        events = [
+            event
+            async for event in TripService.stream_packing_list(
+                trip.id, user_id=TEST_USER_ID
+            )
+        ]
+
+        # Assert
+        assert [name for name, _ in events] == ["list", "item", "done"]
+        assert events[0][1]["id"] == str(TEST_LIST_ID)
+        assert events[2][1] == {"id": str(TEST_LIST_ID), "itemsCount": 1}
+        assert mock_db.session.begin_nested.call_count == 2
+        savepoint = mock_db.session.begin_nested.return_value
+        exc_types = [call.args[0] for call in savepoint.__aexit__.await_args_list]
+        assert exc_types == [Exception, None]